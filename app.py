@@ -5,13 +5,35 @@ Docker-ready Streamlit application for managing customer loan records with Postg
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
+import sys
+import io
 import json
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import InterfaceError, OperationalError
 from urllib.parse import urlparse
 import requests
 from PIL import Image
 import hashlib
+import threading
+import time
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+
+# Optional: pyarrow enables the on-disk snapshot of the record cache
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+# Optional (Unix only): peak RSS reporting while the record table loads
+try:
+    import resource
+except ImportError:
+    resource = None
 
 # Authentication configuration
 USER_CREDENTIALS = {
@@ -64,14 +86,14 @@ def logout():
     """Logout function"""
     st.session_state.authenticated = False
     st.session_state.username = None
-    if 'data_manager' in st.session_state:
-        del st.session_state.data_manager
     if 'keyword_manager' in st.session_state:
         del st.session_state.keyword_manager
     st.rerun()
 
 # Import database models and managers
 from models import Base, Brand, Model, ModelSize, ModelMaterial, BrandColor, BrandHardware, create_tables
+from models import DailyProgress, EditorTarget, DEFAULT_DAILY_TARGET, NEW_RECORD_STATUS
+from models import EVENT_LOG_TABLE, EVENT_ACTOR_SETTING
 from database_keyword_manager import DatabaseKeywordManager
 
 # Configure page
@@ -91,29 +113,490 @@ else:
 
 # Database configuration
 db_config = {
-    'user': 'datateam',
-    'password': 'jipjipmoneydata',
-    'host': '192.168.1.111',
-    'port': '5432',
-    'database': 'jipjipmoney'
+    'user': os.environ.get('JJM_DB_USER', 'datateam'),
+    'password': os.environ.get('JJM_DB_PASSWORD', 'jipjipmoneydata'),
+    'host': os.environ.get('JJM_DB_HOST', '192.168.1.111'),
+    'port': os.environ.get('JJM_DB_PORT', '5432'),
+    'database': os.environ.get('JJM_DB_NAME', 'jipjipmoney')
 }
 
+# Merges touching at most this many cached rows are patched row by row in place (see _patch_row)
+PATCH_ROW_LIMIT = 256
+# Derived frames (status views, filtered tables, display frames) kept per data version, least recently
+# used evicted first, for each derived view separately (so one view's variants never evict another's) - see DataManager.memoized
+MEMO_LIMIT = 32
+# Data Management filter facets (filter key -> cache column) and how many value bitmaps FacetIndex keeps
+FACET_COLUMNS = {'type': 'Types', 'brand': 'Brands', 'submodel': 'Sub-Models'}
+FACET_BITMAP_LIMIT = 256
+# Throughput analytics: a pause longer than this between two saves of one editor counts as idle
+IDLE_GAP_MINUTES = 30
+THROUGHPUT_STAT_COLUMNS = ['Records', 'Active hours', 'Median gap (min)', 'Idle gaps', 'Idle time (h)', 'Longest gap (h)']
+
+# LISTEN/NOTIFY change listener (set JJM_LISTEN=off to rely on delta sync only)
+LISTEN_ENABLED = os.environ.get("JJM_LISTEN", "on").lower() != "off"
+
+# Database-side daily productivity rollup (jjm_daily_progress, kept by a trigger) and per-editor targets
+PROGRESS_ROLLUP_ENABLED = os.environ.get("JJM_PROGRESS_ROLLUP", "on").lower() != "off"
+TARGETS_TTL_SECONDS = 60  # how long editor targets are cached between reads
+
+# Append-only edit event log (jjm_edit_events, monthly partitions), written by a trigger in the saving transaction
+EVENT_LOG_ENABLED = os.environ.get("JJM_EVENT_LOG", "on").lower() != "off"
+EVENT_PARTITION_CHECK_SECONDS = 24 * 3600  # how often sync_if_due makes sure upcoming monthly partitions exist
+
 # Data paths - check both local and mounted data directory (for keywords only now)
 DATA_DIR = "/app/data" if os.path.exists("/app/data") else "."
 
+# Query mode: "memory" keeps the whole table in the shared cache (small installs),
+# "server" filters in SQL and only holds the visible keyset page
+QUERY_MODE = os.environ.get("JJM_QUERY_MODE", "memory").lower()
+SERVER_PAGE_SIZE = int(os.environ.get("JJM_PAGE_SIZE", "100"))
+SERVER_STATS_TTL_SECONDS = 5  # how long server-mode status counts are reused (a rerun asks for them up to 3 times)
+
+# Full-table loader: "copy" streams COPY ... TO STDOUT into pd.read_csv, "stream" reads a named
+# server-side cursor and builds the columns chunk by chunk (lowest peak memory), "fetchmany" builds
+# frames from SQLAlchemy row chunks (used automatically if COPY is not available)
+LOAD_METHOD = os.environ.get("JJM_LOAD_METHOD", "copy").lower()
+STREAM_CHUNK_SIZE = int(os.environ.get("JJM_STREAM_CHUNK_SIZE", "20000"))
+
+# Delta sync: seconds between automatic catch-up queries (0 disables the timer, manual sync still works)
+SYNC_INTERVAL_SECONDS = int(os.environ.get("JJM_SYNC_INTERVAL", "30"))
+# Re-read this much before the watermark so rows committed late by long transactions are not missed
+SYNC_OVERLAP = pd.Timedelta(seconds=5)
+
+# Warm-start snapshot of the prepared record frame (Arrow IPC file + JSON sidecar with watermark/checksum)
+SNAPSHOT_ENABLED = pa is not None and os.environ.get("JJM_SNAPSHOT", "on").lower() != "off"
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "jjm_customer_loan.arrow")
+SNAPSHOT_META_PATH = SNAPSHOT_PATH + ".meta.json"
+SNAPSHOT_FORMAT_VERSION = 1
+# Minimum seconds between snapshot rewrites after delta syncs brought in changes
+SNAPSHOT_INTERVAL_SECONDS = int(os.environ.get("JJM_SNAPSHOT_INTERVAL", "300"))
+
+# Write-behind queue: saves from all sessions are coalesced and flushed in one UPDATE ... FROM (VALUES ...)
+# every WRITE_BEHIND_FLUSH_MS; each save still waits for its own commit acknowledgement
+WRITE_BEHIND_ENABLED = os.environ.get("JJM_WRITE_BEHIND", "off").lower() == "on"
+WRITE_BEHIND_FLUSH_MS = int(os.environ.get("JJM_WRITE_BEHIND_FLUSH_MS", "200"))
+WRITE_BEHIND_MAX_RETRIES = int(os.environ.get("JJM_WRITE_BEHIND_RETRIES", "3"))
+WRITE_BEHIND_ACK_TIMEOUT = 30  # seconds a save waits for its acknowledgement
+
+# Asynchronous saves: "Save Changes" patches the cache right away and a worker pool writes the row,
+# so editors can move on to the next record; failed saves roll the cached row back
+ASYNC_SAVES_ENABLED = os.environ.get("JJM_ASYNC_SAVES", "off").lower() == "on"
+ASYNC_SAVE_WORKERS = int(os.environ.get("JJM_ASYNC_SAVE_WORKERS", "4"))
+
+# Local edit journal: every record save is appended (and fsynced) here before the database write,
+# so saves made while PostgreSQL is unreachable are replayed when it comes back
+JOURNAL_ENABLED = os.environ.get("JJM_JOURNAL", "on").lower() != "off"
+JOURNAL_PATH = os.path.join(DATA_DIR, "jjm_edit_journal.jsonl")
+JOURNAL_REPLAY_SECONDS = int(os.environ.get("JJM_JOURNAL_REPLAY_SECONDS", "5"))
+DB_CONNECT_TIMEOUT = 5  # seconds - fail fast during a database outage so saves go to the journal
+JOURNALED_MESSAGE = "📝 Database unreachable - record {form_id} is kept in the local journal and will be saved when the connection returns"
+
+# Low-cardinality columns stored as pandas categoricals in the record cache
+KEYWORD_COLUMNS = ['Types', 'Brands', 'Models', 'Sub-Models', 'Sizes', 'Colors', 'Hardwares', 'Materials']
+CATEGORY_COLUMNS = KEYWORD_COLUMNS + ['Editor']
+TYPE_OPTIONS = ['Bag', 'Jewelry', 'Watch']
+
+# Map your database columns to the app's expected column names
+COLUMN_MAPPING = {
+    'form_id': 'Form_ids',
+    'contract_num': 'Contract_Numbers', 
+    'type': 'Types',
+    'brand': 'Brands',
+    'model': 'Models',
+    'sub_model': 'Sub-Models',
+    'size': 'Sizes',
+    'color': 'Colors',
+    'hardware': 'Hardwares',
+    'material': 'Materials',
+    'picture_url': 'Picture_url',
+    'status': 'Status',
+    'editor': 'Editor',
+    'updated_at': 'Updated_at'
+}
+DB_COLUMNS = {app_col: db_col for db_col, app_col in COLUMN_MAPPING.items()}  # app column -> database column
+
+# Columns written by a record save, in UPDATE order (form_id is the key)
+RECORD_WRITE_COLUMNS = ['contract_num', 'type', 'brand', 'model', 'sub_model', 'size', 'color',
+                        'hardware', 'material', 'picture_url', 'status', 'editor']
+
+# Print the columns each save actually changes (form_id + app column names); set JJM_SAVE_LOG=on
+SAVE_LOG_ENABLED = os.environ.get("JJM_SAVE_LOG", "off").lower() == "on"
+
+def to_db_value(value):
+    """Cached cell value -> SQL parameter (pandas NaN/NaT/NA become NULL)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+def changed_columns(current, changes):
+    """App columns in `changes` whose value differs from `current` (compared as the values the database would store)"""
+    return [column for column, value in changes.items() if to_db_value(value) != to_db_value(current.get(column))]
+
+def version_param(updated_at):
+    """Cached Updated_at -> parameter for the optimistic version check (NaT means the row had no updated_at)"""
+    if updated_at is None or pd.isna(updated_at):
+        return None
+    return pd.Timestamp(updated_at).to_pydatetime()
+
+class RecordConflictError(Exception):
+    """A version-checked save found the record changed since the editor loaded it"""
+    
+    def __init__(self, form_id, current):
+        super().__init__(f"form_id {form_id} was changed by {current.get('editor') or 'someone else'}")
+        self.form_id = form_id
+        self.current = current  # the record as it is now, database column names
+
+class RecordJournaledError(Exception):
+    """The database was unreachable: the save is kept in the local edit journal and will be replayed"""
+    
+    def __init__(self, form_id):
+        super().__init__(f"form_id {form_id} is waiting in the local edit journal")
+        self.form_id = form_id
+
+def is_connection_error(error):
+    """True for failures that mean the database is unreachable (worth journaling and retrying), not a bad statement"""
+    if isinstance(error, (OperationalError, InterfaceError, TimeoutError)):
+        return True
+    return bool(getattr(error, 'connection_invalidated', False))
+
+def journal_time(value):
+    """Timestamp -> ISO string for the edit journal (None for missing)"""
+    if value is None or pd.isna(value):
+        return None
+    return pd.Timestamp(value).isoformat()
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """sha256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where the resource module is unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _stream_column(values, data_type, categorical=False):
+    """One column of one streamed chunk (tuple of Python values) -> compact array for its SQL type"""
+    if categorical:
+        return pd.Categorical(values)
+    if data_type in ('smallint', 'integer', 'bigint'):
+        return pd.array(values, dtype='Int64')
+    if data_type in ('numeric', 'real', 'double precision'):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64')
+    if data_type and (data_type.startswith('timestamp') or data_type == 'date'):
+        return pd.to_datetime(pd.Series(values, dtype=object)).array
+    return np.array(values, dtype=object)
+
+def _concat_stream_pieces(pieces):
+    """Join the per-chunk arrays of one streamed column"""
+    if not pieces:
+        return pd.Series([], dtype=object)
+    if isinstance(pieces[0], pd.Categorical):
+        # '' joins the categories so _prepare_data_columns can fillna('') like on the other loaders
+        combined = pd.api.types.union_categoricals(pieces)
+        return pd.Series(combined if '' in combined.categories else combined.add_categories(['']))
+    return pd.concat([pd.Series(piece) for piece in pieces], ignore_index=True)
+
+class StatusIndex:
+    """
+    Compact status tracking for the record cache: one int8 status code per row position
+    (0 unfixed, 1 fixed, 2 deleted, 3 anything else) plus maintained per-code counters
+    - count() is O(1); set() adjusts the counters from the codes it overwrites
+    - next_position() scans forward block by block, so "next unfixed after X" stops at the first hit
+    """
+    OTHER = 3
+    SCAN_BLOCK = 4096
+    
+    def __init__(self, statuses=()):
+        self.rebuild(statuses)
+    
+    @classmethod
+    def _codes(cls, statuses):
+        """Status values -> int8 codes (NaN and unknown values become OTHER)"""
+        values = pd.to_numeric(pd.Series(np.asarray(statuses)), errors='coerce').to_numpy()
+        codes = np.full(len(values), cls.OTHER, dtype=np.int8)
+        known = np.isin(values, (0, 1, 2))
+        codes[known] = values[known].astype(np.int8)
+        return codes
+    
+    def rebuild(self, statuses):
+        """Derive the index from a whole Status column (in row position order)"""
+        self.codes = self._codes(statuses)
+        self.counts = np.bincount(self.codes, minlength=self.OTHER + 1).astype(np.int64)
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def set(self, positions, statuses):
+        """Set the status of the given row positions; positions past the end grow the index (appended rows)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) == 0:
+            return
+        new_codes = self._codes(statuses)
+        if positions.max() >= len(self.codes):
+            grown = np.full(positions.max() + 1, self.OTHER, dtype=np.int8)
+            grown[:len(self.codes)] = self.codes
+            self.counts[self.OTHER] += len(grown) - len(self.codes)
+            self.codes = grown
+        # Later duplicates win, like sequential assignment; count each position once
+        positions, last = np.unique(positions[::-1], return_index=True)
+        new_codes = new_codes[::-1][last]
+        self.counts -= np.bincount(self.codes[positions], minlength=self.OTHER + 1)
+        self.counts += np.bincount(new_codes, minlength=self.OTHER + 1)
+        self.codes[positions] = new_codes
+    
+    def count(self, status):
+        return int(self.counts[status])
+    
+    def positions(self, status):
+        """All row positions with this status, ascending"""
+        return np.flatnonzero(self.codes == status)
+    
+    def next_position(self, status, after=-1):
+        """First row position after `after` with this status, or None"""
+        start = after + 1
+        while start < len(self.codes):
+            block = self.codes[start:start + self.SCAN_BLOCK] == status
+            if block.any():
+                return start + int(block.argmax())
+            start += self.SCAN_BLOCK
+        return None
+
+class DailyProgressCounter:
+    """
+    Fixed-record counts per (editor, day of Updated_at), kept up to date as rows change
+    - slots holds, per row position, the id of the (editor, day) key the row is counted under (-1 = not counted)
+    - update() re-files only the positions it is given, so a save costs O(rows saved), not O(table)
+    """
+    
+    def __init__(self):
+        self.rebuild(None)
+    
+    @staticmethod
+    def _keys(frame):
+        """(editor, day) per row of frame for fixed rows with an editor and an Updated_at, else None"""
+        updated_at = pd.to_datetime(frame['Updated_at'], errors='coerce')
+        counted = (frame['Status'] == 1).to_numpy() & updated_at.notna().to_numpy() & frame['Editor'].notna().to_numpy()
+        keys = [None] * len(frame)
+        if counted.any():
+            days = updated_at[counted].dt.date.to_numpy()
+            editors = frame['Editor'][counted].astype(object).to_numpy()
+            for position, editor, day in zip(np.flatnonzero(counted), editors, days):
+                if editor:
+                    keys[position] = (editor, day)
+        return keys
+    
+    def rebuild(self, frame):
+        """Count the whole frame (row positions in frame order)"""
+        self.key_ids = {}  # (editor, day) -> id
+        self.keys = []  # id -> (editor, day)
+        self.by_day = {}  # day -> {editor: count}
+        self.slots = np.full(0 if frame is None else len(frame), -1, dtype=np.int32)
+        if frame is not None and len(frame):
+            self._file(np.arange(len(frame)), self._keys(frame))
+    
+    def update(self, frame, positions):
+        """Re-file the given row positions of frame after their Status, Editor or Updated_at changed"""
+        positions = np.unique(np.asarray(positions, dtype=np.int64))
+        if len(positions) == 0:
+            return
+        if positions.max() >= len(self.slots):
+            grown = np.full(positions.max() + 1, -1, dtype=np.int32)
+            grown[:len(self.slots)] = self.slots
+            self.slots = grown
+        for key_id in self.slots[positions]:
+            if key_id >= 0:
+                editor, day = self.keys[key_id]
+                self.by_day[day][editor] -= 1
+        self.slots[positions] = -1
+        self._file(positions, self._keys(frame.iloc[positions]))
+    
+    def _file(self, positions, keys):
+        for position, key in zip(positions, keys):
+            if key is None:
+                continue
+            key_id = self.key_ids.get(key)
+            if key_id is None:
+                key_id = self.key_ids[key] = len(self.keys)
+                self.keys.append(key)
+            self.slots[position] = key_id
+            editor, day = key
+            day_counts = self.by_day.setdefault(day, {})
+            day_counts[editor] = day_counts.get(editor, 0) + 1
+    
+    def counts_for_day(self, day):
+        """{editor: fixed records} for one date (editors with none that day are left out)"""
+        return {editor: count for editor, count in self.by_day.get(day, {}).items() if count > 0}
+
+class FacetIndex:
+    """
+    Row bitmaps (packed, one bit per row position) for the Data Management filters
+    - flag bitmaps for active / fixed / unfixed rows and rows with a contract number
+    - one bitmap per (facet column, value), built on first use and capped at FACET_BITMAP_LIMIT
+    - a filter combination is the AND of its bitmaps; option lists read the facet codes of the matching rows
+    - update() re-files only the positions it is given, so a save costs O(rows saved x bitmaps)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()  # Guards codes and bitmaps: UI reruns add bitmaps while saves and the listener update them
+        self.rebuild(None, np.zeros(0, dtype=np.int8))
+    
+    def rebuild(self, frame, status_codes):
+        """Index the whole frame (row positions in frame order) with the StatusIndex codes"""
+        self.size = len(status_codes)
+        self.values = {column: [] for column in FACET_COLUMNS.values()}  # column -> id -> value
+        self.value_ids = {column: {} for column in FACET_COLUMNS.values()}  # column -> value -> id
+        self.codes = {}  # column -> value id per row position (-1 = empty)
+        for column in FACET_COLUMNS.values():
+            if frame is not None and column in frame.columns:
+                self.codes[column] = self._ids(column, frame[column])
+            else:
+                self.codes[column] = np.full(self.size, -1, dtype=np.int32)
+        self.bitmaps = {}  # (column, value id) -> packed bitmap, oldest first
+        contract = self._contract(frame, np.arange(self.size))
+        self.flags = {name: np.packbits(bits) for name, bits in self._flag_bits(status_codes, contract).items()}
+    
+    @staticmethod
+    def _flag_bits(status_codes, contract):
+        return {'active': status_codes != 2, 'fixed': status_codes == 1, 'unfixed': status_codes == 0, 'contract': contract}
+    
+    @staticmethod
+    def _contract(frame, positions):
+        if frame is None or 'Contract_Numbers' not in frame.columns:
+            return np.zeros(len(positions), dtype=bool)
+        return frame['Contract_Numbers'].iloc[positions].notna().to_numpy()
+    
+    def _ids(self, column, series):
+        """Value ids for a column slice, registering values not seen before (compared in str() form, like the dropdown values)"""
+        uniques_codes, uniques = pd.factorize(series)
+        value_ids = self.value_ids[column]
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for code, value in enumerate(uniques):
+            value = str(value)
+            if value not in value_ids:
+                value_ids[value] = len(self.values[column])
+                self.values[column].append(value)
+            mapping[code] = value_ids[value]
+        ids = np.full(len(uniques_codes), -1, dtype=np.int32)
+        present = uniques_codes >= 0
+        ids[present] = mapping[uniques_codes[present]]
+        return ids
+    
+    @staticmethod
+    def _assign(bitmap, positions, bits):
+        """Set the bits of the given positions of a packed bitmap to bits (bool array), in place"""
+        byte_positions = positions >> 3
+        masks = (0x80 >> (positions & 7)).astype(np.uint8)
+        np.bitwise_and.at(bitmap, byte_positions, ~masks)
+        np.bitwise_or.at(bitmap, byte_positions[bits], masks[bits])
+    
+    def _grow(self, size):
+        """Make room for appended rows (empty codes, cleared bits) - caller holds _lock"""
+        for column, codes in self.codes.items():
+            self.codes[column] = np.concatenate([codes, np.full(size - self.size, -1, dtype=np.int32)])
+        nbytes = (size + 7) // 8
+        for bitmaps in (self.flags, self.bitmaps):
+            for key, bitmap in bitmaps.items():
+                bitmaps[key] = np.concatenate([bitmap, np.zeros(nbytes - len(bitmap), dtype=np.uint8)])
+        self.size = size
+    
+    def update(self, frame, positions, status_codes):
+        """Re-file the given row positions of frame after they changed (status_codes: the whole StatusIndex codes)"""
+        positions = np.unique(np.asarray(positions, dtype=np.int64))
+        if len(positions) == 0:
+            return
+        rows = frame.iloc[positions]
+        with self._lock:
+            if positions.max() >= self.size:
+                self._grow(int(positions.max()) + 1)
+            for column, codes in self.codes.items():
+                if column in rows.columns:
+                    codes[positions] = self._ids(column, rows[column])
+            for (column, value_id), bitmap in self.bitmaps.items():
+                self._assign(bitmap, positions, self.codes[column][positions] == value_id)
+        flag_bits = self._flag_bits(status_codes[positions], self._contract(frame, positions))
+        for name, bits in flag_bits.items():
+            self._assign(self.flags[name], positions, bits)
+    
+    def flag(self, name):
+        return self.flags[name]
+    
+    def bitmap(self, column, value):
+        """Rows whose column equals value (all clear for a value that never occurred)"""
+        value_id = self.value_ids[column].get(str(value))
+        if value_id is None:
+            return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        key = (column, value_id)
+        with self._lock:
+            bitmap = self.bitmaps.get(key)
+            if bitmap is None:
+                if len(self.bitmaps) >= FACET_BITMAP_LIMIT:
+                    self.bitmaps.pop(next(iter(self.bitmaps)), None)
+                bitmap = self.bitmaps[key] = np.packbits(self.codes[column] == value_id)
+        return bitmap
+    
+    def positions(self, bitmap):
+        """Row positions set in a bitmap, ascending"""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+    
+    def contains(self, bitmap, position):
+        return 0 <= position < self.size and bool(bitmap[position >> 3] & (0x80 >> (position & 7)))
+    
+    def options(self, column, positions):
+        """Sorted values of a facet column that occur at the given row positions"""
+        ids = np.unique(self.codes[column][positions])
+        values = self.values[column]
+        return sorted(value for value in (values[value_id] for value_id in ids[ids >= 0]) if value != 'nan')
+
 class DataManager:
     """
     Data Manager for PostgreSQL operations using SQLAlchemy only
     - All database operations use SQLAlchemy engine for consistency
     - Eliminates pandas warnings and provides unified database interface
+    - One instance is shared by every Streamlit session (see get_record_store),
+      so all cache mutations happen under self._lock
     """
     def __init__(self, db_config=db_config):
         self.db_config = db_config
         self.data_cache = None
-        self.fixed_records = set()
-        self.unfixed_records = set()
+        self.status_index = StatusIndex()  # Status code per row position + counters (see load_tracking_from_status)
+        self.daily_progress = DailyProgressCounter()  # Fixed records per (editor, day), for the sidebar
+        self.facet_index = FacetIndex()  # Filter bitmaps per status / contract / (facet column, value)
+        self._targets = None  # editor -> daily target, read from jjm_editor_targets (see get_editor_targets)
+        self.data_version = 0  # Bumped by every change to data_cache (see _bump_version)
+        self.last_partition_check = time.time()  # see ensure_event_partitions_if_due
+        self._memo = {}  # view name -> OrderedDict(key -> (data_version, value)), see memoized
+        self._memo_lock = threading.Lock()  # Guards _memo (not the computations)
+        self._targets_time = 0
+        self._server_stats = None  # status counts from the database (see _server_tracking_stats)
+        self._server_stats_time = 0
         self.table_name = "jjm_customer_loan"  # Your existing table name
         self.engine = None
+        self._lock = threading.RLock()  # Guards data_cache and tracking sets across sessions
+        self.sync_watermark = {'updated_at': None, 'form_id': None}  # Newest change already in the cache
+        self.keyword_vocabulary = None  # Category vocabulary per keyword column (see _keyword_vocabulary)
+        self.snapshot_dirty = False  # Cache changed by syncs since the last snapshot write
+        self.last_snapshot_time = None
+        self.last_sync_time = None
+        self.last_sync_error = None  # Message of the last failed sync_changes(), None after a successful one
+        self.load_state = "idle"  # idle -> loading -> ready | failed (background loader, see load_data)
+        self.load_progress = (0.0, "")  # (fraction, message) written by the loader thread
+        self.load_error = None
+        self.first_page = None  # First unfixed rows, available while the full load is running
+        self._load_thread = None
+        self.form_index = pd.Index([], dtype='int64')  # form_id -> row position (same order as data_cache)
+        self.write_queue = None  # WriteBehindQueue when WRITE_BEHIND_ENABLED (see get_record_store)
+        self._column_types = None  # column -> SQL type, see column_sql_type
+        self.save_pool = None  # ThreadPoolExecutor when ASYNC_SAVES_ENABLED (see get_record_store)
+        self.pending_saves = {}  # form_id -> in-flight save (see _submit_save)
+        self.save_outcomes = {}  # editor -> finished async saves not yet shown to them
+        self._save_lock = threading.Lock()  # Guards pending_saves and save_outcomes
+        self.journal = None  # EditJournal when JOURNAL_ENABLED (see get_record_store)
         
     # ...existing code...
     def get_engine(self):
@@ -131,6 +614,7 @@ class DataManager:
                     max_overflow=20,       # Additional connections when needed
                     pool_pre_ping=True,    # Verify connections before use
                     pool_recycle=3600,     # Recycle connections every hour
+                    connect_args={'connect_timeout': DB_CONNECT_TIMEOUT},
                     echo=False             # Set to True for debugging SQL queries
                 )
             except Exception as e:
@@ -159,173 +643,947 @@ class DataManager:
         #return test_results
     
     def load_data(self):
-        """Load data from PostgreSQL database using SQLAlchemy with optimizations"""
+        """
+        Return the shared record cache, starting the background load if it is not there yet.
+        Returns None while the load is running (see load_state/load_progress/first_page).
+        """
+        if self.data_cache is None:
+            self.start_background_load()
+        return self.data_cache
+    
+    def is_loaded(self):
+        return self.data_cache is not None
+    
+    def start_background_load(self, retry=False):
+        """Start the loader thread once; later callers just see it running (a failed load only restarts on retry)"""
+        with self._lock:
+            if self.data_cache is not None or self.load_state == "loading":
+                return
+            if self.load_state == "failed" and not retry:
+                return
+            self.load_state = "loading"
+            self.load_error = None
+            self.load_progress = (0.0, "Connecting to database...")
+            self._load_thread = threading.Thread(target=self._background_load, name="jjm-record-load", daemon=True)
+            self._load_thread.start()
+    
+    def wait_until_loaded(self, timeout=None):
+        """Block until the background load finishes (scripts and tools that need the full table)"""
+        self.start_background_load()
+        if self._load_thread is not None:
+            self._load_thread.join(timeout)
+        return self.data_cache
+    
+    def _background_load(self):
+        """
+        Loader thread body. No Streamlit calls in here: progress goes to self.load_progress
+        and the page polls it (see show_loading_preview).
+        """
+        def report(fraction, message):
+            self.load_progress = (fraction, message)
+        
         try:
-            if self.data_cache is None:
-                # Add progress indicator
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                status_text.text("Connecting to database...")
-                progress_bar.progress(0.1)
-                
-                engine = self.get_engine()
-                if engine is None:
-                    progress_bar.empty()
-                    status_text.empty()
-                    return None
-                
-                status_text.text("Executing query...")
-                progress_bar.progress(0.3)
-                
-                # Load data in chunks for better performance
-                query = text(f"SELECT * FROM {self.table_name} ORDER BY form_id")
-                
-                chunk_size = 10000
-                chunks = []
-                
-                with engine.connect() as conn:
-                    result = conn.execute(query)
-                    while True:
-                        chunk = result.fetchmany(chunk_size)
-                        if not chunk:
-                            break
-                        chunks.append(pd.DataFrame(chunk))
-                        status_text.text(f"Loading data... {len(chunks)} chunks processed")
-                        progress_bar.progress(min(0.7, 0.3 + (len(chunks) * 0.1)))
-                
-                status_text.text("Processing data...")
-                progress_bar.progress(0.8)
+            engine = self.get_engine()
+            if engine is None:
+                raise RuntimeError("Could not create database engine")
+            
+            # Something editors can work through straight away
+            report(0.05, "Fetching the first unfixed records...")
+            self.first_page = self._fetch_first_unfixed(engine)
+            
+            # Warm start: map the local snapshot, then catch up with a delta sync
+            report(0.1, "Opening local snapshot...")
+            snapshot = self._read_snapshot()
+            
+            if snapshot is not None:
+                with self._lock:
+                    self.data_cache, self.sync_watermark = snapshot
+                    self._rebuild_form_index()
+                    self.load_tracking_from_status()
                 
-                # Combine all chunks
-                if chunks:
-                    self.data_cache = pd.concat(chunks, ignore_index=True)
-                else:
-                    self.data_cache = pd.DataFrame()
+                report(0.6, "Catching up with changes since the snapshot...")
+                self.sync_changes()
+            else:
+                report(0.3, "Executing query...")
                 
-                # Map your database columns to the app's expected column names
-                column_mapping = {
-                    'form_id': 'Form_ids',
-                    'contract_num': 'Contract_Numbers', 
-                    'type': 'Types',
-                    'brand': 'Brands',
-                    'model': 'Models',
-                    'sub_model': 'Sub-Models',
-                    'size': 'Sizes',
-                    'color': 'Colors',
-                    'hardware': 'Hardwares',
-                    'material': 'Materials',
-                    'picture_url': 'Picture_url',
-                    'status': 'Status',
-                    'editor': 'Editor',
-                    'updated_at': 'Updated_at'
-                }
+                # Pull the whole table with the configured loader (already in app column names)
+                frame = self._load_table_frame(engine, report)
                 
-                # Rename columns efficiently
-                self.data_cache = self.data_cache.rename(columns=column_mapping)
+                report(0.8, "Processing data...")
                 
                 # Handle missing columns and null values efficiently
-                self._prepare_data_columns()
-                
-                progress_bar.progress(0.9)
-                
-                # Load tracking data from Status column
-                self.load_tracking_from_status()
+                frame = self._prepare_data_columns(frame)
                 
-                progress_bar.progress(1.0)
-                status_text.text("Data loaded successfully!")
-                
-                # Clean up progress indicators
-                import time
-                time.sleep(0.5)
-                progress_bar.empty()
-                status_text.empty()
-                        
-            return self.data_cache
+                with self._lock:
+                    self.data_cache = frame
+                    self._rebuild_form_index()
+                    
+                    # Load tracking data from Status column
+                    self.load_tracking_from_status()
+                    
+                    # Remember how far we have read so later syncs only fetch changes
+                    self._advance_watermark(self.data_cache)
+                self.write_snapshot()
+            
+            self.last_sync_time = time.time()
+            self.create_sync_index()
+            
+            rss = peak_rss_mb()
+            report(1.0, "Data loaded successfully!" + (f" (peak RSS {rss:,.0f} MB)" if rss else ""))
+            self.load_state = "ready"
+        except Exception as e:
+            print(f"Error loading data from database: {e}")
+            self.load_error = str(e)
+            self.load_state = "failed"
+        finally:
+            self.first_page = None
+    
+    def _fetch_first_unfixed(self, engine, page_size=None):
+        """First page of unfixed records by form_id, shown while the full table loads"""
+        query = text(
+            f"SELECT * FROM {self.table_name} WHERE status = 0 OR status IS NULL "
+            f"ORDER BY form_id LIMIT :page_size"
+        )
+        with engine.connect() as conn:
+            result = conn.execute(query, {'page_size': page_size or SERVER_PAGE_SIZE})
+            return self._prepare_data_columns(self._rows_to_frame(result, result.fetchall()))
+    
+    def _load_table_frame(self, engine, progress=None, method=None):
+        """Load the whole table with LOAD_METHOD, falling back to fetchmany if COPY is unavailable"""
+        method = method or LOAD_METHOD
+        if method == "stream":
+            return self._load_frame_stream(engine, progress)
+        if method == "copy":
+            try:
+                return self._load_frame_copy(engine, progress)
+            except Exception as e:
+                print(f"Warning: COPY loader failed, falling back to fetchmany: {e}")
+        return self._load_frame_fetchmany(engine, progress)
+    
+    def _load_frame_fetchmany(self, engine, progress=None):
+        """Load data in chunks of SQLAlchemy rows (portable, but builds a Python object per row)"""
+        query = text(f"SELECT * FROM {self.table_name} ORDER BY form_id")
+        
+        chunk_size = 10000
+        chunks = []
+        
+        with engine.connect() as conn:
+            result = conn.execute(query)
+            while True:
+                chunk = result.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                chunks.append(pd.DataFrame(chunk))
+                if progress:
+                    progress(min(0.7, 0.3 + (len(chunks) * 0.1)), f"Loading data... {len(chunks)} chunks processed")
+        
+        # Combine all chunks
+        if chunks:
+            frame = pd.concat(chunks, ignore_index=True)
+        else:
+            frame = pd.DataFrame()
+        
+        # Rename columns efficiently
+        return frame.rename(columns=COLUMN_MAPPING)
+    
+    def _load_frame_stream(self, engine, progress=None, chunk_size=None):
+        """
+        Read the table through a named server-side cursor (stream_results + yield_per), so only one
+        chunk of rows is ever on the client. Each chunk is turned into per-column arrays straight away
+        (keyword columns as categoricals) and the row tuples are dropped before the next fetch.
+        """
+        chunk_size = chunk_size or STREAM_CHUNK_SIZE
+        query = text(f"SELECT * FROM {self.table_name} ORDER BY form_id")
+        
+        with engine.connect() as conn:
+            column_types = dict(self._table_column_types(conn))
+            # Planner row estimate, only used to scale the progress bar
+            estimated_rows = conn.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                {'table_name': self.table_name}
+            ).scalar() or 0
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            names = list(result.keys())
+            categorical = {name: COLUMN_MAPPING.get(name, name) in CATEGORY_COLUMNS for name in names}
+            pieces = {name: [] for name in names}
+            total_rows = 0
+            
+            # partitions() needs the size spelled out, otherwise it buffers the whole result
+            for partition in result.partitions(chunk_size):
+                for name, values in zip(names, zip(*partition)):
+                    pieces[name].append(_stream_column(values, column_types.get(name), categorical[name]))
+                total_rows += len(partition)
+                if progress:
+                    rss = peak_rss_mb()
+                    progress(
+                        0.3 + 0.45 * min(1.0, total_rows / estimated_rows) if estimated_rows > 0 else 0.5,
+                        f"Streaming rows... {total_rows:,} loaded" + (f" (peak RSS {rss:,.0f} MB)" if rss else "")
+                    )
+        
+        frame = pd.DataFrame({COLUMN_MAPPING.get(name, name): _concat_stream_pieces(pieces.pop(name)) for name in names})
+        # Primary key is never NULL, keep it a plain int64 like the other loaders
+        if 'Form_ids' in frame.columns:
+            frame['Form_ids'] = frame['Form_ids'].astype('int64')
+        return frame
+    
+    def write_snapshot(self):
+        """
+        Persist the prepared frame to SNAPSHOT_PATH as an Arrow IPC file stamped with the sync watermark.
+        The data file is replaced first and the sidecar (with its sha256) last, so a crash in between
+        leaves a checksum mismatch and the next start falls back to a full load.
+        """
+        if not SNAPSHOT_ENABLED or self.data_cache is None:
+            return False
+        try:
+            with self._lock:
+                table = pa.Table.from_pandas(self.data_cache, preserve_index=False)
+                watermark = dict(self.sync_watermark)
+                self.snapshot_dirty = False
+            
+            tmp_path = SNAPSHOT_PATH + ".tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, SNAPSHOT_PATH)
+            
+            meta = {
+                'format_version': SNAPSHOT_FORMAT_VERSION,
+                'table': self.table_name,
+                'rows': table.num_rows,
+                'columns': table.column_names,
+                'watermark_updated_at': watermark['updated_at'].isoformat() if watermark['updated_at'] is not None else None,
+                'watermark_form_id': watermark['form_id'],
+                'sha256': file_sha256(SNAPSHOT_PATH),
+                'created_at': pd.Timestamp.now().isoformat()
+            }
+            with open(SNAPSHOT_META_PATH + ".tmp", 'w') as f:
+                json.dump(meta, f)
+            os.replace(SNAPSHOT_META_PATH + ".tmp", SNAPSHOT_META_PATH)
+            self.last_snapshot_time = time.time()
+            return True
+        except Exception as e:
+            print(f"Warning: Could not write record snapshot: {e}")
+            return False
+    
+    def write_snapshot_if_due(self):
+        """Rewrite the snapshot when syncs changed the cache and SNAPSHOT_INTERVAL_SECONDS have passed"""
+        if not self.snapshot_dirty or SNAPSHOT_INTERVAL_SECONDS <= 0:
+            return False
+        if self.last_snapshot_time is not None and time.time() - self.last_snapshot_time < SNAPSHOT_INTERVAL_SECONDS:
+            return False
+        return self.write_snapshot()
+    
+    def _read_snapshot(self):
+        """
+        Memory-map the local snapshot and return (frame, watermark), or None when there is no usable
+        snapshot (missing, other format/table, checksum mismatch, unreadable or wrong shape).
+        """
+        if not SNAPSHOT_ENABLED or not os.path.exists(SNAPSHOT_META_PATH) or not os.path.exists(SNAPSHOT_PATH):
+            return None
+        try:
+            with open(SNAPSHOT_META_PATH) as f:
+                meta = json.load(f)
+            if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION or meta.get('table') != self.table_name:
+                raise ValueError("snapshot format or table does not match")
+            if file_sha256(SNAPSHOT_PATH) != meta.get('sha256'):
+                raise ValueError("snapshot checksum mismatch")
+            
+            table = pa.ipc.open_file(pa.memory_map(SNAPSHOT_PATH, 'r')).read_all()
+            if table.num_rows != meta['rows'] or table.column_names != meta['columns']:
+                raise ValueError("snapshot shape does not match its metadata")
+            missing = {'Form_ids', 'Status', 'Editor', 'Updated_at'} - set(table.column_names)
+            if missing:
+                raise ValueError(f"snapshot is missing columns {sorted(missing)}")
+            
+            # Arrow buffers are read-only; copy once so the cache can be patched in place
+            frame = table.to_pandas().copy()
+            watermark = {
+                'updated_at': pd.Timestamp(meta['watermark_updated_at']) if meta['watermark_updated_at'] else None,
+                'form_id': meta['watermark_form_id']
+            }
+            return frame, watermark
         except Exception as e:
-            st.error(f"❌ Error loading data from database: {str(e)}")
+            print(f"Warning: Ignoring local record snapshot, doing a full load: {e}")
             return None
     
-    def _prepare_data_columns(self):
+    def column_sql_type(self, column):
+        """information_schema data type of one records-table column (looked up once)"""
+        if self._column_types is None:
+            with self.get_engine().connect() as conn:
+                self._column_types = dict(self._table_column_types(conn))
+        return self._column_types.get(column)
+    
+    def _table_column_types(self, conn):
+        """(column_name, data_type) pairs of the records table in ordinal order"""
+        return conn.execute(text("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = :table_name AND table_schema = current_schema()
+            ORDER BY ordinal_position
+        """), {'table_name': self.table_name}).fetchall()
+    
+    def _load_frame_copy(self, engine, progress=None):
+        """
+        Stream the table with COPY ... TO STDOUT (CSV) through the psycopg2 connection and
+        parse it in one pd.read_csv pass with dtypes taken from information_schema.
+        NULL is written as \\N so empty strings and NULLs stay distinct, as in the fetchmany path.
+        """
+        raw_conn = engine.raw_connection()
+        try:
+            with engine.connect() as conn:
+                column_types = self._table_column_types(conn)
+            if not column_types:
+                raise ValueError(f"table {self.table_name} not found")
+            
+            names, dtypes, date_columns, integer_columns = [], {}, [], []
+            for column_name, data_type in column_types:
+                name = COLUMN_MAPPING.get(column_name, column_name)
+                names.append(name)
+                if data_type in ('smallint', 'integer', 'bigint'):
+                    # Parsed as float64 (fast C path) and narrowed to nullable Int64 below
+                    dtypes[name] = 'float64'
+                    integer_columns.append(name)
+                elif data_type in ('numeric', 'real', 'double precision'):
+                    dtypes[name] = 'float64'
+                elif data_type == 'boolean':
+                    dtypes[name] = 'boolean'
+                elif data_type.startswith('timestamp') or data_type == 'date':
+                    date_columns.append(name)
+                else:
+                    dtypes[name] = 'object'
+            
+            if progress:
+                progress(0.4, "Streaming table with COPY...")
+            buffer = io.StringIO()
+            cursor = raw_conn.cursor()
+            cursor.copy_expert(
+                f"COPY (SELECT * FROM {self.table_name} ORDER BY form_id) "
+                f"TO STDOUT WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
+            cursor.close()
+            buffer.seek(0)
+            
+            if progress:
+                progress(0.6, "Parsing COPY stream...")
+            frame = pd.read_csv(
+                buffer,
+                header=None,
+                names=names,
+                dtype=dtypes,
+                parse_dates=date_columns,
+                na_values=['\\N'],
+                keep_default_na=False
+            )
+        finally:
+            raw_conn.close()
+        
+        for name in integer_columns:
+            frame[name] = frame[name].astype('Int64')
+        # Primary key is never NULL, keep it a plain int64 like the fetchmany path
+        if 'Form_ids' in frame.columns:
+            frame['Form_ids'] = frame['Form_ids'].astype('int64')
+        # read_csv marks text NULLs as NaN - use None like the row-based loaders
+        text_columns = [name for name, dtype in dtypes.items() if dtype == 'object']
+        frame[text_columns] = frame[text_columns].astype(object).where(frame[text_columns].notna(), None)
+        return frame
+    
+    def _prepare_data_columns(self, df):
         """Prepare data columns efficiently"""
-        # Handle Status column
-        if 'Status' not in self.data_cache.columns:
-            self.data_cache['Status'] = 0
+        # Handle Status column (0 unfixed / 1 fixed / 2 deleted fits in int8)
+        if 'Status' not in df.columns:
+            df['Status'] = pd.Series(0, index=df.index, dtype='int8')
         else:
-            self.data_cache['Status'] = self.data_cache['Status'].fillna(0).astype(int)
+            df['Status'] = df['Status'].fillna(0).astype('int8')
         
         # Handle Editor column
-        if 'Editor' not in self.data_cache.columns:
-            self.data_cache['Editor'] = ''
+        if 'Editor' not in df.columns:
+            df['Editor'] = ''
         else:
-            self.data_cache['Editor'] = self.data_cache['Editor'].fillna('')
+            df['Editor'] = df['Editor'].fillna('')
         
         # Handle Updated_at column
-        if 'Updated_at' not in self.data_cache.columns:
-            self.data_cache['Updated_at'] = pd.NaT
+        if 'Updated_at' not in df.columns:
+            df['Updated_at'] = pd.NaT
         else:
-            self.data_cache['Updated_at'] = pd.to_datetime(self.data_cache['Updated_at'], errors='coerce')
-    # ...existing code...
+            df['Updated_at'] = pd.to_datetime(df['Updated_at'], errors='coerce')
+        
+        # Keyword and editor columns become categoricals over the keyword catalog's vocabulary,
+        # so equality filters and option lists work on small integer codes
+        vocabulary = self._keyword_vocabulary()
+        for column in CATEGORY_COLUMNS:
+            if column in df.columns:
+                values = pd.unique(df[column].dropna().astype(object))
+                categories = pd.Index(vocabulary.get(column, [])).union(pd.Index(values, dtype=object)).union([''])
+                df[column] = df[column].astype(pd.CategoricalDtype(categories))
+        return df
+    
+    def _keyword_vocabulary(self):
+        """Values per keyword column from the keyword tables (loaded once, grown on demand by _assign)"""
+        if self.keyword_vocabulary is None:
+            vocabulary = {'Types': TYPE_OPTIONS, 'Editor': list(USER_CREDENTIALS.keys())}
+            queries = {
+                'Brands': "SELECT DISTINCT name FROM brands",
+                'Models': "SELECT DISTINCT collection FROM models",
+                'Sub-Models': "SELECT DISTINCT model_name FROM models",
+                'Sizes': "SELECT DISTINCT size FROM model_sizes",
+                'Materials': "SELECT DISTINCT material FROM model_materials",
+                'Colors': "SELECT DISTINCT color FROM brand_colors",
+                'Hardwares': "SELECT DISTINCT hardware FROM brand_hardwares",
+            }
+            try:
+                with self.get_engine().connect() as conn:
+                    for column, query in queries.items():
+                        vocabulary[column] = [row[0] for row in conn.execute(text(query)) if row[0] is not None]
+            except Exception as e:
+                print(f"Warning: Could not load keyword vocabulary, using data values only: {e}")
+            self.keyword_vocabulary = vocabulary
+        return self.keyword_vocabulary
+    
+    def _rebuild_form_index(self):
+        """Rebuild the form_id -> position index after the cache is replaced"""
+        self.form_index = pd.Index(self.data_cache['Form_ids'].astype('int64'))
+    
+    def position_of(self, form_id):
+        """Row position of form_id in data_cache (hash lookup), or None when it is not cached"""
+        try:
+            return self.form_index.get_loc(int(form_id))
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    def _patch_row(self, position, values):
+        """
+        Write several columns of one cached row in place by position.
+        Categories are grown first (only when a value is new), then each cell is set with .iat,
+        which writes into the existing column array instead of going through .loc's alignment path.
+        """
+        columns = [column for column in values if column in self.data_cache.columns]
+        for column in columns:
+            dtype = self.data_cache[column].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                value = values[column]
+                if value is not None and not pd.isna(value) and value not in dtype.categories:
+                    self.data_cache[column] = self.data_cache[column].cat.add_categories([value])
+        for column in columns:
+            dtype = self.data_cache[column].dtype
+            self.data_cache.iat[position, self.data_cache.columns.get_loc(column)] = _cell_value(dtype, values[column])
+    
+    def _assign(self, labels, column, values):
+        """Write values into one cache column, growing its categories first when a value is new"""
+        series = self.data_cache[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            candidates = pd.Series(values if pd.api.types.is_list_like(values) else [values], dtype=object).dropna()
+            new_categories = pd.Index(pd.unique(candidates)).difference(series.cat.categories)
+            if len(new_categories):
+                self.data_cache[column] = series.cat.add_categories(new_categories)
+        self.data_cache.loc[labels, column] = values
+    
+    def _conform_categories(self, df):
+        """Give df the cache's column dtypes (and categories) so it can be appended without upcasting"""
+        for column in CATEGORY_COLUMNS:
+            if column in df.columns and column in self.data_cache.columns:
+                values = df[column].dropna().astype(object)
+                missing = pd.Index(pd.unique(values)).difference(self.data_cache[column].cat.categories)
+                if len(missing):
+                    self.data_cache[column] = self.data_cache[column].cat.add_categories(missing)
+                df[column] = df[column].astype(object).astype(self.data_cache[column].dtype)
+        for column in df.columns.intersection(self.data_cache.columns).difference(CATEGORY_COLUMNS):
+            dtype = self.data_cache[column].dtype
+            if df[column].dtype != dtype and dtype != object:
+                # e.g. an all-NULL transaction_date arrives as object; keep the cache column datetime64
+                try:
+                    df[column] = pd.to_datetime(df[column]) if dtype.kind == 'M' else df[column].astype(dtype)
+                except (TypeError, ValueError):
+                    pass
+        return df
+    
+    def _rows_to_frame(self, result, rows):
+        """Build an app-ready frame (renamed + prepared) from fetched database rows"""
+        df = pd.DataFrame(rows, columns=list(result.keys()))
+        return self._prepare_data_columns(df.rename(columns=COLUMN_MAPPING))
+    
+    def _advance_watermark(self, df):
+        """Move the sync watermark forward to the newest updated_at / form_id in df"""
+        if df is None or df.empty:
+            return
+        max_updated = df['Updated_at'].max()
+        if pd.notna(max_updated) and (self.sync_watermark['updated_at'] is None or max_updated > self.sync_watermark['updated_at']):
+            self.sync_watermark['updated_at'] = max_updated
+        max_form_id = int(df['Form_ids'].max())
+        if self.sync_watermark['form_id'] is None or max_form_id > self.sync_watermark['form_id']:
+            self.sync_watermark['form_id'] = max_form_id
+    
+    def create_sync_index(self):
+        """Create the (updated_at, form_id) index that keeps delta syncs from scanning the table"""
+        try:
+            with self.get_engine().begin() as conn:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_updated_at "
+                    f"ON {self.table_name} (updated_at, form_id)"
+                ))
+        except Exception as e:
+            print(f"Warning: Could not create sync index: {e}")
+    
+    def sync_changes(self):
+        """
+        Fetch only rows changed since the last watermark and merge them into the cache.
+        Returns the number of rows merged (0 when nothing changed or the cache is not loaded).
+        Also runs on the loader and listener threads, so errors are only printed and kept in
+        last_sync_error for the UI to show.
+        """
+        if self.data_cache is None:
+            return 0
+        try:
+            engine = self.get_engine()
+            if engine is None:
+                return 0
+            
+            since = self.sync_watermark['updated_at']
+            since = since - SYNC_OVERLAP if since is not None else pd.Timestamp('1970-01-01')
+            max_form_id = self.sync_watermark['form_id'] if self.sync_watermark['form_id'] is not None else 0
+            
+            sync_sql = text(f"""
+            SELECT * FROM {self.table_name}
+            WHERE updated_at > :since OR form_id > :max_form_id
+            ORDER BY form_id
+            """)
+            with engine.connect() as conn:
+                result = conn.execute(sync_sql, {'since': since.to_pydatetime(), 'max_form_id': max_form_id})
+                changed = self._rows_to_frame(result, result.fetchall())
+            
+            self.last_sync_time = time.time()
+            self.last_sync_error = None
+            # The overlap window and the form_id clause re-read rows the cache already has (at least the
+            # newest one): only rows with a different Updated_at count as changes
+            fresh = self._unseen_rows(changed)
+            if not fresh.empty:
+                self._merge_changed_rows(fresh, advance_watermark=False)
+                self.snapshot_dirty = True
+            with self._lock:
+                self._advance_watermark(changed)
+            return len(fresh)
+        except Exception as e:
+            print(f"Warning: Error syncing changes from database: {e}")
+            self.last_sync_error = str(e)
+            return 0
+    
+    def _unseen_rows(self, changed):
+        """Rows of a re-read frame that are new to the cache or whose Updated_at differs from the cached one"""
+        if changed.empty or 'Updated_at' not in changed.columns:
+            return changed
+        with self._lock:
+            positions = self.form_index.get_indexer(changed['Form_ids'])
+            cached = self.data_cache['Updated_at'].to_numpy()[np.maximum(positions, 0)] if len(self.data_cache) else None
+        if cached is None:
+            return changed
+        fresh_versions = pd.Series(changed['Updated_at'].to_numpy())
+        cached_versions = pd.Series(cached)
+        same = (fresh_versions == cached_versions) | (fresh_versions.isna() & cached_versions.isna())
+        return changed[(positions < 0) | ~same.to_numpy()]
+    
+    def sync_if_due(self):
+        """Run sync_changes() when SYNC_INTERVAL_SECONDS have passed since the last sync"""
+        if SYNC_INTERVAL_SECONDS <= 0 or self.data_cache is None:
+            return 0
+        if self.last_sync_time is not None and time.time() - self.last_sync_time < SYNC_INTERVAL_SECONDS:
+            return 0
+        changed = self.sync_changes()
+        self.write_snapshot_if_due()
+        return changed
+    
+    def ensure_event_partitions_if_due(self):
+        """
+        Create the coming months' event log partitions once a day (they are also created at start-up).
+        Called on every page load, independent of the record sync, so it also runs in server query mode.
+        """
+        if not EVENT_LOG_ENABLED or time.time() - self.last_partition_check < EVENT_PARTITION_CHECK_SECONDS:
+            return
+        self.last_partition_check = time.time()
+        from models import ensure_event_partitions
+        try:
+            ensure_event_partitions(self.get_engine())
+        except Exception as e:
+            print(f"Warning: Could not create event log partitions: {e}")
+    
+    def apply_record_changes(self, form_ids, versions=None):
+        """
+        Re-read the given form_ids (from NOTIFY payloads) and patch them into the cache; form_ids the
+        re-read no longer finds were hard-deleted and are dropped from the cache.
+        `versions` (form_id -> notified updated_at) skips the re-read for rows the cache already holds at
+        that version, i.e. this process's own saves.
+        The sync watermark is left alone so a missed notification is still caught by the next delta sync.
+        """
+        if self.data_cache is None or not form_ids:
+            return 0
+        form_ids = [int(form_id) for form_id in form_ids if not self._has_version(form_id, (versions or {}).get(form_id))]
+        if not form_ids:
+            return 0
+        fetch_sql = text(f"SELECT * FROM {self.table_name} WHERE form_id = ANY(:form_ids)")
+        with self.get_engine().connect() as conn:
+            result = conn.execute(fetch_sql, {'form_ids': form_ids})
+            changed = self._rows_to_frame(result, result.fetchall())
+        
+        found = set(changed['Form_ids'].astype('int64')) if not changed.empty else set()
+        dropped = self._drop_records([form_id for form_id in form_ids if form_id not in found])
+        changed = self._unseen_rows(changed)
+        if not changed.empty:
+            self._merge_changed_rows(changed, advance_watermark=False)
+        if dropped or not changed.empty:
+            self.snapshot_dirty = True
+        return len(changed) + dropped
+    
+    def _has_version(self, form_id, updated_at):
+        """True when the cached row of form_id already has this updated_at (None / unparsable: False)"""
+        if updated_at is None or 'Updated_at' not in self.data_cache.columns:
+            return False
+        position = self.position_of(form_id)
+        if position is None:
+            return False
+        try:
+            return bool(pd.Timestamp(updated_at) == self.data_cache['Updated_at'].iat[position])
+        except (TypeError, ValueError):
+            return False  # e.g. tz-aware vs naive - re-read to be safe
+    
+    def _drop_records(self, form_ids):
+        """
+        Remove hard-deleted records from the cache. Row positions shift, so the form index and the
+        position-based tracking (status, daily progress, facet bitmaps) are rebuilt. Returns the number dropped.
+        """
+        with self._lock:
+            positions = self.form_index.get_indexer(form_ids)
+            positions = positions[positions >= 0]
+            if len(positions) == 0:
+                return 0
+            self.data_cache = self.data_cache.drop(self.data_cache.index[positions]).reset_index(drop=True)
+            self._rebuild_form_index()
+            self.load_tracking_from_status()
+        return len(positions)
+    
+    def _merge_changed_rows(self, changed, advance_watermark=True):
+        """Patch existing rows and append new ones from a delta-sync frame, keeping tracking in step"""
+        with self._lock:
+            positions = self.form_index.get_indexer(changed['Form_ids'])
+            existing = positions >= 0
+            
+            if existing.sum() <= PATCH_ROW_LIMIT:
+                # Typical NOTIFY / delta batch: in-place per-row patches, no column rewrites
+                for position, (_, row) in zip(positions[existing], changed[existing].iterrows()):
+                    self._patch_row(position, row.to_dict())
+                self._retrack(positions[existing], changed.loc[existing, 'Status'].to_numpy())
+            else:
+                patch = changed[existing]
+                labels = self.data_cache.index[positions[existing]]
+                for column in patch.columns:
+                    if column in self.data_cache.columns:
+                        self._assign(labels, column, patch[column].to_numpy())
+                self._retrack(labels, patch['Status'].to_numpy())
+            
+            if (~existing).any():
+                new_rows = self._conform_categories(changed[~existing].copy())
+                start = len(self.data_cache)
+                self.data_cache = pd.concat([self.data_cache, new_rows], ignore_index=True)
+                self.form_index = self.form_index.append(pd.Index(new_rows['Form_ids'].astype('int64')))
+                self._retrack(self.data_cache.index[start:], new_rows['Status'].to_numpy())
+            
+            if advance_watermark:
+                self._advance_watermark(changed)
+    
+    def _retrack(self, indices, statuses):
+        """Update the status index, daily progress and filter bitmaps for the given cache indices (row positions) after they changed"""
+        self.status_index.set(indices, statuses)
+        if self.data_cache is not None and {'Updated_at', 'Editor'} <= set(self.data_cache.columns):
+            self.daily_progress.update(self.data_cache, indices)
+        if self.data_cache is not None:
+            self.facet_index.update(self.data_cache, indices, self.status_index.codes)
+        self._bump_version()
+    
+    def _bump_version(self):
+        """Every cache mutation ends here (via _retrack / load_tracking_from_status): drop derived results"""
+        self.data_version += 1
+        with self._memo_lock:
+            self._memo.clear()
+    
+    def memoized(self, key, compute):
+        """
+        compute() cached until the next data_version bump, shared by all sessions - callers must not modify
+        the result. A value computed while a save landed is stamped with the older version, so it is recomputed.
+        Each derived view (the key itself, or its first element for tuple keys) keeps its own MEMO_LIMIT
+        most recently used variants, so sessions with different filters do not evict each other's views.
+        """
+        name = key[0] if isinstance(key, tuple) else key
+        version = self.data_version
+        with self._memo_lock:
+            entries = self._memo.setdefault(name, OrderedDict())
+            cached = entries.get(key)
+            if cached is not None and cached[0] == version:
+                entries.move_to_end(key)
+                return cached[1]
+        value = compute()
+        with self._memo_lock:
+            entries = self._memo.setdefault(name, OrderedDict())
+            entries[key] = (version, value)
+            entries.move_to_end(key)
+            while len(entries) > MEMO_LIMIT:
+                entries.popitem(last=False)
+        return value
+    
+    def active_records(self):
+        """Cached records that are not deleted (status 2), memoized per data version"""
+        return self.memoized('active', lambda: self.data_cache.iloc[np.flatnonzero(self.status_index.codes != 2)])
+    
+    def records_with_status(self, status):
+        """Cached records with one status, memoized per data version"""
+        return self.memoized(('status', status), lambda: self.data_cache.iloc[self.status_index.positions(status)])
+    
+    def _filter_bitmap(self, filters, facets):
+        """AND of the facet index bitmaps for the status, contract and the listed facet filters"""
+        index = self.facet_index
+        bitmap = index.flag({"✅ Fixed": 'fixed', "❌ Unfixed": 'unfixed'}.get(filters.get('status'), 'active'))
+        if filters.get('contract') == "Not Empty":
+            bitmap = bitmap & index.flag('contract')
+        elif filters.get('contract') == "Empty":
+            bitmap = bitmap & ~index.flag('contract')
+        for facet in facets:
+            value = filters.get(facet, "All")
+            if value and value != "All":
+                bitmap = bitmap & index.bitmap(FACET_COLUMNS[facet], value)
+        return bitmap
+    
+    def filter_positions(self, filters, facets=('type', 'brand', 'submodel')):
+        """
+        Row positions of the active records matching the Data Management filters (only the facets listed
+        are applied, so dependent dropdowns can reuse the upstream filters) - memoized per data version
+        """
+        facets = tuple(facets)
+        key = filters_key({name: filters.get(name) for name in ('status', 'form_id_search', 'contract') + facets})
+        
+        def compute():
+            bitmap = self._filter_bitmap(filters, facets)
+            search_term = filters.get('form_id_search', '').strip()
+            if not search_term:
+                return self.facet_index.positions(bitmap)
+            # Exact Form ID match is one hash lookup, then a single bit test
+            position = self.position_of(search_term) if search_term.isdigit() and str(int(search_term)) == search_term else None
+            if position is not None and self.facet_index.contains(bitmap, position):
+                return np.array([position], dtype=np.int64)
+            return np.zeros(0, dtype=np.int64)
+        
+        return self.memoized(('filter_positions', facets, key), compute)
+    
+    def filter_options(self, facet, filters):
+        """Values of one facet among the records matching the filters upstream of it (Type -> Brand -> Sub-Model)"""
+        upstream = tuple(FACET_COLUMNS)[:tuple(FACET_COLUMNS).index(facet)]
+        key = filters_key({name: filters.get(name) for name in ('status', 'form_id_search', 'contract') + upstream})
+        return self.memoized(('filter_options', facet, key),
+                             lambda: self.facet_index.options(FACET_COLUMNS[facet], self.filter_positions(filters, upstream)))
+    
+    def filtered_records(self, filters):
+        """Active cached records matching the Data Management filters, memoized per data version"""
+        return self.memoized(('filtered', filters_key(filters)), lambda: self.data_cache.iloc[self.filter_positions(filters)])
+    
+    def present_editors(self):
+        """
+        Editors that occur in the cached records, memoized per data version. The Editor categories also
+        hold every configured account (see _keyword_vocabulary), so only the codes in use are read.
+        """
+        def compute():
+            editor = self.data_cache['Editor']
+            if isinstance(editor.dtype, pd.CategoricalDtype):
+                codes = editor.cat.codes.to_numpy()
+                used = np.flatnonzero(np.bincount(codes[codes >= 0], minlength=len(editor.cat.categories)))
+                return list(editor.cat.categories[used])
+            return list(editor.dropna().unique())
+        
+        return self.memoized('present_editors', compute)
     
     def load_tracking_from_status(self):
         """Load tracking data from the Status column"""
         if self.data_cache is not None and 'Status' in self.data_cache.columns:
-            self.fixed_records = set(self.data_cache[self.data_cache['Status'] == 1].index)
-            self.unfixed_records = set(self.data_cache[self.data_cache['Status'] == 0].index)
+            self.status_index.rebuild(self.data_cache['Status'].to_numpy())
+        else:
+            self.status_index.rebuild(np.zeros(len(self.data_cache) if self.data_cache is not None else 0))
+        if self.data_cache is not None and {'Status', 'Updated_at', 'Editor'} <= set(self.data_cache.columns):
+            self.daily_progress.rebuild(self.data_cache)
         else:
-            self.unfixed_records = set(self.data_cache.index) if self.data_cache is not None else set()
-            self.fixed_records = set()
+            self.daily_progress.rebuild(None)
+        self.facet_index.rebuild(self.data_cache, self.status_index.codes)
+        self._bump_version()
+    
+    def next_unfixed(self, after=-1):
+        """Cache index of the first unfixed record after index `after` (None when there is none)"""
+        return self.status_index.next_position(0, after)
     
-    def save_single_record(self, index):
-        """Update only one specific record in the database - OPTIMIZED for single changes"""
+    def _record_params(self, form_id, row, columns=None):
+        """
+        SQL parameters (RECORD_WRITE_COLUMNS + form_id) for saving one record row;
+        with `columns` (app column names) only those columns are included, for a diff-only UPDATE
+        """
+        params = {
+            'contract_num': to_db_value(row.get('Contract_Numbers')),
+            'type': to_db_value(row.get('Types')),
+            'brand': to_db_value(row.get('Brands')),
+            'model': to_db_value(row.get('Models')),
+            'sub_model': to_db_value(row.get('Sub-Models')),
+            'size': to_db_value(row.get('Sizes')),
+            'color': to_db_value(row.get('Colors')),
+            'hardware': to_db_value(row.get('Hardwares')),
+            'material': to_db_value(row.get('Materials')),
+            'picture_url': to_db_value(row.get('Picture_url')),
+            'status': int(row.get('Status', 0)),
+            'editor': to_db_value(row.get('Editor', '')),
+            'form_id': int(form_id)
+        }
+        if columns is not None:
+            keep = {DB_COLUMNS.get(column, column) for column in columns} | {'form_id'}
+            params = {column: value for column, value in params.items() if column in keep}
+        return params
+    
+    @staticmethod
+    def _set_actor(conn, actor):
+        """Name who makes this transaction's changes, for the edit event log trigger (transaction-local)"""
+        if actor and EVENT_LOG_ENABLED:
+            conn.execute(text("SELECT set_config(:setting, :actor, true)"), {'setting': EVENT_ACTOR_SETTING, 'actor': actor})
+    
+    def _write_params(self, conn, params, expected_updated_at=None):
+        """
+        Write one record's _record_params (live saves and edit journal replays) inside an open transaction.
+        Only the columns present in params are SET; with none of them it just reads the row back.
+        With expected_updated_at (the Updated_at the editor loaded; NaT = none) the UPDATE only
+        matches that version, and a changed record raises RecordConflictError - no row locks needed.
+        Returns the post-trigger row as a dict of database columns (None when form_id does not exist).
+        An 'actor' entry is recorded as the editor of the change in the event log.
+        """
+        self._set_actor(conn, params.get('actor'))
+        version_check = "AND updated_at IS NOT DISTINCT FROM :expected_updated_at" if expected_updated_at is not None else ""
+        assignments = ", ".join(f"{column} = :{column}" for column in RECORD_WRITE_COLUMNS if column in params)
+        if assignments:
+            update_sql = text(f"""
+            UPDATE {self.table_name} 
+            SET {assignments}
+            WHERE form_id = :form_id {version_check}
+            RETURNING *
+            """)
+        else:
+            update_sql = text(f"SELECT * FROM {self.table_name} WHERE form_id = :form_id {version_check}")
+        
+        if expected_updated_at is not None:
+            params = {**params, 'expected_updated_at': version_param(expected_updated_at)}
+        returned = conn.execute(update_sql, params).fetchone()
+        if returned is None and expected_updated_at is not None:
+            self._raise_if_conflict(conn, [params['form_id']])
+        return dict(returned._mapping) if returned is not None else None
+    
+    def _raise_if_conflict(self, conn, form_ids):
+        """After a version-checked UPDATE matched nothing: raise RecordConflictError if the record still exists"""
+        current = conn.execute(
+            text(f"SELECT * FROM {self.table_name} WHERE form_id = ANY(:form_ids)"), {'form_ids': form_ids}
+        ).fetchone()
+        if current is not None:
+            raise RecordConflictError(current.form_id, dict(current._mapping))
+    
+    def _report_conflict(self, error, index=None):
+        """Put the current database row back into the cache and hand the conflict to the session's edit form"""
+        if self.data_cache is not None:
+            self._apply_db_row(error.current, index)
+        st.session_state.save_conflict = {
+            'form_id': int(error.form_id),
+            'current': {COLUMN_MAPPING.get(column, column): value for column, value in error.current.items()}
+        }
+    
+    def _apply_db_row(self, row_dict, position=None):
+        """Patch one cached row from a database row dict (e.g. an UPDATE ... RETURNING row)"""
+        fresh = {app_col: row_dict[db_col] for db_col, app_col in COLUMN_MAPPING.items() if db_col in row_dict}
+        with self._lock:
+            if position is None:
+                position = self.position_of(row_dict['form_id'])
+            if position is None:
+                return False
+            self._patch_row(position, fresh)
+            self._retrack([position], [fresh.get('Status') or 0])
+        return True
+    
+    def _save_record(self, form_id, row, expected_updated_at=None, columns=None, actor=None):
+        """
+        Persist one record row: through the write-behind queue when it is running (waits for the
+        batch's commit acknowledgement), otherwise in its own transaction.
+        Returns the saved row as returned by the database, or None when form_id does not exist;
+        raises RecordConflictError when expected_updated_at no longer matches.
+        With the edit journal on, the save is journaled first and RecordJournaledError means the
+        database was unreachable - the edit stays in the journal and is replayed later.
+        `columns` (app column names, see changed_columns) limits the UPDATE to what the edit changed;
+        `actor` is the user making the change (event log), defaulting to the row's Editor.
+        """
+        params = self._record_params(form_id, row, columns)
+        params['actor'] = actor or to_db_value(row.get('Editor'))
+        if SAVE_LOG_ENABLED:
+            print(f"form_id {form_id}: saving {'all columns' if columns is None else ', '.join(columns)}")
+        seq = None
+        if self.journal is not None:
+            if self.journal.has_pending():
+                # Queue behind the earlier edits: the replayer drains them in order, so the save never
+                # waits on a connect to a database that may still be down
+                self.journal.append(params, expected_updated_at, row.get('Updated_at'))
+                self.journal.wake()
+                raise RecordJournaledError(form_id)
+            seq = self.journal.append(params, expected_updated_at, row.get('Updated_at'), in_flight=True)
+        
+        try:
+            if self.write_queue is not None:
+                saved = self.write_queue.submit(params, expected_updated_at).result(timeout=WRITE_BEHIND_ACK_TIMEOUT)
+            else:
+                with self.get_engine().begin() as conn:
+                    saved = self._write_params(conn, params, expected_updated_at)
+        except Exception as e:
+            if seq is not None and is_connection_error(e):
+                self.journal.release(seq)
+                raise RecordJournaledError(form_id) from e
+            if seq is not None:
+                self.journal.ack(seq)
+            raise
+        if seq is not None:
+            self.journal.ack(seq)
+        self._server_stats = None
+        return saved
+    
+    def save_single_record(self, index, expected_updated_at=None, columns=None, previous=None):
+        """
+        Update only one specific record in the database - OPTIMIZED for single changes (only `columns` when given).
+        `previous` (from _optimistic_patch) is put back into the shared cache whenever the save does not
+        succeed, except on a conflict, where the cache shows the current database row instead.
+        """
         if self.data_cache is not None and index in self.data_cache.index:
             try:
                 engine = self.get_engine()
                 if engine is None:
+                    self._rollback_patch(index, previous)
                     return False
                 
                 # Get the specific record to update
                 row = self.data_cache.iloc[index]
                 form_id = row.get('Form_ids', row.get('form_id'))
                 
-                # Update only this specific record using SQLAlchemy
-                with engine.begin() as conn:
-                    update_sql = text(f"""
-                    UPDATE {self.table_name} 
-                    SET contract_num = :contract_num, type = :type, brand = :brand, model = :model, 
-                        sub_model = :sub_model, size = :size, color = :color, hardware = :hardware, 
-                        material = :material, picture_url = :picture_url, status = :status, editor = :editor
-                    WHERE form_id = :form_id
-                    """)
-                    
-                    result = conn.execute(update_sql, {
-                        'contract_num': row.get('Contract_Numbers'),
-                        'type': row.get('Types'),
-                        'brand': row.get('Brands'),
-                        'model': row.get('Models'),
-                        'sub_model': row.get('Sub-Models'),
-                        'size': row.get('Sizes'),
-                        'color': row.get('Colors'),
-                        'hardware': row.get('Hardwares'),
-                        'material': row.get('Materials'),
-                        'picture_url': row.get('Picture_url'),
-                        'status': int(row.get('Status', 0)),
-                        'editor': row.get('Editor', ''),
-                        'form_id': int(form_id)
-                    })
-                    
-                    if result.rowcount == 0:
-                        st.warning(f"⚠️ No record found with form_id {form_id}")
-                        return False
+                # Update only this specific record; RETURNING hands back the post-trigger row
+                try:
+                    saved = self._save_record(form_id, row, expected_updated_at, columns,
+                                              actor=st.session_state.get('username', 'Unknown'))
+                except RecordConflictError as conflict:
+                    self._report_conflict(conflict, index)
+                    return False
+                except RecordJournaledError:
+                    st.warning(JOURNALED_MESSAGE.format(form_id=form_id))
+                    return True
+                if saved is None:
+                    st.warning(f"⚠️ No record found with form_id {form_id}")
+                    self._rollback_patch(index, previous)
+                    return False
                 
-                # After successful database update, refresh the local cache with the updated record
-                # This ensures the trigger-updated timestamp is reflected in our local data
-                self.refresh_single_record(int(form_id), index)
+                # Apply it to the cache so the trigger-updated timestamp is reflected in our local data
+                self._apply_db_row(saved, index)
                 
                 return True
                 
             except Exception as e:
                 st.error(f"❌ Error updating single record: {e}")
+                self._rollback_patch(index, previous)
                 return False
         return False
     
@@ -334,34 +1592,214 @@ class DataManager:
             return self.data_cache.iloc[index].to_dict()
         return None
     
-    def update_record(self, index, updated_data, keep_as_fixed=True):
+    def update_record(self, index, updated_data, keep_as_fixed=True, expected_updated_at=None):
         if self.data_cache is not None:
             # Add current user as editor
             current_user = st.session_state.get('username', 'Unknown')
             updated_data['Editor'] = current_user
-            
-            for column, value in updated_data.items():
-                if column in self.data_cache.columns:
-                    self.data_cache.loc[index, column] = value
+            if self.save_pool is not None and self._save_in_flight(index):
+                return False
             
             # Update tracking in memory based on keep_as_fixed parameter
-            if keep_as_fixed:
-                # Keep as fixed (default behavior)
-                if index in self.unfixed_records:
-                    self.unfixed_records.remove(index)
-                self.fixed_records.add(index)
-                self.data_cache.loc[index, 'Status'] = 1
-            else:
-                # Mark as unfixed (when editing from fixed records and choosing to unfix)
-                if index in self.fixed_records:
-                    self.fixed_records.remove(index)
-                self.unfixed_records.add(index)
-                self.data_cache.loc[index, 'Status'] = 0
+            # (fixed by default, unfixed when editing from fixed records and choosing to unfix)
+            status = 1 if keep_as_fixed else 0
+            changes = {**updated_data, 'Status': status}
+            previous = self._optimistic_patch(index, changes)
+            columns = changed_columns(previous, changes)
+            if not columns:
+                return True  # nothing differs from the cached record - no UPDATE needed
             
-            # Save only this specific record to database
-            return self.save_single_record(index)
+            if self.save_pool is not None:
+                return self._submit_save(index, previous, expected_updated_at, columns)
+            # Save only the changed columns of this specific record to database
+            return self.save_single_record(index, expected_updated_at, columns, previous)
         return False
     
+    def _optimistic_patch(self, index, changes):
+        """Patch one cached row and return the values it replaced, for rolling back a failed save"""
+        with self._lock:
+            row = self.data_cache.iloc[index]
+            previous = {column: row[column] for column in changes}
+            self._patch_row(index, changes)
+            self._retrack([index], [changes.get('Status', row['Status'])])
+        return previous
+    
+    def _rollback_patch(self, position, previous):
+        """Put back the values an _optimistic_patch replaced (no-op without them)"""
+        if not previous:
+            return
+        with self._lock:
+            self._patch_row(position, previous)
+            self._retrack([position], [previous.get('Status', self.data_cache['Status'].iat[position])])
+    
+    def _save_in_flight(self, index):
+        """True (with a warning) while an earlier async save of the same record is unacknowledged"""
+        form_id = int(self.data_cache['Form_ids'].iat[index])
+        with self._save_lock:
+            in_flight = form_id in self.pending_saves
+        if in_flight:
+            st.warning(f"⏳ The previous save of record {form_id} is still in progress - try again in a moment")
+        return in_flight
+    
+    def _submit_save(self, index, previous, expected_updated_at=None, columns=None):
+        """
+        Hand the write of an already patched cached row to the save pool and return immediately.
+        The row is listed by saving_form_ids() until _finish_save acknowledges or rolls it back.
+        """
+        row = self.data_cache.iloc[index]
+        form_id = int(row['Form_ids'])
+        editor = st.session_state.get('username', 'Unknown')
+        with self._save_lock:
+            future = self.save_pool.submit(self._save_record, form_id, row, expected_updated_at, columns, editor)
+            self.pending_saves[form_id] = {'future': future, 'editor': editor, 'submitted': time.time()}
+        future.add_done_callback(lambda done: self._finish_save(form_id, previous, editor, done))
+        return True
+    
+    def _finish_save(self, form_id, previous, editor, done):
+        """
+        Save pool callback (no st calls here): apply the acknowledged row, or roll the optimistic patch back,
+        then queue the outcome for the editor's session.
+        """
+        outcome = {'form_id': form_id, 'ok': False}
+        try:
+            saved = done.result()
+            if saved is None:
+                outcome['message'] = f"No record found with form_id {form_id}"
+            else:
+                self._apply_db_row(saved)
+                outcome['ok'] = True
+        except RecordJournaledError:
+            # Keep the optimistic values: the journal replays the edit once the database is back
+            outcome.update(ok=True, message=JOURNALED_MESSAGE.format(form_id=form_id))
+        except RecordConflictError as conflict:
+            # Someone else's version wins; show it instead of our rolled-back edit
+            self._apply_db_row(conflict.current)
+            outcome['message'] = (f"Record {form_id} was changed by {conflict.current.get('editor') or 'another editor'} "
+                                  f"before your save landed - your changes were not saved")
+        except Exception as e:
+            outcome['message'] = f"Saving record {form_id} failed: {e}"
+        
+        if not outcome['ok'] and not isinstance(done.exception(), RecordConflictError):
+            position = self.position_of(form_id)
+            if position is not None:
+                self._rollback_patch(position, previous)
+        
+        with self._save_lock:
+            self.pending_saves.pop(form_id, None)
+        self.add_save_outcome(editor, outcome)
+    
+    def add_save_outcome(self, editor, outcome):
+        """Queue a finished background save ({'form_id', 'ok', 'message'}) for its editor's session"""
+        with self._save_lock:
+            self.save_outcomes.setdefault(editor, []).append(outcome)
+    
+    def saving_form_ids(self, editor=None):
+        """form_ids of async saves that have not been acknowledged yet (optionally only one editor's)"""
+        with self._save_lock:
+            return {form_id for form_id, save in self.pending_saves.items() if editor in (None, save['editor'])}
+    
+    def pop_save_outcomes(self, editor):
+        """Finished async saves of one editor, oldest first (each is returned once)"""
+        with self._save_lock:
+            return self.save_outcomes.pop(editor, [])
+    
+    def bulk_update_records(self, indices, updated_data, keep_as_fixed=True):
+        """Apply one keyword assignment to many cached records (by index) - returns the number updated"""
+        if self.data_cache is None or len(indices) == 0:
+            return 0
+        form_ids = self.data_cache['Form_ids'].to_numpy()[np.asarray(indices, dtype='int64')]
+        changes = {**updated_data, 'Status': 1 if keep_as_fixed else 0, 'Editor': st.session_state.get('username', 'Unknown')}
+        return self._bulk_write(form_ids, changes)
+    
+    def bulk_unfix_records(self, form_ids, versions=None):
+        """Move many records back to unfixed (editor kept, like unfix_record) - returns the number updated"""
+        return self._bulk_write(form_ids, {'Status': 0}, versions)
+    
+    def bulk_delete_records(self, form_ids, versions=None):
+        """Soft delete (status 2) many records - returns the number updated"""
+        return self._bulk_write(form_ids, {'Status': 2, 'Editor': st.session_state.get('username', 'Unknown')}, versions)
+    
+    def _bulk_write(self, form_ids, changes, versions=None):
+        """
+        Set the same values (app column names) on many records: one UPDATE joined to
+        unnest(form_ids, expected versions), then one vectorized cache assignment per column and a
+        single re-filing of the fixed/unfixed tracking. Returns the number of records updated.
+        Like single saves, each row is version-checked against the Updated_at the editor saw - `versions`
+        (aligned with form_ids, e.g. the selected rows of a server-mode page), else the cached one; rows
+        with no known version are written unchecked. Rows changed by someone else are left alone and
+        refreshed in the cache, and rows with an unacknowledged async save are skipped.
+        """
+        form_ids = [int(form_id) for form_id in form_ids]
+        known = [True] * len(form_ids)
+        if versions is not None:
+            expected = [version_param(version) for version in versions]
+        elif self.data_cache is not None and 'Updated_at' in self.data_cache.columns:
+            positions = self.form_index.get_indexer(form_ids)
+            updated_at = self.data_cache['Updated_at'].to_numpy()
+            expected = [version_param(updated_at[position]) if position >= 0 else None for position in positions]
+            known = [bool(position >= 0) for position in positions]
+        else:
+            expected = [None] * len(form_ids)
+            known = [False] * len(form_ids)
+        
+        with self._save_lock:
+            in_flight = sorted(form_id for form_id in form_ids if form_id in self.pending_saves)
+        if in_flight:
+            st.warning(f"⏳ Skipped {len(in_flight)} records whose previous save is still in progress: {', '.join(map(str, in_flight))}")
+            keep = [form_id not in set(in_flight) for form_id in form_ids]
+            form_ids, expected, known = ([value for value, kept in zip(values, keep) if kept] for values in (form_ids, expected, known))
+        if len(form_ids) == 0:
+            return 0
+        
+        assignments = {DB_COLUMNS[column]: to_db_value(value) for column, value in changes.items() if column in DB_COLUMNS}
+        try:
+            updated_at_type = self.column_sql_type('updated_at') or 'timestamp'
+            bulk_sql = text(f"""
+            UPDATE {self.table_name} AS t
+            SET {", ".join(f"{column} = :{column}" for column in assignments)}
+            FROM unnest(CAST(:form_ids AS bigint[]), CAST(:expected AS {updated_at_type}[]), CAST(:known AS boolean[]))
+                AS v(form_id, expected_updated_at, known)
+            WHERE t.form_id = v.form_id AND (NOT v.known OR t.updated_at IS NOT DISTINCT FROM v.expected_updated_at)
+            RETURNING t.form_id, t.updated_at
+            """)
+            with self.get_engine().begin() as conn:
+                self._set_actor(conn, st.session_state.get('username', 'Unknown'))
+                returned = conn.execute(bulk_sql, {**assignments, 'form_ids': form_ids, 'expected': expected, 'known': known}).fetchall()
+                missed = sorted(set(form_ids) - {row.form_id for row in returned})
+                conflicts = []
+                if missed:
+                    conflicts = conn.execute(
+                        text(f"SELECT * FROM {self.table_name} WHERE form_id = ANY(:form_ids)"), {'form_ids': missed}
+                    ).fetchall()
+        except Exception as e:
+            st.error(f"❌ Error updating records: {e}")
+            return 0
+        self._server_stats = None
+        
+        if conflicts:
+            # Same outcome as a single save's conflict: keep the other editor's version and show it
+            for current in conflicts:
+                self._apply_db_row(dict(current._mapping))
+            changed_by = sorted({current.editor or 'someone else' for current in conflicts})
+            st.warning(
+                f"⚠️ {len(conflicts)} records were changed by {', '.join(changed_by)} since you loaded them and were left as they are: "
+                f"{', '.join(str(current.form_id) for current in conflicts)}"
+            )
+        if not returned or self.data_cache is None:
+            return len(returned)
+        
+        with self._lock:
+            positions = self.form_index.get_indexer([row.form_id for row in returned])
+            found = positions >= 0
+            labels = self.data_cache.index[positions[found]]
+            for column, value in changes.items():
+                if column in self.data_cache.columns:
+                    self._assign(labels, column, value)
+            self._assign(labels, 'Updated_at', pd.to_datetime([row.updated_at for row, keep in zip(returned, found) if keep]))
+            if 'Status' in changes:
+                self._retrack(labels, [changes['Status']] * len(labels))
+        return len(returned)
+    
     def delete_record(self, index):
         """Soft delete a record by setting status to 2 (deleted) instead of actually removing it"""
         if self.data_cache is not None and index in self.data_cache.index:
@@ -370,29 +1808,13 @@ class DataManager:
                 form_id = self.data_cache.loc[index, 'Form_ids']
                 
                 # Update status to 2 (deleted) in database using SQLAlchemy
-                engine = self.get_engine()
-                if engine:
-                    with engine.begin() as conn:  # Use begin() for automatic transaction management
-                        delete_sql = text(f"UPDATE {self.table_name} SET status = 2, editor = :editor WHERE form_id = :form_id")
-                        current_user = st.session_state.get('username', 'Unknown')
-                        result = conn.execute(delete_sql, {
-                            'form_id': int(form_id),
-                            'editor': current_user
-                        })
-                        
-                        if result.rowcount == 0:
-                            st.warning(f"⚠️ No record found with form_id {form_id}")
-                            return False
-                
-                # Update status in local dataframe (KEEP the record, just change status)
-                self.data_cache.loc[index, 'Status'] = 2
-                self.data_cache.loc[index, 'Editor'] = st.session_state.get('username', 'Unknown')
+                deleted = self._soft_delete(form_id)
+                if deleted is None:
+                    return False
                 
-                # Remove from tracking sets (since it's now "deleted")
-                if index in self.fixed_records:
-                    self.fixed_records.remove(index)
-                if index in self.unfixed_records:
-                    self.unfixed_records.remove(index)
+                # Update status in local dataframe (KEEP the record, just change status) and
+                # remove it from the tracking sets, straight from the RETURNING row
+                self._apply_db_row(deleted, index)
                 
                 # DO NOT drop the record from dataframe - keep it for potential recovery
                 # DO NOT reset index - this prevents data loss
@@ -403,91 +1825,187 @@ class DataManager:
                 return False
         return False
     
-    def unfix_record(self, index):
+    def _soft_delete(self, form_id):
+        """Set status = 2 for one form_id in the database - returns the updated row, None when nothing matched"""
+        engine = self.get_engine()
+        if engine is None:
+            return None
+        with engine.begin() as conn:  # Use begin() for automatic transaction management
+            delete_sql = text(f"UPDATE {self.table_name} SET status = 2, editor = :editor WHERE form_id = :form_id RETURNING *")
+            current_user = st.session_state.get('username', 'Unknown')
+            self._set_actor(conn, current_user)
+            deleted = conn.execute(delete_sql, {
+                'form_id': int(form_id),
+                'editor': current_user
+            }).fetchone()
+            
+            if deleted is None:
+                st.warning(f"⚠️ No record found with form_id {form_id}")
+                return None
+        return dict(deleted._mapping)
+    
+    def unfix_record(self, index, expected_updated_at=None):
         """Change a record status from fixed back to unfixed"""
         if self.data_cache is not None and index in self.data_cache.index:
             try:
-                # Update tracking in memory
-                if index in self.fixed_records:
-                    self.fixed_records.remove(index)
-                self.unfixed_records.add(index)
-                
-                # Update Status column in the dataframe
-                self.data_cache.loc[index, 'Status'] = 0
+                if self.save_pool is not None and self._save_in_flight(index):
+                    return False
+                # Update Status column in the dataframe and tracking in memory
+                previous = self._optimistic_patch(index, {'Status': 0})
+                if not changed_columns(previous, {'Status': 0}):
+                    return True  # already unfixed
                 
                 # Keep the editor information - don't clear it
                 # User progress tracking will filter by status = 1 instead
                 
-                # Save only this specific record to database
-                return self.save_single_record(index)
+                if self.save_pool is not None:
+                    return self._submit_save(index, previous, expected_updated_at, ['Status'])
+                # Save only the status of this specific record to database
+                return self.save_single_record(index, expected_updated_at, ['Status'], previous)
                 
             except Exception as e:
                 st.error(f"❌ Error unfixing record: {str(e)}")
                 return False
         return False
     
-    def refresh_single_record(self, form_id, index):
-        """Refresh a single record from database to get the latest data including trigger-updated fields"""
+    # ------------------------------------------------------------------
+    # Server-side query mode (QUERY_MODE = "server"): nothing but the visible page is held in memory
+    # ------------------------------------------------------------------
+    def fetch_page(self, filters, after_form_id=None, page_size=None):
+        """
+        Fetch one keyset page of records matching filters, ordered by form_id.
+        Returns (page_df indexed by form_id, has_next_page).
+        """
+        page_size = page_size or SERVER_PAGE_SIZE
+        where_sql, params = build_filter_clause(filters)
+        if after_form_id is not None:
+            where_sql += " AND form_id > :after_form_id"
+            params['after_form_id'] = int(after_form_id)
+        params['limit'] = page_size + 1  # One extra row tells us whether a next page exists
+        
         try:
             engine = self.get_engine()
             if engine is None:
+                return pd.DataFrame(), False
+            page_sql = text(f"SELECT * FROM {self.table_name} WHERE {where_sql} ORDER BY form_id LIMIT :limit")
+            with engine.connect() as conn:
+                result = conn.execute(page_sql, params)
+                page_df = self._rows_to_frame(result, result.fetchall())
+        except Exception as e:
+            st.error(f"❌ Error loading records page: {e}")
+            return pd.DataFrame(), False
+        
+        has_next = len(page_df) > page_size
+        page_df = page_df.iloc[:page_size]
+        page_df.index = page_df['Form_ids'].to_numpy() if not page_df.empty else page_df.index
+        return page_df, has_next
+    
+    def count_records(self, filters):
+        """Count records matching filters in the database"""
+        where_sql, params = build_filter_clause(filters)
+        try:
+            with self.get_engine().connect() as conn:
+                return conn.execute(text(f"SELECT COUNT(*) FROM {self.table_name} WHERE {where_sql}"), params).scalar()
+        except Exception as e:
+            st.error(f"❌ Error counting records: {e}")
+            return 0
+    
+    def get_filter_options(self, column, filters, facets=()):
+        """Distinct non-null values of a filter column, narrowed by the other active filters"""
+        where_sql, params = build_filter_clause(filters, facets)
+        try:
+            with self.get_engine().connect() as conn:
+                rows = conn.execute(text(
+                    f"SELECT DISTINCT {column} FROM {self.table_name} "
+                    f"WHERE {where_sql} AND {column} IS NOT NULL ORDER BY {column}"
+                ), params).fetchall()
+            return [str(row[0]) for row in rows]
+        except Exception as e:
+            st.error(f"❌ Error loading filter options: {e}")
+            return []
+    
+    def update_record_by_form_id(self, selected_row, updated_data, keep_as_fixed=True):
+        """Server-mode save: write a page row merged with the edit straight to the database"""
+        changes = {**updated_data, 'Editor': st.session_state.get('username', 'Unknown'), 'Status': 1 if keep_as_fixed else 0}
+        columns = changed_columns(selected_row, changes)
+        if not columns:
+            return True  # nothing differs from the loaded row - no UPDATE needed
+        row = {**selected_row, **changes}
+        try:
+            if self._save_record(row['Form_ids'], row, row.get('Updated_at'), columns, actor=changes['Editor']) is None:
+                st.warning(f"⚠️ No record found with form_id {row['Form_ids']}")
                 return False
-            
-            # Fetch the updated record from database
-            with engine.begin() as conn:
-                fetch_sql = text(f"""
-                SELECT * FROM {self.table_name} WHERE form_id = :form_id
-                """)
-                result = conn.execute(fetch_sql, {'form_id': form_id})
-                row = result.fetchone()
-                
-                if row:
-                    # Convert row to dict and map column names
-                    row_dict = dict(row._mapping)
-                    
-                    # Map database columns to app columns
-                    column_mapping = {
-                        'form_id': 'Form_ids',
-                        'contract_num': 'Contract_Numbers', 
-                        'type': 'Types',
-                        'brand': 'Brands',
-                        'model': 'Models',
-                        'sub_model': 'Sub-Models',
-                        'size': 'Sizes',
-                        'color': 'Colors',
-                        'hardware': 'Hardwares',
-                        'material': 'Materials',
-                        'picture_url': 'Picture_url',
-                        'status': 'Status',
-                        'editor': 'Editor',
-                        'updated_at': 'Updated_at'
-                    }
-                    
-                    # Update the specific row in data_cache with fresh database values
-                    for db_col, app_col in column_mapping.items():
-                        if db_col in row_dict and app_col in self.data_cache.columns:
-                            self.data_cache.loc[index, app_col] = row_dict[db_col]
-                    
-                    return True
-                    
+            return True
+        except RecordConflictError as conflict:
+            self._report_conflict(conflict)
+            return False
+        except RecordJournaledError:
+            st.warning(JOURNALED_MESSAGE.format(form_id=row['Form_ids']))
+            return True
         except Exception as e:
-            st.error(f"❌ Error refreshing record {form_id}: {e}")
-            
-        return False
+            st.error(f"❌ Error updating single record: {e}")
+            return False
+    
+    def delete_record_by_form_id(self, form_id):
+        """Server-mode soft delete"""
+        try:
+            return self._soft_delete(form_id) is not None
+        except Exception as e:
+            st.error(f"❌ Error deleting record: {str(e)}")
+            return False
+    
+    def unfix_record_by_form_id(self, selected_row):
+        """Server-mode unfix: keep the editor, set status back to 0"""
+        row = dict(selected_row)
+        row['Status'] = 0
+        if not changed_columns(selected_row, {'Status': 0}):
+            return True
+        try:
+            return self._save_record(row['Form_ids'], row, row.get('Updated_at'), ['Status'],
+                                     actor=st.session_state.get('username', 'Unknown')) is not None
+        except RecordConflictError as conflict:
+            self._report_conflict(conflict)
+            return False
+        except RecordJournaledError:
+            st.warning(JOURNALED_MESSAGE.format(form_id=row['Form_ids']))
+            return True
+        except Exception as e:
+            st.error(f"❌ Error unfixing record: {str(e)}")
+            return False
+    
+    def _server_tracking_stats(self):
+        """
+        Status counts computed by the database (server query mode), reused for SERVER_STATS_TTL_SECONDS
+        and re-read after this process writes records
+        """
+        if self._server_stats is not None and time.time() - self._server_stats_time < SERVER_STATS_TTL_SECONDS:
+            return self._server_stats
+        try:
+            with self.get_engine().connect() as conn:
+                counts = dict(conn.execute(text(
+                    f"SELECT COALESCE(status, 0), COUNT(*) FROM {self.table_name} GROUP BY COALESCE(status, 0)"
+                )).fetchall())
+        except Exception as e:
+            st.error(f"❌ Error counting records: {e}")
+            return self._server_stats or {
+                'total': 0, 'fixed': 0, 'unfixed': 0, 'deleted': 0, 'total_including_deleted': 0
+            }
+        fixed, unfixed, deleted = counts.get(1, 0), counts.get(0, 0), counts.get(2, 0)
+        self._server_stats = {
+            'total': sum(counts.values()) - deleted,
+            'fixed': fixed,
+            'unfixed': unfixed,
+            'deleted': deleted,
+            'total_including_deleted': sum(counts.values())
+        }
+        self._server_stats_time = time.time()
+        return self._server_stats
     
     def get_tracking_stats(self):
+        if self.data_cache is None and QUERY_MODE == "server":
+            return self._server_tracking_stats()
         if self.data_cache is not None:
-            # Exclude deleted records (status 2) from total count
-            active_records = self.data_cache[self.data_cache['Status'] != 2] if 'Status' in self.data_cache.columns else self.data_cache
-            deleted_records = len(self.data_cache[self.data_cache['Status'] == 2]) if 'Status' in self.data_cache.columns else 0
-            
-            return {
-                'total': len(active_records),
-                'fixed': len(self.fixed_records),
-                'unfixed': len(self.unfixed_records),
-                'deleted': deleted_records,
-                'total_including_deleted': len(self.data_cache)
-            }
+            return self.memoized('tracking_stats', self._tracking_stats)
         else:
             return {
                 'total': 0,
@@ -497,74 +2015,246 @@ class DataManager:
                 'total_including_deleted': 0
             }
     
+    def _tracking_stats(self):
+        # Maintained counters - no scan of the Status column; deleted records (status 2) are excluded from total
+        deleted_records = self.status_index.count(2)
+        return {
+            'total': len(self.status_index) - deleted_records,
+            'fixed': self.status_index.count(1),
+            'unfixed': self.status_index.count(0),
+            'deleted': deleted_records,
+            'total_including_deleted': len(self.status_index)
+        }
     
-    def get_user_daily_progress(self, target_date=None):
-        """Get daily progress for all users"""
-        if self.data_cache is None:
-            return {}
+    
+    def record_history(self, form_id, limit=20):
+        """
+        Edit events of one record, newest first, from the event log (index on form_id, event_time):
+        DataFrame with Time, Editor, Action, Changes ({column: [old, new]})
+        """
+        history_sql = text(f"""
+        SELECT event_time AS "Time", editor AS "Editor", action AS "Action", changes AS "Changes"
+        FROM {EVENT_LOG_TABLE}
+        WHERE form_id = :form_id
+        ORDER BY event_time DESC, event_id DESC
+        LIMIT :limit
+        """)
+        with self.get_engine().connect() as conn:
+            return pd.read_sql(history_sql, conn, params={'form_id': int(form_id), 'limit': int(limit)})
+    
+    def editor_events(self, start, end=None, editor=None, action=None):
+        """
+        Events between two timestamps, optionally for one editor and/or action - pruned to the monthly
+        partitions of the range and served by the (editor, event_time) / (event_time) indexes
+        """
+        conditions = ["event_time >= :start", "event_time < :end"]
+        if editor is not None:
+            conditions.append("editor = :editor")
+        if action is not None:
+            conditions.append("action = :action")
+        events_sql = text(f"""
+        SELECT event_time AS "Time", form_id AS "Form_ids", editor AS "Editor", action AS "Action", changes AS "Changes"
+        FROM {EVENT_LOG_TABLE}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY event_time, event_id
+        """)
+        params = {
+            'start': pd.Timestamp(start).to_pydatetime(),
+            'end': pd.Timestamp(end if end is not None else pd.Timestamp.now()).to_pydatetime(),
+            'editor': editor,
+            'action': action
+        }
+        with self.get_engine().connect() as conn:
+            return pd.read_sql(events_sql, conn, params=params)
+    
+    def editor_throughput(self, days=7):
+        """
+        Saves of fixed records per editor over the last `days` days, from Updated_at/Editor:
+        (records per hour - one column per editor, hourly DatetimeIndex; per-editor stats indexed by editor
+        with THROUGHPUT_STAT_COLUMNS). Vectorized over the cache, or date_trunc/window SQL in server mode;
+        memoized per data version (server mode: per newest updated_at).
+        """
+        now = pd.Timestamp.now()
+        since = (now - pd.Timedelta(days=days)).floor('h')
+        if self.data_cache is not None:
+            return self.memoized(('throughput', days, now.floor('h')), lambda: self._throughput_from_cache(since, now))
+        with self.get_engine().connect() as conn:
+            newest = conn.execute(text(f"SELECT MAX(updated_at) FROM {self.table_name}")).scalar()
+        return self.memoized(('throughput', days, now.floor('h'), newest), lambda: self._throughput_from_sql(since, now))
+    
+    def _throughput_from_cache(self, since, now):
+        updated_at = pd.to_datetime(self.data_cache['Updated_at'], errors='coerce')
+        editor = self.data_cache['Editor'].astype(object)
+        mask = (self.status_index.codes == 1) & (updated_at >= since).to_numpy() & editor.notna().to_numpy() & (editor != '').to_numpy()
+        saves = pd.DataFrame({'Editor': editor[mask].to_numpy(), 'Updated_at': updated_at[mask].to_numpy()})
+        
+        hourly = saves.groupby(['Editor', saves['Updated_at'].dt.floor('h')]).size().unstack('Editor', fill_value=0)
+        hourly = hourly.reindex(pd.date_range(since, now.floor('h'), freq='h'), fill_value=0)
         
+        saves = saves.sort_values(['Editor', 'Updated_at'])
+        gaps = pd.DataFrame({'Editor': saves['Editor'], 'gap': saves.groupby('Editor')['Updated_at'].diff().dt.total_seconds() / 60})
+        gaps['idle'] = gaps['gap'].where(gaps['gap'] > IDLE_GAP_MINUTES)
+        stats = gaps.groupby('Editor').agg(
+            records=('Editor', 'size'), median_gap=('gap', 'median'), idle_gaps=('idle', 'count'),
+            idle_minutes=('idle', 'sum'), longest_gap=('gap', 'max')
+        )
+        return hourly, self._throughput_stats(stats, hourly)
+    
+    def _throughput_from_sql(self, since, now):
+        params = {'since': since.to_pydatetime(), 'idle': IDLE_GAP_MINUTES}
+        saved_rows = f"{self.table_name} WHERE status = 1 AND updated_at >= :since AND COALESCE(editor, '') <> ''"
+        hourly_sql = text(f"""
+        SELECT editor, date_trunc('hour', updated_at) AS hour, COUNT(*) AS records
+        FROM {saved_rows}
+        GROUP BY 1, 2
+        """)
+        stats_sql = text(f"""
+        WITH saves AS (
+            SELECT editor,
+                   EXTRACT(EPOCH FROM updated_at - LAG(updated_at) OVER (PARTITION BY editor ORDER BY updated_at)) / 60 AS gap
+            FROM {saved_rows}
+        )
+        SELECT editor AS "Editor", COUNT(*) AS records,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY gap) AS median_gap,
+               COUNT(*) FILTER (WHERE gap > :idle) AS idle_gaps,
+               COALESCE(SUM(gap) FILTER (WHERE gap > :idle), 0) AS idle_minutes,
+               MAX(gap) AS longest_gap
+        FROM saves
+        GROUP BY editor
+        """)
+        with self.get_engine().connect() as conn:
+            hourly = pd.read_sql(hourly_sql, conn, params=params)
+            stats = pd.read_sql(stats_sql, conn, params=params).set_index('Editor')
+        hourly = hourly.pivot_table(index='hour', columns='editor', values='records', aggfunc='sum', fill_value=0)
+        hourly = hourly.reindex(pd.date_range(since, now.floor('h'), freq='h'), fill_value=0)
+        hourly.columns.name = 'Editor'
+        return hourly, self._throughput_stats(stats.astype(float), hourly)
+    
+    @staticmethod
+    def _throughput_stats(stats, hourly):
+        """Per-editor gap aggregates (minutes) -> the displayed THROUGHPUT_STAT_COLUMNS"""
+        table = pd.DataFrame({
+            'Records': stats['records'].astype(int),
+            'Active hours': hourly.gt(0).sum().reindex(stats.index, fill_value=0).astype(int),
+            'Median gap (min)': stats['median_gap'].round(1),
+            'Idle gaps': stats['idle_gaps'].astype(int),
+            'Idle time (h)': (stats['idle_minutes'] / 60).round(1),
+            'Longest gap (h)': (stats['longest_gap'] / 60).round(1)
+        }, index=stats.index)
+        return table[THROUGHPUT_STAT_COLUMNS].sort_values('Records', ascending=False)
+    
+    def get_progress_history(self, start_date, end_date=None, period='day', editor=None):
+        """
+        Status transitions per editor and period ('day', 'week' or 'month') between two dates, read from the
+        jjm_daily_progress rollup - the records table is never scanned.
+        Returns a DataFrame with Editor, Period, Fixed, Unfixed, Deleted (records moved to status 1 / back to 0 / to 2).
+        """
+        if period not in ('day', 'week', 'month'):
+            raise ValueError(f"Unknown period: {period}")
+        editor_filter = "AND editor = :editor" if editor is not None else ""
+        history_sql = text(f"""
+        SELECT editor AS "Editor",
+               date_trunc(:period, day)::date AS "Period",
+               COALESCE(SUM(records) FILTER (WHERE to_status = 1), 0) AS "Fixed",
+               COALESCE(SUM(records) FILTER (WHERE to_status = 0 AND from_status <> {NEW_RECORD_STATUS}), 0) AS "Unfixed",
+               COALESCE(SUM(records) FILTER (WHERE to_status = 2), 0) AS "Deleted"
+        FROM {DailyProgress.__tablename__}
+        WHERE day BETWEEN :start_date AND :end_date {editor_filter}
+        GROUP BY 1, 2
+        ORDER BY 2, 1
+        """)
+        params = {
+            'period': period,
+            'start_date': pd.to_datetime(start_date).date(),
+            'end_date': pd.to_datetime(end_date if end_date is not None else pd.Timestamp.now()).date(),
+            'editor': editor
+        }
+        try:
+            with self.get_engine().connect() as conn:
+                return pd.read_sql(history_sql, conn, params=params)
+        except Exception as e:
+            print(f"Warning: Could not read progress history: {e}")
+            return pd.DataFrame(columns=['Editor', 'Period', 'Fixed', 'Unfixed', 'Deleted'])
+    
+    def get_editor_targets(self):
+        """{editor: daily target} from jjm_editor_targets (editors without a row use DEFAULT_DAILY_TARGET)"""
+        if self._targets is not None and time.time() - self._targets_time < TARGETS_TTL_SECONDS:
+            return self._targets
+        try:
+            with self.get_engine().connect() as conn:
+                self._targets = dict(conn.execute(text(
+                    f"SELECT editor, daily_target FROM {EditorTarget.__tablename__}"
+                )).fetchall())
+        except Exception as e:
+            print(f"Warning: Could not read editor targets: {e}")
+            self._targets = {}
+        self._targets_time = time.time()
+        return self._targets
+    
+    def set_editor_target(self, editor, daily_target):
+        """Set one editor's daily target (None resets it to DEFAULT_DAILY_TARGET)"""
+        with self.get_engine().begin() as conn:
+            if daily_target is None:
+                conn.execute(text(f"DELETE FROM {EditorTarget.__tablename__} WHERE editor = :editor"), {'editor': editor})
+            else:
+                conn.execute(text(f"""
+                INSERT INTO {EditorTarget.__tablename__} (editor, daily_target) VALUES (:editor, :daily_target)
+                ON CONFLICT (editor) DO UPDATE SET daily_target = EXCLUDED.daily_target
+                """), {'editor': editor, 'daily_target': int(daily_target)})
+        self._targets = None
+    
+    def _server_daily_progress(self, target_date):
+        """{editor: fixed records with Updated_at on target_date} counted by the database (server query mode)"""
+        day_start = pd.Timestamp(target_date)
+        try:
+            with self.get_engine().connect() as conn:
+                return dict(conn.execute(text(f"""
+                SELECT editor, COUNT(*) FROM {self.table_name}
+                WHERE status = 1 AND editor IS NOT NULL AND updated_at >= :day_start AND updated_at < :day_end
+                GROUP BY editor
+                """), {
+                    'day_start': day_start.to_pydatetime(),
+                    'day_end': (day_start + pd.Timedelta(days=1)).to_pydatetime()
+                }).fetchall())
+        except Exception as e:
+            print(f"Warning: Could not count daily progress: {e}")
+            return {}
+    
+    def get_user_daily_progress(self, target_date=None):
+        """
+        Get daily progress for all users: records currently fixed per editor whose Updated_at falls on the day,
+        from the incrementally maintained per-day counters, or counted by the database (through the
+        updated_at index) in server query mode. Targets come from get_editor_targets().
+        """
         # Use today if no date specified
         if target_date is None:
             target_date = pd.Timestamp.now().date()
         else:
             target_date = pd.to_datetime(target_date).date()
         
-        progress_data = {}
-        
-        # Check if Updated_at column exists
-        if 'Updated_at' in self.data_cache.columns and 'Editor' in self.data_cache.columns:
-            # Convert Updated_at to datetime if it's not already
-            df_copy = self.data_cache.copy()
+        if self.data_cache is not None and 'Updated_at' in self.data_cache.columns and 'Editor' in self.data_cache.columns:
+            # Count fixed records per user for the day
+            user_counts = self.daily_progress.counts_for_day(target_date)
             
-            # Handle different datetime formats and NULL values
-            try:
-                # Convert to datetime, coercing errors (NULL/invalid values become NaT)
-                df_copy['Updated_at'] = pd.to_datetime(df_copy['Updated_at'], errors='coerce')
-                
-                # Filter out records with NULL/NaT Updated_at values before date comparison
-                df_with_dates = df_copy.dropna(subset=['Updated_at'])
-                
-                # Filter records for the target date AND status = 1 (fixed)
-                if len(df_with_dates) > 0:
-                    df_today = df_with_dates[
-                        (df_with_dates['Updated_at'].dt.date == target_date) & 
-                        (df_with_dates['Status'] == 1)
-                    ]
-                    
-                    # Count records per user for today (only fixed records)
-                    user_counts = df_today.groupby('Editor').size().to_dict()
-                else:
-                    user_counts = {}
-                
-                # Get all unique users (including those who haven't worked today)
-                # Include users from all records, not just today's
-                all_users = df_copy['Editor'].dropna().unique()
-                
-                # Create progress data for all users
-                for user in all_users:
-                    if user and user != "admin":  # Skip empty usernames
-                        count = user_counts.get(user, 0)
-                        progress_data[user] = {
-                            'count': count,
-                            'target': 50,
-                            'percentage': min(100, (count / 50) * 100)
-                        }
-                        
-            except Exception as e:
-                st.error(f"Error calculating user progress: {e}")
-                # Return empty progress for all known users
-                try:
-                    all_users = self.data_cache['Editor'].dropna().unique()
-                    for user in all_users:
-                        if user and user.strip() and user != "admin":
-                            progress_data[user] = {
-                                'count': 0,
-                                'target': 50,
-                                'percentage': 0
-                            }
-                except:
-                    pass
-                return progress_data
+            # Get all users who have edited records (including those who haven't worked today)
+            all_users = self.present_editors()
+        elif self.data_cache is None and QUERY_MODE == "server":
+            user_counts = self._server_daily_progress(target_date)
+            all_users = user_counts.keys()
+        else:
+            return {}
+        
+        targets = self.get_editor_targets()
+        progress_data = {}
+        for user in all_users:
+            if user and user != "admin":  # Skip empty usernames
+                count = user_counts.get(user, 0)
+                target = targets.get(user, DEFAULT_DAILY_TARGET)
+                progress_data[user] = {
+                    'count': count,
+                    'target': target,
+                    'percentage': min(100, (count / target) * 100)
+                }
         
         return progress_data
     
@@ -583,6 +2273,404 @@ class DataManager:
                 return None
         return None
 
+class WriteBehindQueue:
+    """
+    Coalesces record saves from every session and writes them in batches
+    - submit() returns a Future that resolves to the saved row (None if form_id is gone) once the batch has committed
+    - Saves to the same form_id before a flush collapse into one row (last write wins per column, all waiters acked);
+      version-checked saves never collapse - a second one waits for the next batch so it can conflict
+    - A failed batch is retried with backoff up to max_retries times, then its futures get the error
+    - close() flushes whatever is pending (registered with atexit by get_record_store)
+    """
+    
+    def __init__(self, data_manager, flush_ms=WRITE_BEHIND_FLUSH_MS, max_retries=WRITE_BEHIND_MAX_RETRIES):
+        self.data_manager = data_manager
+        self.flush_interval = flush_ms / 1000
+        self.max_retries = max_retries
+        self.pending = {}  # form_id -> [params, [futures], attempts]
+        self.deferred = []  # entries that must not share a batch with the pending save of the same form_id
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="jjm-write-behind", daemon=True)
+        self.thread.start()
+    
+    def submit(self, params, expected_updated_at=None):
+        """
+        Queue one record's save parameters (as built by DataManager._record_params), optionally
+        version-checked against expected_updated_at like DataManager._write_params
+        """
+        ack = Future()
+        params = {
+            **params,
+            'check_version': expected_updated_at is not None,
+            'expected_updated_at': version_param(expected_updated_at) if expected_updated_at is not None else None
+        }
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("write-behind queue is closed")
+            self._add([params, [ack], 0])
+            self.condition.notify()
+        return ack
+    
+    def _add(self, entry):
+        """Merge an entry into pending (caller holds the condition)"""
+        form_id = entry[0]['form_id']
+        existing = self.pending.get(form_id)
+        if existing is None:
+            self.pending[form_id] = entry
+        elif entry[0]['check_version'] or existing[0]['check_version']:
+            self.deferred.append(entry)
+        else:
+            # Diff-only saves: the later save's columns win, columns only the earlier one changed are kept
+            existing[0] = {**existing[0], **entry[0]}
+            existing[1].extend(entry[1])
+            existing[2] = max(existing[2], entry[2])
+    
+    def _release_deferred(self):
+        """Move deferred entries into pending for the next batch (caller holds the condition)"""
+        deferred, self.deferred = self.deferred, []
+        for entry in deferred:
+            self._add(entry)
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if self.closed and not self.pending and not self.deferred:
+                    return
+            # Let more saves arrive so they share the transaction
+            time.sleep(self.flush_interval)
+            self.flush()
+    
+    def flush(self):
+        """Write everything pending now in one transaction; failures go back on the queue"""
+        with self.condition:
+            batch, self.pending = self.pending, {}
+        if not batch:
+            return
+        
+        try:
+            updated, conflicts = self._write_batch([entry[0] for entry in batch.values()])
+        except Exception as e:
+            print(f"Warning: Write-behind flush of {len(batch)} records failed: {e}")
+            self._requeue(batch, e)
+            return
+        finally:
+            with self.condition:
+                self._release_deferred()
+        
+        # Apply the RETURNING rows (with trigger-maintained updated_at) before acking,
+        # so a returning save sees its refreshed row
+        if self.data_manager.data_cache is not None:
+            for saved in updated.values():
+                try:
+                    self.data_manager._apply_db_row(saved)
+                except Exception as e:
+                    print(f"Warning: Could not refresh saved record {saved.get('form_id')}: {e}")
+        
+        for form_id, (_, futures, _) in batch.items():
+            for ack in futures:
+                if form_id in conflicts:
+                    ack.set_exception(RecordConflictError(form_id, conflicts[form_id]))
+                else:
+                    ack.set_result(updated.get(form_id))
+    
+    def _write_batch(self, rows):
+        """
+        UPDATE ... FROM (VALUES ...) for all rows, in one transaction - one statement per set of changed
+        columns (and acting user), since every save only writes the columns it changed.
+        Returns ({form_id: post-trigger row} for rows written, {form_id: current row} for version conflicts)
+        """
+        groups = {}
+        for row in rows:
+            write_columns = tuple(column for column in RECORD_WRITE_COLUMNS if column in row)
+            groups.setdefault((write_columns, row.get('actor')), []).append(row)
+        
+        updated_at_type = self.data_manager.column_sql_type('updated_at') or 'timestamp'
+        with self.data_manager.get_engine().begin() as conn:
+            updated = {}
+            for (write_columns, actor), group in groups.items():
+                if not write_columns:
+                    continue  # no-op saves are short-circuited before they reach the queue
+                # The event log trigger fires per statement, so each group names its own actor
+                self.data_manager._set_actor(conn, actor)
+                columns = ['form_id', *write_columns, 'check_version', 'expected_updated_at']
+                params = {}
+                values = []
+                for i, row in enumerate(group):
+                    values.append("(" + ", ".join(f":{column}_{i}" for column in columns) + ")")
+                    params.update({f"{column}_{i}": row[column] for column in columns})
+                
+                # Parameters in VALUES are untyped: status/version columns are cast, the text columns are text already
+                assignments = ", ".join(
+                    f"{column} = v.{column}::integer" if column == 'status' else f"{column} = v.{column}"
+                    for column in write_columns
+                )
+                batch_sql = text(f"""
+                UPDATE {self.data_manager.table_name} AS t
+                SET {assignments}
+                FROM (VALUES {", ".join(values)}) AS v({", ".join(columns)})
+                WHERE t.form_id = v.form_id::bigint
+                  AND (NOT v.check_version::boolean
+                       OR t.updated_at IS NOT DISTINCT FROM v.expected_updated_at::{updated_at_type})
+                RETURNING t.*
+                """)
+                updated.update({row.form_id: dict(row._mapping) for row in conn.execute(batch_sql, params)})
+            stale = [row['form_id'] for row in rows if row['check_version'] and row['form_id'] not in updated]
+            conflicts = {}
+            if stale:
+                current_sql = text(f"SELECT * FROM {self.data_manager.table_name} WHERE form_id = ANY(:form_ids)")
+                conflicts = {row.form_id: dict(row._mapping) for row in conn.execute(current_sql, {'form_ids': stale})}
+        return updated, conflicts
+    
+    def _requeue(self, batch, error):
+        """Put a failed batch back (newer saves for the same record win) or fail it after max_retries"""
+        retry_delay = 0
+        with self.condition:
+            for form_id, (params, futures, attempts) in batch.items():
+                if attempts + 1 > self.max_retries:
+                    for ack in futures:
+                        ack.set_exception(error)
+                    continue
+                newer = self.pending.get(form_id)
+                if newer is None:
+                    self.pending[form_id] = [params, futures, attempts + 1]
+                elif params['check_version'] or newer[0]['check_version']:
+                    # The failed save goes first; the newer one is checked against its result
+                    self.pending[form_id] = [params, futures, attempts + 1]
+                    self.deferred.append(newer)
+                else:
+                    # A later save supersedes these params (column by column); its flush acks the older waiters too
+                    newer[0] = {**params, **newer[0]}
+                    newer[1][:0] = futures
+                    newer[2] = max(newer[2], attempts + 1)
+                retry_delay = max(retry_delay, self.flush_interval * 2 ** attempts)
+            self.condition.notify()
+        time.sleep(retry_delay)
+    
+    def close(self, timeout=10):
+        """Stop accepting saves, flush what is pending (with retries) and wait for the writer thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join(timeout)
+
+class EditJournal:
+    """
+    Append-only local journal of record saves (JSON lines at JOURNAL_PATH), written before the database write
+    - append() fsyncs the save's parameters and versions under a new sequence number; ack() marks it done
+    - Entries still unacknowledged (database unreachable, or a crash) are replayed in sequence order by a
+      background thread and again on the next start
+    - Replays are idempotent per form_id and sequence: each is version-checked against the Updated_at the
+      edit was based on, and a record that already holds the entry's values is only acknowledged
+    - The file is truncated whenever nothing is pending
+    """
+    
+    def __init__(self, data_manager, path=JOURNAL_PATH, replay_seconds=JOURNAL_REPLAY_SECONDS):
+        self.data_manager = data_manager
+        self.path = path
+        self.replay_seconds = replay_seconds
+        self.pending = {}  # seq -> entry, in sequence order
+        self.in_flight = set()  # seqs a live save is still writing - not for the replayer
+        self.seq = 0
+        self._lock = threading.Lock()  # Guards the file, pending and in_flight
+        self._replay_lock = threading.Lock()  # One drain at a time
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # Set to replay now instead of after replay_seconds
+        self._load()
+        self.thread = threading.Thread(target=self._run, name="jjm-edit-journal", daemon=True)
+        self.thread.start()
+    
+    def _load(self):
+        """Rebuild the pending entries from the file left by the previous process"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash mid-append
+                if 'ack' in record:
+                    self.pending.pop(record['ack'], None)
+                    self.seq = max(self.seq, record['ack'])
+                else:
+                    self.pending[record['seq']] = record
+                    self.seq = max(self.seq, record['seq'])
+        if self.pending:
+            print(f"Edit journal: {len(self.pending)} unsaved record edits to replay")
+    
+    def _write_line(self, record):
+        """Append one JSON line and fsync it (caller holds _lock)"""
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def append(self, params, expected_updated_at, base_updated_at, in_flight=False):
+        """
+        Journal one save (DataManager._record_params plus the version it was checked against and the
+        version the edit was based on) and return its sequence number
+        """
+        with self._lock:
+            self.seq += 1
+            entry = {
+                'seq': self.seq,
+                'form_id': params['form_id'],
+                'params': params,
+                'check_version': expected_updated_at is not None,
+                'expected_updated_at': journal_time(expected_updated_at),
+                'base_updated_at': journal_time(base_updated_at),
+                'journaled_at': pd.Timestamp.now().isoformat()
+            }
+            self._write_line(entry)
+            self.pending[self.seq] = entry
+            if in_flight:
+                self.in_flight.add(self.seq)
+        return self.seq
+    
+    def release(self, seq):
+        """A live save of this entry failed to reach the database - leave it to the replayer"""
+        with self._lock:
+            self.in_flight.discard(seq)
+    
+    def ack(self, seq):
+        """The database has the entry (or refused it for good): drop it from the journal"""
+        with self._lock:
+            self.in_flight.discard(seq)
+            if self.pending.pop(seq, None) is None:
+                return
+            if self.pending:
+                self._write_line({'ack': seq})
+            else:
+                open(self.path, 'w').close()
+    
+    def pending_count(self):
+        """Edits waiting for the replayer"""
+        with self._lock:
+            return len(self.pending) - len(self.in_flight)
+    
+    def has_pending(self):
+        return self.pending_count() > 0
+    
+    def replay(self):
+        """
+        Write the waiting entries in sequence order. Stops at the first connection failure and
+        returns False (everything from there on stays journaled); True once the journal is drained.
+        """
+        with self._replay_lock:
+            with self._lock:
+                entries = [entry for seq, entry in self.pending.items() if seq not in self.in_flight]
+            replayed = {}  # form_id -> (base version, version it produced), to chain several edits of one record
+            for entry in entries:
+                try:
+                    self._replay_entry(entry, replayed)
+                except Exception as e:
+                    if is_connection_error(e):
+                        return False
+                    print(f"Warning: Dropping journaled edit {entry['seq']} of record {entry['form_id']}: {e}")
+                    self.ack(entry['seq'])
+                    self._report(entry, False, f"Saving record {entry['form_id']} from the local journal failed: {e}")
+            return True
+    
+    def _replay_entry(self, entry, replayed):
+        """Write one journaled edit, version-checked so that replaying it twice cannot apply it twice"""
+        form_id, params = entry['form_id'], entry['params']
+        base = entry['base_updated_at']
+        if form_id in replayed and replayed[form_id][0] == base:
+            base = replayed[form_id][1]  # an earlier journaled edit of this record already moved the version on
+        
+        with self.data_manager.get_engine().begin() as conn:
+            try:
+                saved = self.data_manager._write_params(conn, params, pd.Timestamp(base) if base else pd.NaT)
+            except RecordConflictError as conflict:
+                if any(conflict.current.get(column) != value for column, value in params.items() if column != 'actor'):
+                    # Changed by someone else since the edit was made - theirs wins
+                    self.data_manager._apply_db_row(conflict.current)
+                    self.ack(entry['seq'])
+                    self._report(entry, False, f"Record {form_id} was changed by {conflict.current.get('editor') or 'another editor'} "
+                                               f"while it waited in the local journal - your changes were not saved")
+                    return
+                saved = conflict.current  # this edit was committed before it could be acknowledged
+        
+        self.ack(entry['seq'])
+        if saved is None:
+            self._report(entry, False, f"No record found with form_id {form_id}")
+            return
+        replayed[form_id] = (entry['base_updated_at'], journal_time(saved.get('updated_at')))
+        if self.data_manager.data_cache is not None:
+            self.data_manager._apply_db_row(saved)
+        self._report(entry, True)
+    
+    def _report(self, entry, ok, message=None):
+        """Tell the editor who made the edit how its replay went"""
+        outcome = {'form_id': entry['form_id'], 'ok': ok}
+        if message:
+            outcome['message'] = message
+        # Diff-only params usually lack 'editor'; 'actor' is the user who made the save
+        params = entry['params']
+        self.data_manager.add_save_outcome(params.get('actor') or params.get('editor') or 'Unknown', outcome)
+    
+    def wake(self):
+        """Have the replayer try the waiting entries now (returns at once)"""
+        self._wake.set()
+    
+    def _run(self):
+        while True:
+            if self.has_pending():
+                try:
+                    self.replay()
+                except Exception as e:
+                    print(f"Warning: Edit journal replay failed: {e}")
+            self._wake.wait(self.replay_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+    
+    def close(self, timeout=10):
+        """Stop the replayer and make one last attempt to drain the journal"""
+        self._stop.set()
+        self._wake.set()
+        self.thread.join(timeout)
+        if self.has_pending():
+            self.replay()
+
+@st.cache_resource(show_spinner=False)
+def get_record_store():
+    """Process-wide DataManager shared by all sessions - loaded once, patched in place by every save"""
+    store = DataManager()
+    if QUERY_MODE == "server":
+        # The full load normally creates it; server mode needs it for the daily progress counts
+        store.create_sync_index()
+    # Leave a fresh warm-start snapshot behind when the container stops
+    atexit.register(store.write_snapshot)
+    if PROGRESS_ROLLUP_ENABLED:
+        from models import create_progress_rollup
+        try:
+            create_progress_rollup(store.get_engine(), store.table_name)
+        except Exception as e:
+            print(f"Warning: Could not install the daily progress rollup: {e}")
+    if EVENT_LOG_ENABLED:
+        from models import create_edit_event_log
+        try:
+            create_edit_event_log(store.get_engine(), store.table_name)
+        except Exception as e:
+            print(f"Warning: Could not install the edit event log: {e}")
+    if JOURNAL_ENABLED:
+        store.journal = EditJournal(store)
+        # Final replay attempt after the save pool and the write-behind queue are done (atexit is LIFO)
+        atexit.register(store.journal.close)
+    if WRITE_BEHIND_ENABLED:
+        store.write_queue = WriteBehindQueue(store)
+        # Registered after the snapshot so it runs first at exit (atexit is LIFO)
+        atexit.register(store.write_queue.close)
+    if ASYNC_SAVES_ENABLED:
+        store.save_pool = ThreadPoolExecutor(max_workers=ASYNC_SAVE_WORKERS, thread_name_prefix="jjm-save")
+        # Registered last so in-flight saves drain (into the write-behind queue, if any) before anything closes
+        atexit.register(store.save_pool.shutdown)
+    return store
+
 class KeywordManager:
     """
     Database-based keyword manager that reads brand data from PostgreSQL database
@@ -595,7 +2683,10 @@ class KeywordManager:
         self.engine = None
         self.global_data = {}
         self.brands_cache = {}
+        self.brand_names_by_id = {}  # brand id -> cache key, for NOTIFY-driven patches
         self.keywords_loaded = False  # Flag to track if keywords are loaded
+        self.load_error = None  # Message of the last failed load_all_keywords(), for the UI to show
+        self._lock = threading.RLock()  # Shared by all sessions and the change listener
         self.connect_to_database()
         self.load_all_keywords()
     
@@ -610,7 +2701,10 @@ class KeywordManager:
             return False
     
     def load_all_keywords(self, force_reload=False):
-        """Load all brand keywords from database and cache them"""
+        """
+        Load all brand keywords from database and cache them.
+        Also runs on the change listener thread, so errors are printed and kept in load_error (no st calls).
+        """
         # Only load if not already loaded or force reload is requested
         if self.keywords_loaded and not force_reload:
             return
@@ -622,12 +2716,10 @@ class KeywordManager:
             from models import Brand, Model, ModelSize, ModelMaterial, BrandColor, BrandHardware
             from sqlalchemy.orm import joinedload
             from sqlalchemy.orm import selectinload
-            # Clear cache before reloading
-            self.brands_cache = {}
-            self.global_data = {}
-            
             # Load all brands with their related data
             # ...existing code...
+            if force_reload:
+                self.session.expire_all()  # Don't reuse identity-map rows from the previous load
             brands = self.session.query(Brand).options(
                 selectinload(Brand.models).selectinload(Model.sizes),
                 selectinload(Brand.models).selectinload(Model.materials),
@@ -637,46 +2729,94 @@ class KeywordManager:
             # ...existing code...
             
             # Cache brand data in the same format as JSON-based system
+            # Built aside and swapped in, so other sessions never see a half-empty cache
+            brands_cache = {}
+            brand_names_by_id = {}
             for brand in brands:
-                brand_data = {}
-                
-                # Group models by collection
-                collections = {}
-                for model in brand.models:
-                    collection = model.collection or "default"
-                    if collection not in collections:
-                        collections[collection] = {}
-                    
-                    # Add model with sizes and materials
-                    model_data = {}
-                    if model.sizes:
-                        model_data['sizes'] = [size.size for size in model.sizes]
-                    if model.materials:
-                        model_data['materials'] = [material.material for material in model.materials]
-                    
-                    collections[collection][model.model_name] = model_data
-                
-                # Add collections to brand data
-                brand_data.update(collections)
-                
-                # Add global colors and hardwares
-                if brand.colors:
-                    brand_data['colors'] = [color.color for color in brand.colors]
-                if brand.hardwares:
-                    brand_data['hardwares'] = [hardware.hardware for hardware in brand.hardwares]
-                
-                # Cache the brand data
-                self.brands_cache[brand.name.upper()] = brand_data
+                brands_cache[brand.name.upper()] = self._build_brand_data(brand)
+                brand_names_by_id[brand.id] = brand.name.upper()
             
-            # Extract global data
-            self.extract_global_data()
+            with self._lock:
+                self.brands_cache = brands_cache
+                self.brand_names_by_id = brand_names_by_id
+                
+                # Extract global data
+                self.extract_global_data()
             
             # Mark as loaded
             self.keywords_loaded = True
+            self.load_error = None
             
         except Exception as e:
-            st.error(f"❌ Error loading keywords from database: {e}")
+            print(f"Warning: Error loading keywords from database: {e}")
+            self.load_error = str(e)
             self.keywords_loaded = False
+        finally:
+            if self.session:
+                # Don't sit idle-in-transaction holding locks on the keyword tables
+                self.session.rollback()
+    
+    def _build_brand_data(self, brand):
+        """Brand ORM object -> cached dict {collection: {model: {sizes, materials}}, colors, hardwares}"""
+        brand_data = {}
+        
+        # Group models by collection
+        collections = {}
+        for model in brand.models:
+            collection = model.collection or "default"
+            if collection not in collections:
+                collections[collection] = {}
+            
+            # Add model with sizes and materials
+            model_data = {}
+            if model.sizes:
+                model_data['sizes'] = [size.size for size in model.sizes]
+            if model.materials:
+                model_data['materials'] = [material.material for material in model.materials]
+            
+            collections[collection][model.model_name] = model_data
+        
+        # Add collections to brand data
+        brand_data.update(collections)
+        
+        # Add global colors and hardwares
+        if brand.colors:
+            brand_data['colors'] = [color.color for color in brand.colors]
+        if brand.hardwares:
+            brand_data['hardwares'] = [hardware.hardware for hardware in brand.hardwares]
+        
+        return brand_data
+    
+    def apply_brand_change(self, brand_id):
+        """
+        Reload one brand's subtree after a NOTIFY (brand_id None -> full reload).
+        Uses a short-lived ORM session so no stale identity-map objects are reused.
+        """
+        if brand_id is None or self.engine is None:
+            self.refresh_cache()
+            return
+        
+        from models import Brand, Model
+        from sqlalchemy.orm import Session, selectinload
+        with Session(self.engine) as session:
+            brand = session.query(Brand).options(
+                selectinload(Brand.models).selectinload(Model.sizes),
+                selectinload(Brand.models).selectinload(Model.materials),
+                selectinload(Brand.colors),
+                selectinload(Brand.hardwares)
+            ).filter(Brand.id == brand_id).first()
+            brand_data = self._build_brand_data(brand) if brand else None
+            brand_name = brand.name.upper() if brand else None
+        
+        with self._lock:
+            # Drop the old entry (covers renames and deletes), then put the fresh subtree in place
+            old_name = self.brand_names_by_id.pop(brand_id, None)
+            if old_name is not None:
+                self.brands_cache.pop(old_name, None)
+            if brand_data is not None:
+                self.brands_cache[brand_name] = brand_data
+                self.brand_names_by_id[brand_id] = brand_name
+            self.extract_global_data()
     
     def extract_global_data(self):
         """Extract colors and materials organized by brand and globally"""
@@ -734,19 +2874,148 @@ class KeywordManager:
         return self.get_global_materials()
     
     def refresh_cache(self):
-        """Refresh the cache by reloading data from database - Manual refresh only"""
-        self.keywords_loaded = False  # Reset the flag to allow reload
-        self.brands_cache = {}
-        self.global_data = {}
-        self.load_all_keywords(force_reload=True)
+        """Refresh the cache by reloading data from database"""
+        with self._lock:
+            self.keywords_loaded = False  # Reset the flag to allow reload
+            self.load_all_keywords(force_reload=True)
     
     def __del__(self):
         """Clean up database connection"""
         if self.session:
             self.session.close()
 
-def create_filters(df):
-    """Create filter widgets with dependent dropdowns"""
+def _cell_value(dtype, value):
+    """Coerce one database value to what a column of `dtype` can hold in place (Decimal -> float, None -> NA)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == object:
+            return None
+        if dtype.kind == 'M':
+            return pd.NaT
+        if dtype.kind == 'f':
+            return np.nan
+        return pd.NA
+    if dtype.kind == 'f':
+        return float(value)
+    if dtype.kind in 'iu':
+        return int(value)
+    if dtype.kind == 'M':
+        value = pd.Timestamp(value)
+        return value.tz_localize(None) if value.tz is not None and getattr(dtype, 'tz', None) is None else value
+    return value
+
+@st.cache_resource(show_spinner=False)
+def get_keyword_store():
+    """Process-wide KeywordManager shared by all sessions and kept current by the change listener"""
+    return KeywordManager()
+
+class ChangeListener(threading.Thread):
+    """
+    Background LISTEN thread on its own psycopg2 connection
+    - jjm_records notifications re-read the changed form_ids into the shared record store, except rows
+      whose notified updated_at the cache already holds (this process's own saves, applied from RETURNING)
+    - jjm_keywords notifications reload the affected brand subtree of the keyword store
+    Notifications arriving together are batched; after a reconnect a delta sync covers anything missed.
+    """
+    
+    def __init__(self, record_store, keyword_store, db_config=db_config, poll_timeout=5.0):
+        super().__init__(name="jjm-change-listener", daemon=True)
+        self.record_store = record_store
+        self.keyword_store = keyword_store
+        self.db_config = db_config
+        self.poll_timeout = poll_timeout
+        self.stop_event = threading.Event()
+        self.connection = None
+    
+    def connect(self):
+        """Open the LISTEN connection (autocommit, both channels)"""
+        import psycopg2
+        from models import RECORDS_CHANNEL, KEYWORDS_CHANNEL
+        connection = psycopg2.connect(
+            host=self.db_config['host'],
+            port=self.db_config['port'],
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            dbname=self.db_config['database']
+        )
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {RECORDS_CHANNEL}")
+            cursor.execute(f"LISTEN {KEYWORDS_CHANNEL}")
+        self.connection = connection
+    
+    def run(self):
+        import select
+        backoff = 1
+        while not self.stop_event.is_set():
+            try:
+                if self.connection is None:
+                    self.connect()
+                    backoff = 1
+                    # Changes made while we were not listening
+                    self.record_store.sync_changes()
+                
+                if select.select([self.connection], [], [], self.poll_timeout) == ([], [], []):
+                    continue
+                self.connection.poll()
+                self.dispatch(self.connection.notifies)
+                self.connection.notifies.clear()
+            except Exception as e:
+                print(f"Warning: Change listener error, reconnecting in {backoff}s: {e}")
+                self.close()
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60)
+        self.close()
+    
+    def dispatch(self, notifications):
+        """Apply one batch of notifications to the shared stores"""
+        from models import RECORDS_CHANNEL, KEYWORDS_CHANNEL
+        versions = {}  # form_id -> notified updated_at (None: unknown or deleted), latest notification wins
+        brand_ids = set()
+        for notification in notifications:
+            if notification.channel == RECORDS_CHANNEL:
+                if notification.payload.startswith('{'):
+                    change = json.loads(notification.payload)
+                    versions[int(change['form_id'])] = change.get('updated_at')
+                else:
+                    versions[int(notification.payload)] = None  # plain form_id payload from an older trigger
+            elif notification.channel == KEYWORDS_CHANNEL:
+                brand_ids.add(json.loads(notification.payload).get('brand_id'))
+        
+        if versions:
+            self.record_store.apply_record_changes(list(versions), versions)
+        if None in brand_ids:
+            self.keyword_store.refresh_cache()
+        else:
+            for brand_id in brand_ids:
+                self.keyword_store.apply_brand_change(brand_id)
+    
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+    
+    def stop(self):
+        self.stop_event.set()
+
+@st.cache_resource(show_spinner=False)
+def get_change_listener():
+    """Install the NOTIFY triggers and start the process-wide change listener (once per process)"""
+    from models import create_change_notify_triggers
+    record_store = get_record_store()
+    try:
+        create_change_notify_triggers(record_store.get_engine(), record_store.table_name)
+    except Exception as e:
+        print(f"Warning: Could not install change notification triggers: {e}")
+    listener = ChangeListener(record_store, get_keyword_store())
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+def create_filters(df, data_manager):
+    """Create filter widgets with dependent dropdowns - option lists come from the data manager's facet bitmaps"""
     st.subheader("🔍 Filters")
     
     # First row: Status filter and Form ID Search
@@ -780,91 +3049,24 @@ def create_filters(df):
     
     with col2:
         if 'Types' in df.columns:
-            # Filter by status, form_id_search, and contract first, then get unique types
-            status_filtered_df = df.copy()
-            if filters['status'] == "✅ Fixed" and 'Status' in df.columns:
-                status_filtered_df = status_filtered_df[status_filtered_df['Status'] == 1]
-            elif filters['status'] == "❌ Unfixed" and 'Status' in df.columns:
-                status_filtered_df = status_filtered_df[status_filtered_df['Status'] == 0]
-            
-            # Apply form ID search if provided
-            if filters.get('form_id_search', '').strip() and 'Form_ids' in df.columns:
-                search_term = filters['form_id_search'].strip()
-                status_filtered_df = status_filtered_df[
-                    status_filtered_df['Form_ids'].astype(str).str.lower() == search_term.lower()
-                ]
-            
-            # Apply contract filter
-            if filters.get('contract') == "Not Empty" and 'Contract_Numbers' in df.columns:
-                status_filtered_df = status_filtered_df[status_filtered_df['Contract_Numbers'].notna()]
-            elif filters.get('contract') == "Empty" and 'Contract_Numbers' in df.columns:
-                status_filtered_df = status_filtered_df[status_filtered_df['Contract_Numbers'].isna()]
-            
-            unique_types = ['All'] + sorted([str(x) for x in status_filtered_df['Types'].dropna().unique() if str(x) != 'nan'])
+            # Types among the records matching status, form_id_search and contract
+            unique_types = ['All'] + data_manager.filter_options('type', filters)
             filters['type'] = st.selectbox("Type", unique_types, key="filter_type")
         else:
             filters['type'] = "All"
     
     with col3:
         if 'Brands' in df.columns and 'Types' in df.columns:
-            # Filter by status, form_id_search, contract, then by type
-            brand_filtered_df = df.copy()
-            if filters['status'] == "✅ Fixed" and 'Status' in df.columns:
-                brand_filtered_df = brand_filtered_df[brand_filtered_df['Status'] == 1]
-            elif filters['status'] == "❌ Unfixed" and 'Status' in df.columns:
-                brand_filtered_df = brand_filtered_df[brand_filtered_df['Status'] == 0]
-            
-            # Apply form ID search if provided
-            if filters.get('form_id_search', '').strip() and 'Form_ids' in df.columns:
-                search_term = filters['form_id_search'].strip()
-                brand_filtered_df = brand_filtered_df[
-                    brand_filtered_df['Form_ids'].astype(str).str.lower() == search_term.lower()
-                ]
-            
-            # Apply contract filter
-            if filters.get('contract') == "Not Empty" and 'Contract_Numbers' in df.columns:
-                brand_filtered_df = brand_filtered_df[brand_filtered_df['Contract_Numbers'].notna()]
-            elif filters.get('contract') == "Empty" and 'Contract_Numbers' in df.columns:
-                brand_filtered_df = brand_filtered_df[brand_filtered_df['Contract_Numbers'].isna()]
-            
-            if filters['type'] != "All":
-                brand_filtered_df = brand_filtered_df[brand_filtered_df['Types'].astype(str) == filters['type']]
-            
-            unique_brands = ['All'] + sorted([str(x) for x in brand_filtered_df['Brands'].dropna().unique() if str(x) != 'nan'])
+            # ... then by type
+            unique_brands = ['All'] + data_manager.filter_options('brand', filters)
             filters['brand'] = st.selectbox("Brand", unique_brands, key="filter_brand")
         else:
             filters['brand'] = "All"
     
     with col4:
         if 'Sub-Models' in df.columns and 'Types' in df.columns and 'Brands' in df.columns:
-            # Filter by status, form_id_search, contract, then by type, then by brand
-            filtered_for_submodel = df.copy()
-            
-            if filters['status'] == "✅ Fixed" and 'Status' in df.columns:
-                filtered_for_submodel = filtered_for_submodel[filtered_for_submodel['Status'] == 1]
-            elif filters['status'] == "❌ Unfixed" and 'Status' in df.columns:
-                filtered_for_submodel = filtered_for_submodel[filtered_for_submodel['Status'] == 0]
-            
-            # Apply form ID search if provided
-            if filters.get('form_id_search', '').strip() and 'Form_ids' in df.columns:
-                search_term = filters['form_id_search'].strip()
-                filtered_for_submodel = filtered_for_submodel[
-                    filtered_for_submodel['Form_ids'].astype(str).str.lower() == search_term.lower()
-                ]
-            
-            # Apply contract filter
-            if filters.get('contract') == "Not Empty" and 'Contract_Numbers' in df.columns:
-                filtered_for_submodel = filtered_for_submodel[filtered_for_submodel['Contract_Numbers'].notna()]
-            elif filters.get('contract') == "Empty" and 'Contract_Numbers' in df.columns:
-                filtered_for_submodel = filtered_for_submodel[filtered_for_submodel['Contract_Numbers'].isna()]
-            
-            if filters['type'] != "All":
-                filtered_for_submodel = filtered_for_submodel[filtered_for_submodel['Types'].astype(str) == filters['type']]
-            
-            if filters['brand'] != "All":
-                filtered_for_submodel = filtered_for_submodel[filtered_for_submodel['Brands'].astype(str) == filters['brand']]
-            
-            unique_submodels = ['All'] + sorted([str(x) for x in filtered_for_submodel['Sub-Models'].dropna().unique() if str(x) != 'nan'])
+            # ... then by type, then by brand
+            unique_submodels = ['All'] + data_manager.filter_options('submodel', filters)
             filters['submodel'] = st.selectbox("Sub-Model", unique_submodels, key="filter_submodel")
         else:
             filters['submodel'] = "All"
@@ -887,64 +3089,443 @@ def create_filters(df):
     
     return filters
 
-def apply_filters(df, filters):
-    """Apply filters to dataframe"""
-    filtered_df = df.copy()
+
+# Filter facets that compile to plain equality predicates in server query mode
+FILTER_FACET_COLUMNS = {'type': 'type', 'brand': 'brand', 'submodel': 'sub_model'}
+
+def build_filter_clause(filters, facets=('type', 'brand', 'submodel')):
+    """
+    Compile the Data Management filters into a parameterized SQL WHERE clause (server query mode).
+    Only the facets listed are applied, so dependent dropdowns can reuse the upstream filters.
+    """
+    clauses = []
+    params = {}
     
-    # Status filter
-    if filters.get('status') == "✅ Fixed" and 'Status' in df.columns:
-        filtered_df = filtered_df[filtered_df['Status'] == 1]
-    elif filters.get('status') == "❌ Unfixed" and 'Status' in df.columns:
-        filtered_df = filtered_df[filtered_df['Status'] == 0]
+    # Status filter - deleted records (status 2) never show up, same as active_df in memory mode
+    if filters.get('status') == "✅ Fixed":
+        clauses.append("status = 1")
+    elif filters.get('status') == "❌ Unfixed":
+        clauses.append("(status = 0 OR status IS NULL)")
+    else:
+        clauses.append("(status <> 2 OR status IS NULL)")
     
-    # Form ID search filter
-    if filters.get('form_id_search', '').strip() and 'Form_ids' in df.columns:
-        search_term = filters['form_id_search'].strip()
-        # Exact match (case-insensitive)
-        filtered_df = filtered_df[
-            filtered_df['Form_ids'].astype(str).str.lower() == search_term.lower()
-        ]
+    # Form ID search - exact match on the canonical integer text
+    search_term = filters.get('form_id_search', '').strip()
+    if search_term:
+        if search_term.isdigit() and str(int(search_term)) == search_term:
+            clauses.append("form_id = :form_id")
+            params['form_id'] = int(search_term)
+        else:
+            clauses.append("FALSE")
     
     # Contract filter
-    if filters.get('contract') == "Not Empty" and 'Contract_Numbers' in df.columns:
-        filtered_df = filtered_df[filtered_df['Contract_Numbers'].notna()]
-    elif filters.get('contract') == "Empty" and 'Contract_Numbers' in df.columns:
-        filtered_df = filtered_df[filtered_df['Contract_Numbers'].isna()]
+    if filters.get('contract') == "Not Empty":
+        clauses.append("contract_num IS NOT NULL")
+    elif filters.get('contract') == "Empty":
+        clauses.append("contract_num IS NULL")
+    
+    # Type / Brand / Sub-Model filters
+    for facet in facets:
+        value = filters.get(facet, "All")
+        if value and value != "All":
+            clauses.append(f"{FILTER_FACET_COLUMNS[facet]} = :{facet}")
+            params[facet] = value
+    
+    return " AND ".join(clauses), params
+
+def create_server_filters(data_manager):
+    """Filter widgets for server query mode - dropdown options come from SELECT DISTINCT queries"""
+    st.subheader("🔍 Filters")
+    
+    # First row: Status filter and Form ID Search
+    col_status, col_search = st.columns([1, 1])
+    filters = {}
+    
+    with col_status:
+        status_options = ["All", "✅ Fixed", "❌ Unfixed"]
+        filters['status'] = st.selectbox("📊 Status", status_options, key="filter_status")
+    
+    with col_search:
+        filters['form_id_search'] = st.text_input(
+            "🔍 Search Form ID", 
+            placeholder="Enter exact Form ID to search...",
+            key="form_id_search",
+            help="Search for records with exact Form ID match (case-insensitive)"
+        )
+    
+    # Second row: Other filters
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        filters['contract'] = st.selectbox("Contract Number", ["All", "Not Empty", "Empty"])
+    
+    with col2:
+        unique_types = ['All'] + data_manager.get_filter_options('type', filters)
+        filters['type'] = st.selectbox("Type", unique_types, key="filter_type")
+    
+    with col3:
+        unique_brands = ['All'] + data_manager.get_filter_options('brand', filters, facets=('type',))
+        filters['brand'] = st.selectbox("Brand", unique_brands, key="filter_brand")
+    
+    with col4:
+        unique_submodels = ['All'] + data_manager.get_filter_options('sub_model', filters, facets=('type', 'brand'))
+        filters['submodel'] = st.selectbox("Sub-Model", unique_submodels, key="filter_submodel")
+    
+    # Show active filters
+    active_filters = []
+    if filters['status'] != "All":
+        active_filters.append(f"Status='{filters['status']}'")
+    if filters.get('form_id_search', '').strip():
+        active_filters.append(f"Form ID='{filters['form_id_search']}'")
+    if filters['type'] != "All":
+        active_filters.append(f"Type='{filters['type']}'")
+    if filters['brand'] != "All":
+        active_filters.append(f"Brand='{filters['brand']}'")
+    if filters['submodel'] != "All":
+        active_filters.append(f"Sub-Model='{filters['submodel']}'")
+    
+    if active_filters:
+        st.info(f"🔍 Active filters: {', '.join(active_filters)}")
     
-    # Other filters
-    if filters.get('type') != "All" and 'Types' in df.columns:
-        filtered_df = filtered_df[filtered_df['Types'].astype(str) == filters['type']]
+    return filters
+
+def show_keyset_page(data_manager, filters, key):
+    """Render Previous/Next keyset pagination and return (page_df, total) for the current page"""
+    # Restart from the first page whenever the filters change
+    signature = json.dumps(filters, sort_keys=True)
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_cursors"] = [None]
+    cursors = st.session_state[f"{key}_cursors"]
     
-    if filters.get('brand') != "All" and 'Brands' in df.columns:
-        filtered_df = filtered_df[filtered_df['Brands'].astype(str) == filters['brand']]
+    page_df, has_next = data_manager.fetch_page(filters, after_form_id=cursors[-1])
+    total = data_manager.count_records(filters)
+    total_pages = max(1, (total + SERVER_PAGE_SIZE - 1) // SERVER_PAGE_SIZE)
     
-    if filters.get('submodel') != "All" and 'Sub-Models' in df.columns:
-        filtered_df = filtered_df[filtered_df['Sub-Models'].astype(str) == filters['submodel']]
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Previous", disabled=len(cursors) == 1, use_container_width=True, key=f"{key}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col_info:
+        st.caption(f"Page {len(cursors)} of {total_pages} · {total} records")
+    with col_next:
+        if st.button("Next ➡️", disabled=not has_next, use_container_width=True, key=f"{key}_next"):
+            cursors.append(int(page_df['Form_ids'].iloc[-1]))
+            st.rerun()
     
-    return filtered_df
+    return page_df, total
 
+def _status_display_frame(df):
+    """Copy of df with the visual Status column first, ready for st.dataframe"""
+    display_df = df.copy()
+    if 'Status' in display_df.columns:
+        display_df['Status_Display'] = display_df['Status'].map({
+            0: '❌ Unfixed',
+            1: '✅ Fixed'
+        })
+        cols = ['Status_Display'] + [col for col in display_df.columns if col not in ['Status_Display', 'Status']]
+        display_df = display_df[cols]
+    return display_df.reset_index(drop=True)
 
-def create_edit_form(selected_row, keyword_manager, data_manager, context="main"):
-    """Create edit form with dependent dropdowns - compact version for right column"""
+def filters_key(filters):
+    """Hashable form of a create_filters() dict, for memoizing filtered frames"""
+    return tuple(sorted((name, str(value)) for name, value in filters.items()))
+
+def status_display_table(data_manager, key, frame_fn):
+    """
+    Table frame for st.dataframe: visual Status column first and the cache index kept as an 'index' column.
+    Built from frame_fn() once per data version (memoized under key); rows with an unacknowledged async
+    save are relabelled on a copy.
+    """
+    def build():
+        display_df = frame_fn().copy()
+        if 'Status' in display_df.columns:
+            display_df['Status_Display'] = display_df['Status'].map({
+                0: '❌ Unfixed',
+                1: '✅ Fixed'
+            })
+            cols = ['Status_Display'] + [col for col in display_df.columns if col not in ['Status_Display', 'Status']]
+            display_df = display_df[cols]
+        return display_df.reset_index(drop=False)
     
-    # Initialize form state
-    if 'form_state' not in st.session_state:
-        st.session_state.form_state = {
-            'type': selected_row.get('Types', ''),
-            'brand': selected_row.get('Brands', ''),
-            'model': selected_row.get('Models', ''),
-            'submodel': selected_row.get('Sub-Models', ''),
-            'size': selected_row.get('Sizes', ''),
-            'color': selected_row.get('Colors', ''),
-            'hardware': selected_row.get('Hardwares', ''),
-            'material': selected_row.get('Materials', '')
-        }
+    display_df = data_manager.memoized(('display', key), build)
+    saving = data_manager.saving_form_ids()
+    if saving and 'Status_Display' in display_df.columns:
+        saving_rows = display_df['Form_ids'].isin(saving)
+        if saving_rows.any():
+            display_df = display_df.copy()
+            display_df.loc[saving_rows, 'Status_Display'] = '⏳ Saving...'
+    return display_df
+
+def _record_column_config(display_df):
+    """Column config shared by the record tables"""
+    return {
+        "Picture_url": st.column_config.LinkColumn(
+            "Picture URL",
+            help="Click to view image",
+            display_text="View Image"
+        ) if 'Picture_url' in display_df.columns else None,
+        "Status_Display": st.column_config.TextColumn(
+            "Status",
+            help="Record status",
+            width="small"
+        ) if 'Status_Display' in display_df.columns else None,
+    }
+
+@st.fragment(run_every=1.0)
+def show_loading_preview(data_manager):
+    """
+    Shown while the record store loads in the background: progress plus the first page of unfixed records.
+    Polls once a second and reruns the whole page when the load finishes so counts and filters fill in.
+    """
+    if data_manager.load_state != "loading":
+        st.rerun()
+    
+    fraction, message = data_manager.load_progress
+    st.progress(fraction, text=message)
+    
+    first_page = data_manager.first_page
+    if first_page is not None and not first_page.empty:
+        st.subheader(f"📋 First {len(first_page)} Unfixed Records")
+        st.caption("The full table is still loading - filters and editing are available once it finishes.")
+        display_df = _status_display_frame(first_page)
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config=_record_column_config(display_df),
+            key="loading_preview_table"
+        )
+
+def show_analytics(data_manager):
+    """Editor throughput: records per hour per editor, and time between saves / idle gaps"""
+    st.subheader("📊 Editor Throughput")
+    if QUERY_MODE != "server" and not data_manager.is_loaded():
+        st.info("⏳ Records are still loading...")
+        return
+    
+    days = st.selectbox("Period", [1, 7, 30], index=1, format_func=lambda d: "Last 24 hours" if d == 1 else f"Last {d} days",
+                        key="analytics_days")
+    try:
+        hourly, stats = data_manager.editor_throughput(days)
+    except Exception as e:
+        st.error(f"❌ Could not compute throughput: {e}")
+        return
+    
+    if stats.empty:
+        st.info("No fixed records were saved in this period.")
+        return
+    
+    st.caption(f"Fixed records saved per hour (latest save of each record, by Updated_at). "
+               f"Pauses over {IDLE_GAP_MINUTES} minutes between two saves count as idle.")
+    st.line_chart(hourly)
+    st.dataframe(stats, use_container_width=True)
+
+def show_target_settings(data_manager, editors):
+    """Admin-only sidebar expander for the per-editor daily targets"""
+    with st.expander("🎯 Daily Targets"):
+        if not editors:
+            st.caption("No editors yet.")
+            return
+        editor = st.selectbox("Editor", editors, key="target_editor")
+        current = data_manager.get_editor_targets().get(editor, DEFAULT_DAILY_TARGET)
+        target = st.number_input("Records per day", min_value=1, value=int(current), step=5, key=f"target_value_{editor}")
+        col_save, col_reset = st.columns(2)
+        with col_save:
+            save = st.button("💾 Save", use_container_width=True, key="target_save")
+        with col_reset:
+            reset = st.button("↩️ Default", use_container_width=True, key="target_reset")
+        if save or reset:
+            try:
+                data_manager.set_editor_target(editor, target if save else None)
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Could not save the target: {e}")
+
+def show_progress_history(data_manager, editors):
+    """Admin-only sidebar expander with records fixed/unfixed/deleted per week or month, from the progress rollup"""
+    with st.expander("📅 Progress History"):
+        period = st.radio("Per", ["week", "month"], horizontal=True, key="history_period")
+        editor = st.selectbox("Editor", ["All editors"] + editors, key="history_editor")
+        periods_back = 8 if period == "week" else 6
+        start_date = pd.Timestamp.now().normalize() - (
+            pd.DateOffset(weeks=periods_back) if period == "week" else pd.DateOffset(months=periods_back)
+        )
+        history = data_manager.get_progress_history(
+            start_date, period=period, editor=None if editor == "All editors" else editor
+        )
+        if history.empty:
+            st.caption("No status changes recorded yet.")
+            return
+        if editor == "All editors":
+            history = history.groupby('Period', as_index=False)[['Fixed', 'Unfixed', 'Deleted']].sum()
+        st.dataframe(
+            history[['Period', 'Fixed', 'Unfixed', 'Deleted']].sort_values('Period', ascending=False),
+            hide_index=True, use_container_width=True
+        )
+        st.caption("Status changes made in each period (a record fixed twice counts twice).")
+
+@st.fragment(run_every=1.0)
+def show_save_status(data_manager):
+    """Sidebar status of this editor's background saves (async pool and edit journal): toasts, errors, waiting counts"""
+    current_user = st.session_state.get('username', 'Unknown')
+    for outcome in data_manager.pop_save_outcomes(current_user):
+        if outcome['ok']:
+            st.toast(outcome.get('message') or f"✅ Record {outcome['form_id']} saved")
+        else:
+            st.session_state.setdefault('failed_saves', []).append(outcome['message'])
+    
+    for message in st.session_state.get('failed_saves', []):
+        st.error(f"❌ {message}")
+    if st.session_state.get('failed_saves') and st.button("Dismiss", key="dismiss_failed_saves"):
+        st.session_state.failed_saves = []
+        st.rerun()
+    
+    in_flight = len(data_manager.saving_form_ids(current_user))
+    if in_flight:
+        st.caption(f"⏳ Saving {in_flight} record(s)...")
+    journaled = data_manager.journal.pending_count() if data_manager.journal is not None else 0
+    if journaled:
+        st.caption(f"📝 {journaled} edit(s) waiting in the local journal for the database")
+
+def show_server_data_management(data_manager, keyword_manager):
+    """Data Management tab for server query mode - filters run in SQL, only one page is in memory"""
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    # Left Column: Image Preview
+    with col1:
+        st.subheader("🖼️ Image Preview")
+        current_selection = st.session_state.get('selected_row', None)
+        image_url = current_selection.get('Picture_url') if current_selection else None
+        if image_url and str(image_url) != 'nan' and str(image_url).strip():
+            try:
+                st.image(image_url, caption=f"Product Image (Form {current_selection.get('Form_ids')})", use_container_width=True)
+            except Exception as e:
+                st.error("Could not load image")
+                st.error(f"Error details: {str(e)}")
+        elif current_selection:
+            st.info("No valid image URL available")
+        else:
+            st.info("Select a row to view image")
+    
+    # Middle Column: Filters and one keyset page of the table
+    with col2:
+        filters = create_server_filters(data_manager)
+        page_df, total = show_keyset_page(data_manager, filters, key="main_page")
+        
+        st.subheader(f"📋 Data Table ({total} records)")
+        
+        if not page_df.empty:
+            display_df = _status_display_frame(page_df)
+            event = st.dataframe(
+                display_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config=_record_column_config(display_df),
+                on_select="rerun",
+                selection_mode="single-row",
+                height=400,
+                key="main_data_table"
+            )
+            
+            if event.selection.rows:
+                selected_data = page_df.iloc[event.selection.rows[0]].to_dict()
+                selected_data['_index'] = selected_data['Form_ids']
+                current_selected_row = st.session_state.get('selected_row', None)
+                if not current_selected_row or current_selected_row.get('_index') != selected_data['_index']:
+                    st.session_state.selected_row = selected_data
+                    st.session_state.show_edit_form = True
+                    if 'form_state' in st.session_state:
+                        del st.session_state.form_state
+                    st.rerun()
+            elif st.session_state.get('selected_row') is not None:
+                st.session_state.selected_row = None
+                st.session_state.show_edit_form = False
+                if 'form_state' in st.session_state:
+                    del st.session_state.form_state
+        else:
+            st.info("No records match the current filters.")
+    
+    # Right Column: Edit Form
+    with col3:
+        st.subheader("✏️ Edit Record")
+        if st.session_state.show_edit_form and st.session_state.selected_row:
+            create_edit_form(st.session_state.selected_row, keyword_manager, data_manager, context="main")
+        else:
+            st.info("Select a record to edit")
+
+def show_server_fixed_records(data_manager, keyword_manager, col1, col2):
+    """Fixed Records tab for server query mode - renders into the tab's table / edit-form columns"""
+    with col1:
+        st.subheader("✅ Fixed Records")
+        page_df, total = show_keyset_page(data_manager, {'status': "✅ Fixed"}, key="fixed_page")
+        st.subheader(f"Total Fixed Records: {total}")
+        bulk_mode = st.toggle("Select several rows", key="fixed_bulk_mode")
+        
+        if not page_df.empty:
+            display_df = _status_display_frame(page_df)
+            fixed_event = st.dataframe(
+                display_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config=_record_column_config(display_df),
+                on_select="rerun",
+                selection_mode="multi-row" if bulk_mode else "single-row",
+                height=400,
+                key="fixed_records_table_bulk" if bulk_mode else "fixed_records_table"
+            )
+            
+            if bulk_mode:
+                st.session_state.fixed_selected_row = None  # Edit form is for single selection only
+                selected = page_df.iloc[fixed_event.selection.rows]
+                show_bulk_status_actions(data_manager, selected['Form_ids'].tolist(), "fixed_records_table",
+                                         selected['Updated_at'].tolist() if 'Updated_at' in selected.columns else None)
+            elif fixed_event.selection.rows:
+                selected_data = page_df.iloc[fixed_event.selection.rows[0]].to_dict()
+                selected_data['_index'] = selected_data['Form_ids']
+                current_fixed_selected_row = st.session_state.get('fixed_selected_row', None)
+                if not current_fixed_selected_row or current_fixed_selected_row.get('_index') != selected_data['_index']:
+                    st.session_state.fixed_selected_row = selected_data
+                    if 'fixed_form_state' in st.session_state:
+                        del st.session_state.fixed_form_state
+                    st.rerun()
+            elif st.session_state.get('fixed_selected_row') is not None:
+                st.session_state.fixed_selected_row = None
+                if 'fixed_form_state' in st.session_state:
+                    del st.session_state.fixed_form_state
+        else:
+            st.info("No records have been fixed yet.")
+        
+        if st.session_state.get('fixed_selected_row'):
+            st.markdown("---")
+            if st.button("🔄 Unfix This Record", type="secondary", use_container_width=True, key="fixed_unfix_single_btn"):
+                if data_manager.unfix_record_by_form_id(st.session_state.fixed_selected_row):
+                    st.success("✅ Record moved back to unfixed!")
+                    st.session_state.fixed_selected_row = None
+                    st.rerun()
+                elif st.session_state.get('save_conflict'):
+                    st.rerun()
+                else:
+                    st.error("❌ Failed to unfix record")
     
+    with col2:
+        st.subheader("✏️ Edit Fixed Record")
+        if st.session_state.fixed_selected_row:
+            create_fixed_edit_form(st.session_state.fixed_selected_row, keyword_manager, data_manager)
+        else:
+            st.info("Click on a row in the table to edit the record")
+
+def keyword_selectors(state, keyword_manager, context):
+    """
+    Cascading Type/Brand/Model/Sub-Model/Size/Material/Color/Hardware selectboxes.
+    `state` holds the current choices (keys type, brand, ... material) and is updated in place.
+    """
     # Types dropdown - add this first
-    types_options = ['', 'Bag', 'Jewelry', 'Watch']
+    types_options = [''] + TYPE_OPTIONS
     type_idx = 0
-    if st.session_state.form_state['type'] in types_options:
-        type_idx = types_options.index(st.session_state.form_state['type'])
+    if state['type'] in types_options:
+        type_idx = types_options.index(state['type'])
     
     selected_type = st.selectbox(
         "Type",
@@ -953,14 +3534,14 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_type_{context}"
     )
     
-    if selected_type != st.session_state.form_state['type']:
-        st.session_state.form_state['type'] = selected_type
+    if selected_type != state['type']:
+        state['type'] = selected_type
     
     # Brand dropdown
     brands = [''] + sorted(keyword_manager.get_available_brands())
     brand_idx = 0
-    if st.session_state.form_state['brand'] in brands:
-        brand_idx = brands.index(st.session_state.form_state['brand'])
+    if state['brand'] in brands:
+        brand_idx = brands.index(state['brand'])
     
     selected_brand = st.selectbox(
         "Brand", 
@@ -969,12 +3550,12 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_brand_{context}"
     )
     
-    if selected_brand != st.session_state.form_state['brand']:
-        st.session_state.form_state['brand'] = selected_brand
-        st.session_state.form_state['model'] = ''
-        st.session_state.form_state['submodel'] = ''
-        st.session_state.form_state['size'] = ''
-        st.session_state.form_state['material'] = ''
+    if selected_brand != state['brand']:
+        state['brand'] = selected_brand
+        state['model'] = ''
+        state['submodel'] = ''
+        state['size'] = ''
+        state['material'] = ''
     
     # Model dropdown
     models = ['']
@@ -984,8 +3565,8 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
             models.extend(sorted([key for key in brand_data.keys() if key not in ['colors', 'hardwares']]))
     
     model_idx = 0
-    if st.session_state.form_state['model'] in models:
-        model_idx = models.index(st.session_state.form_state['model'])
+    if state['model'] in models:
+        model_idx = models.index(state['model'])
     
     selected_model = st.selectbox(
         "Model", 
@@ -994,11 +3575,11 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_model_{context}"
     )
     
-    if selected_model != st.session_state.form_state['model']:
-        st.session_state.form_state['model'] = selected_model
-        st.session_state.form_state['submodel'] = ''
-        st.session_state.form_state['size'] = ''
-        st.session_state.form_state['material'] = ''
+    if selected_model != state['model']:
+        state['model'] = selected_model
+        state['submodel'] = ''
+        state['size'] = ''
+        state['material'] = ''
     
     # Sub-Model dropdown
     submodels = ['']
@@ -1010,8 +3591,8 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
                 submodels.extend(sorted(list(model_data.keys())))
     
     submodel_idx = 0
-    if st.session_state.form_state['submodel'] in submodels:
-        submodel_idx = submodels.index(st.session_state.form_state['submodel'])
+    if state['submodel'] in submodels:
+        submodel_idx = submodels.index(state['submodel'])
     
     selected_submodel = st.selectbox(
         "Sub-Model", 
@@ -1020,10 +3601,10 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_submodel_{context}"
     )
     
-    if selected_submodel != st.session_state.form_state['submodel']:
-        st.session_state.form_state['submodel'] = selected_submodel
-        st.session_state.form_state['size'] = ''
-        st.session_state.form_state['material'] = ''
+    if selected_submodel != state['submodel']:
+        state['submodel'] = selected_submodel
+        state['size'] = ''
+        state['material'] = ''
     
     # Size dropdown
     sizes = ['']
@@ -1038,8 +3619,8 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
                 sizes.extend(sorted(submodel_data['sizes']))
     
     size_idx = 0
-    if st.session_state.form_state['size'] in sizes:
-        size_idx = sizes.index(st.session_state.form_state['size'])
+    if state['size'] in sizes:
+        size_idx = sizes.index(state['size'])
     
     selected_size = st.selectbox(
         "Size", 
@@ -1048,8 +3629,8 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_size_{context}"
     )
     
-    if selected_size != st.session_state.form_state['size']:
-        st.session_state.form_state['size'] = selected_size
+    if selected_size != state['size']:
+        state['size'] = selected_size
     
     # Material dropdown
     materials = ['']
@@ -1064,8 +3645,8 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
                 materials.extend(sorted(submodel_data['materials']))
     
     material_idx = 0
-    if st.session_state.form_state['material'] in materials:
-        material_idx = materials.index(st.session_state.form_state['material'])
+    if state['material'] in materials:
+        material_idx = materials.index(state['material'])
     
     selected_material = st.selectbox(
         "Material", 
@@ -1074,14 +3655,14 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_material_{context}"
     )
     
-    if selected_material != st.session_state.form_state['material']:
-        st.session_state.form_state['material'] = selected_material
+    if selected_material != state['material']:
+        state['material'] = selected_material
     
     # Color dropdown
     colors = [''] + sorted(keyword_manager.get_brand_colors(selected_brand))
     color_idx = 0
-    if st.session_state.form_state['color'] in colors:
-        color_idx = colors.index(st.session_state.form_state['color'])
+    if state['color'] in colors:
+        color_idx = colors.index(state['color'])
     
     selected_color = st.selectbox(
         "Color", 
@@ -1090,14 +3671,14 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_color_{context}"
     )
     
-    if selected_color != st.session_state.form_state['color']:
-        st.session_state.form_state['color'] = selected_color
+    if selected_color != state['color']:
+        state['color'] = selected_color
     
     # Hardware dropdown
     hardwares = [''] + sorted(keyword_manager.get_brand_hardwares(selected_brand))
     hardware_idx = 0
-    if st.session_state.form_state['hardware'] in hardwares:
-        hardware_idx = hardwares.index(st.session_state.form_state['hardware'])
+    if state['hardware'] in hardwares:
+        hardware_idx = hardwares.index(state['hardware'])
     
     selected_hardware = st.selectbox(
         "Hardware", 
@@ -1106,11 +3687,11 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         key=f"edit_hardware_{context}"
     )
     
-    if selected_hardware != st.session_state.form_state['hardware']:
-        st.session_state.form_state['hardware'] = selected_hardware
+    if selected_hardware != state['hardware']:
+        state['hardware'] = selected_hardware
     
     # Update form state
-    st.session_state.form_state.update({
+    state.update({
         'type': selected_type,
         'brand': selected_brand,
         'model': selected_model,
@@ -1121,6 +3702,115 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         'material': selected_material
     })
     
+    return dict(state)
+
+CONFLICT_FIELDS = [('Type', 'Types', 'type'), ('Brand', 'Brands', 'brand'), ('Model', 'Models', 'model'),
+                   ('Sub-Model', 'Sub-Models', 'submodel'), ('Size', 'Sizes', 'size'), ('Color', 'Colors', 'color'),
+                   ('Hardware', 'Hardwares', 'hardware'), ('Material', 'Materials', 'material')]
+
+def show_save_conflict(selected_row, row_key, form_state_key, widget_prefix):
+    """
+    Shown above an edit form after a version-checked save lost the race: the record's current
+    values next to the editor's, with the choice to load the current record or save over it.
+    """
+    conflict = st.session_state.get('save_conflict')
+    if not conflict or conflict['form_id'] != int(selected_row.get('Form_ids', -1)):
+        return
+    current = conflict['current']
+    form_state = st.session_state.get(form_state_key, {})
+    
+    st.warning(f"⚠️ {current.get('Editor') or 'Another editor'} changed this record after you opened it "
+               f"({current.get('Updated_at')}). Your changes were not saved.")
+    st.dataframe(
+        pd.DataFrame({
+            'Current': [current.get(column) or '' for _, column, _ in CONFLICT_FIELDS],
+            'Yours': [form_state.get(key, '') for _, _, key in CONFLICT_FIELDS]
+        }, index=[label for label, _, _ in CONFLICT_FIELDS]),
+        use_container_width=True
+    )
+    
+    reload_col, keep_col = st.columns(2)
+    if reload_col.button("🔄 Load current", use_container_width=True, key=f"conflict_reload_{row_key}"):
+        st.session_state[row_key] = {**selected_row, **{column: value for column, value in current.items() if column in selected_row}}
+        st.session_state.pop(form_state_key, None)
+        for key in [key for key in st.session_state if str(key).startswith(widget_prefix)]:
+            del st.session_state[key]
+        del st.session_state.save_conflict
+        st.rerun()
+    if keep_col.button("✍️ Keep mine", use_container_width=True, key=f"conflict_keep_{row_key}"):
+        # Next save is checked against the current version, i.e. knowingly replaces it
+        st.session_state[row_key] = {**selected_row, 'Updated_at': current.get('Updated_at')}
+        del st.session_state.save_conflict
+        st.rerun()
+
+def show_record_history(selected_row, data_manager):
+    """Collapsed list of who changed this record and how, from the edit event log"""
+    with st.expander("🕘 History"):
+        try:
+            history = data_manager.record_history(selected_row['Form_ids'])
+        except Exception as e:
+            st.caption(f"History unavailable: {e}")
+            return
+        if history.empty:
+            st.caption("No changes recorded yet")
+            return
+        history['Changes'] = history['Changes'].apply(
+            lambda changes: ", ".join(f"{column}: {old} → {new}" for column, (old, new) in (changes or {}).items())
+        )
+        st.dataframe(history, hide_index=True, use_container_width=True)
+
+def select_next_unfixed(data_manager, after):
+    """
+    Open the first unfixed record after cache position `after` (wrapping around) in the Data Management
+    edit form. The table selection is dropped so it does not re-select the previous row.
+    """
+    position = data_manager.next_unfixed(after)
+    if position is None:
+        position = data_manager.next_unfixed()
+    st.session_state.pop('main_data_table', None)
+    st.session_state.pop('form_state', None)
+    if position is None:
+        st.session_state.selected_row = None
+        st.session_state.show_edit_form = False
+        st.session_state.jump_index = None
+        return False
+    
+    selected_data = data_manager.get_record(position)
+    selected_data['_index'] = position
+    st.session_state.selected_row = selected_data
+    st.session_state.show_edit_form = True
+    st.session_state.jump_index = position  # kept while the table has no selection (see the Data Management tab)
+    return True
+
+def create_edit_form(selected_row, keyword_manager, data_manager, context="main"):
+    """Create edit form with dependent dropdowns - compact version for right column"""
+    
+    # Initialize form state
+    if 'form_state' not in st.session_state:
+        st.session_state.form_state = {
+            'type': selected_row.get('Types', ''),
+            'brand': selected_row.get('Brands', ''),
+            'model': selected_row.get('Models', ''),
+            'submodel': selected_row.get('Sub-Models', ''),
+            'size': selected_row.get('Sizes', ''),
+            'color': selected_row.get('Colors', ''),
+            'hardware': selected_row.get('Hardwares', ''),
+            'material': selected_row.get('Materials', '')
+        }
+    
+    show_save_conflict(selected_row, 'selected_row', 'form_state', 'edit_')
+    
+    # Keyword dropdowns (dependent on each other)
+    selections = keyword_selectors(st.session_state.form_state, keyword_manager, context)
+    selected_type = selections['type']
+    selected_brand = selections['brand']
+    selected_model = selections['model']
+    selected_submodel = selections['submodel']
+    selected_size = selections['size']
+    selected_color = selections['color']
+    selected_hardware = selections['hardware']
+    selected_material = selections['material']
+    
     # Action buttons - stacked vertically for narrow column
     #st.markdown("---")
     
@@ -1160,14 +3850,24 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         }
         
         # Update the record with the status choice
-        success = data_manager.update_record(selected_row['_index'], updated_data, keep_as_fixed)
+        if QUERY_MODE == "server":
+            success = data_manager.update_record_by_form_id(selected_row, updated_data, keep_as_fixed)
+        else:
+            success = data_manager.update_record(selected_row['_index'], updated_data, keep_as_fixed,
+                                                 expected_updated_at=selected_row.get('Updated_at'))
         
         if success:
             st.success("✅ Record updated successfully!")
-            st.session_state.selected_row = None
-            st.session_state.show_edit_form = False
-            if 'form_state' in st.session_state:
-                del st.session_state.form_state
+            if QUERY_MODE != "server" and context == "main":
+                # Carry on with the next record still waiting to be matched
+                select_next_unfixed(data_manager, selected_row['_index'])
+            else:
+                st.session_state.selected_row = None
+                st.session_state.show_edit_form = False
+                if 'form_state' in st.session_state:
+                    del st.session_state.form_state
+            st.rerun()
+        elif st.session_state.get('save_conflict'):
             st.rerun()
         else:
             st.error("❌ Failed to save changes")
@@ -1182,6 +3882,9 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
             del st.session_state.form_state
         st.rerun()
     
+    if EVENT_LOG_ENABLED:
+        show_record_history(selected_row, data_manager)
+    
     # Delete confirmation popup
     if st.session_state.get('show_delete_popup', False):
         @st.dialog("Delete Record")
@@ -1192,7 +3895,10 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
             
             with col1:
                 if st.button("🗑️ Yes, Delete", type="primary", use_container_width=True, key="confirm_delete_btn"):
-                    success = data_manager.delete_record(selected_row['_index'])
+                    if QUERY_MODE == "server":
+                        success = data_manager.delete_record_by_form_id(selected_row['Form_ids'])
+                    else:
+                        success = data_manager.delete_record(selected_row['_index'])
                     
                     if success:
                         st.session_state.selected_row = None
@@ -1211,6 +3917,65 @@ def create_edit_form(selected_row, keyword_manager, data_manager, context="main"
         
         delete_confirmation()
 
+def create_bulk_edit_form(selected_indices, keyword_manager, data_manager):
+    """Bulk edit panel: one keyword assignment saved to every selected record in a single UPDATE"""
+    st.caption(f"{len(selected_indices)} records selected. Brand, Model and Sub-Model are required; "
+               "other fields left blank keep each record's current value.")
+    
+    if 'bulk_form_state' not in st.session_state:
+        st.session_state.bulk_form_state = {key: '' for key in ('type', 'brand', 'model', 'submodel', 'size', 'color', 'hardware', 'material')}
+    selections = keyword_selectors(st.session_state.bulk_form_state, keyword_manager, "bulk")
+    
+    if st.button(f"💾 Save {len(selected_indices)} Records", type="primary", use_container_width=True, key="bulk_save_btn"):
+        missing = [label for label, key in (('Brand', 'brand'), ('Model', 'model'), ('Sub-Model', 'submodel')) if not selections[key].strip()]
+        if missing:
+            for label in missing:
+                st.error(f"❌ {label} is required")
+            return
+        
+        field_columns = {'type': 'Types', 'brand': 'Brands', 'model': 'Models', 'submodel': 'Sub-Models',
+                         'size': 'Sizes', 'color': 'Colors', 'hardware': 'Hardwares', 'material': 'Materials'}
+        updated_data = {column: selections[key].strip() for key, column in field_columns.items() if selections[key].strip()}
+        
+        updated = data_manager.bulk_update_records(selected_indices, updated_data, keep_as_fixed=True)
+        if updated:
+            st.success(f"✅ Updated {updated} records")
+            del st.session_state.bulk_form_state
+            st.session_state.pop('main_data_table_bulk', None)
+            st.rerun()
+        else:
+            st.error("❌ Failed to save changes")
+    
+    if st.button("❌ Clear Selection", use_container_width=True, key="bulk_cancel_btn"):
+        st.session_state.pop('bulk_form_state', None)
+        st.session_state.pop('main_data_table_bulk', None)
+        st.rerun()
+
+def show_bulk_status_actions(data_manager, form_ids, key, versions=None):
+    """Bulk Unfix / Soft Delete buttons for the rows selected in a Fixed Records table (versions: their Updated_at)"""
+    st.caption(f"{len(form_ids)} records selected")
+    if not form_ids:
+        return
+    unfix_col, delete_col = st.columns(2)
+    if unfix_col.button(f"🔄 Unfix {len(form_ids)}", use_container_width=True, key=f"{key}_bulk_unfix"):
+        updated = data_manager.bulk_unfix_records(form_ids, versions)
+        if updated:
+            st.success(f"✅ {updated} records moved back to unfixed!")
+            st.session_state.pop(f"{key}_bulk", None)
+            st.rerun()
+        else:
+            st.error("❌ Failed to unfix records")
+    confirm = st.checkbox("Confirm soft delete", key=f"{key}_bulk_delete_confirm")
+    if delete_col.button(f"🗑️ Delete {len(form_ids)}", use_container_width=True, disabled=not confirm, key=f"{key}_bulk_delete"):
+        updated = data_manager.bulk_delete_records(form_ids, versions)
+        if updated:
+            st.success(f"✅ {updated} records deleted")
+            st.session_state.pop(f"{key}_bulk", None)
+            st.session_state.pop(f"{key}_bulk_delete_confirm", None)
+            st.rerun()
+        else:
+            st.error("❌ Failed to delete records")
+
 def create_fixed_edit_form(selected_row, keyword_manager, data_manager):
     """Independent edit form for Fixed Records tab - uses separate state"""
     
@@ -1227,8 +3992,10 @@ def create_fixed_edit_form(selected_row, keyword_manager, data_manager):
             'material': selected_row.get('Materials', '')
         }
     
+    show_save_conflict(selected_row, 'fixed_selected_row', 'fixed_form_state', 'fixed_edit_')
+    
     # Types dropdown
-    types_options = ['', 'Bag', 'Jewelry', 'Watch']
+    types_options = [''] + TYPE_OPTIONS
     type_idx = 0
     if st.session_state.fixed_form_state['type'] in types_options:
         type_idx = types_options.index(st.session_state.fixed_form_state['type'])
@@ -1470,7 +4237,11 @@ def create_fixed_edit_form(selected_row, keyword_manager, data_manager):
         }
         
         # Update the record - always keep as fixed since this is the Fixed Records tab
-        success = data_manager.update_record(selected_row['_index'], updated_data, keep_as_fixed=True)
+        if QUERY_MODE == "server":
+            success = data_manager.update_record_by_form_id(selected_row, updated_data, keep_as_fixed=True)
+        else:
+            success = data_manager.update_record(selected_row['_index'], updated_data, keep_as_fixed=True,
+                                                 expected_updated_at=selected_row.get('Updated_at'))
         
         if success:
             st.success("✅ Record updated successfully!")
@@ -1479,6 +4250,8 @@ def create_fixed_edit_form(selected_row, keyword_manager, data_manager):
             if 'fixed_form_state' in st.session_state:
                 del st.session_state.fixed_form_state
             st.rerun()
+        elif st.session_state.get('save_conflict'):
+            st.rerun()
         else:
             st.error("❌ Failed to save changes")
     
@@ -1520,18 +4293,30 @@ if 'show_fixed_delete_popup' not in st.session_state:
 # Main app
 def main():
     # Check authentication first
-    if 'data_manager' not in st.session_state:
-        st.session_state.data_manager = DataManager()
+    # Records live in the shared process-level store; session state only keeps selection/form state
+    data_manager = get_record_store()
 
     if 'keyword_manager' not in st.session_state:
-        # Initialize keyword manager only once
-        st.session_state.keyword_manager = KeywordManager()
+        # Keywords are shared by all sessions as well
+        st.session_state.keyword_manager = get_keyword_store()
+    if st.session_state.keyword_manager.load_error:
+        st.error(f"❌ Error loading keywords from database: {st.session_state.keyword_manager.load_error}")
+    
+    # Other editors' saves and admin keyword changes are pushed in by NOTIFY
+    if LISTEN_ENABLED:
+        get_change_listener()
     if not st.session_state.get('authenticated', False):
         show_login_page()
         return
     
     st.title("Back Office Matching v2.0 (PostgreSQL)")
     
+    # Pick up records changed by other editors since the last sync
+    data_manager.sync_if_due()
+    data_manager.ensure_event_partitions_if_due()
+    if data_manager.last_sync_error:
+        st.error(f"❌ Error syncing changes from database: {data_manager.last_sync_error}")
+    
     # Add logout button in sidebar
     with st.sidebar:
         current_user = st.session_state.get('username', 'Unknown')
@@ -1540,10 +4325,13 @@ def main():
         if st.button("🚪 Logout", type="secondary", use_container_width=True):
             logout()
         
+        if data_manager.save_pool is not None or data_manager.journal is not None:
+            show_save_status(data_manager)
+        
         st.markdown("---")
         
         st.subheader("📊 Dashboard")
-        stats = st.session_state.data_manager.get_tracking_stats()
+        stats = data_manager.get_tracking_stats()
         
         col1, col2 = st.columns(2)
         with col1:
@@ -1564,7 +4352,7 @@ def main():
         st.subheader("📈 Daily Progress")
         
         # Get user progress data
-        user_progress = st.session_state.data_manager.get_user_daily_progress()
+        user_progress = data_manager.get_user_daily_progress()
         
         if user_progress:
             # Sort users alphabetically for consistent display
@@ -1594,17 +4382,30 @@ def main():
                 # Show detailed stats
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.caption(f"{progress_color} {count}/50")
+                    st.caption(f"{progress_color} {count}/{data['target']}")
                 with col2:
                     st.caption(f"{percentage:.1f}%")
                 
-                if count == 50:
+                if count >= data['target']:
                     st.caption("✅ Target achieved!")
         else:
             st.info("No user activity data available for today.")
         
+        if current_user == "admin" and PROGRESS_ROLLUP_ENABLED:
+            show_target_settings(data_manager, sorted(user_progress.keys()))
+            show_progress_history(data_manager, sorted(user_progress.keys()))
+        
         # Export controls
         st.subheader("🔧 Option")
+        # Records delta sync
+        if st.button("🔄 Sync Records", type="secondary"):
+            with st.spinner("Fetching changed records..."):
+                changed = data_manager.sync_changes()
+            if data_manager.last_sync_error:
+                st.error(f"❌ Error syncing changes from database: {data_manager.last_sync_error}")
+            else:
+                st.success(f"✅ Synced {changed} changed records")
+        
         # Keywords refresh
         if st.button("🔄 Refresh Keywords", type="primary"):
             try:
@@ -1615,7 +4416,9 @@ def main():
                     # Get updated stats
                     brands = st.session_state.keyword_manager.get_available_brands()
                     
-                    if brands:
+                    if st.session_state.keyword_manager.load_error:
+                        st.error(f"❌ Error loading keywords from database: {st.session_state.keyword_manager.load_error}")
+                    elif brands:
                         st.success(f"✅ Keywords refreshed!")
                     else:
                         st.warning("⚠️ No keywords found in database")
@@ -1625,7 +4428,7 @@ def main():
                 st.error(f"❌ Failed to refresh keywords: {e}")
 
         #if st.button("📁 Export to Excel", type="secondary"):
-            #filename = st.session_state.data_manager.export_to_excel()
+            #filename = data_manager.export_to_excel()
             #if filename:
                 #st.success(f"✅ Exported: {os.path.basename(filename)}")
             #else:
@@ -1633,7 +4436,7 @@ def main():
         
             # Connection test
         #if st.button("🔧 Test DB Connection",type="primary"):
-            #test_results = st.session_state.data_manager.test_connections()
+            #test_results = data_manager.test_connections()
             
             #if test_results['sqlalchemy']:
                 #st.success("✅ Database connection working!")
@@ -1661,15 +4464,19 @@ def main():
             
     
     # Main tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["📋 Data Management", "✅ Fixed Records", "❌ Unfixed Records", "📖 User Manual"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📋 Data Management", "✅ Fixed Records", "❌ Unfixed Records", "📊 Analytics", "📖 User Manual"])
     
     with tab1:
-        # Load data
-        df = st.session_state.data_manager.load_data()
+        # Load data (server query mode never loads the whole table)
+        df = data_manager.load_data() if QUERY_MODE != "server" else None
         
-        if df is not None:
+        if QUERY_MODE == "server":
+            show_server_data_management(data_manager, st.session_state.keyword_manager)
+        elif df is None and data_manager.load_state == "loading":
+            show_loading_preview(data_manager)
+        elif df is not None:
             # Filter out deleted records (status = 2) for display
-            active_df = df[df['Status'] != 2] if 'Status' in df.columns else df
+            active_df = data_manager.active_records()
             
             st.success(f"✅ Loaded {len(active_df)} records successfully!")
             
@@ -1714,25 +4521,17 @@ def main():
             # Middle Column: Filters and Data Table
             with col2:
                 # Filters - use active_df to exclude deleted records
-                filters = create_filters(active_df)
-                filtered_df = apply_filters(active_df, filters)
+                filters = create_filters(active_df, data_manager)
+                filtered_df = data_manager.filtered_records(filters)
                 
                 # Data table
                 st.subheader(f"📋 Data Table ({len(filtered_df)} records)")
+                bulk_mode = st.toggle("Bulk edit (select several rows)", key="bulk_edit_mode")
+                bulk_selection = []
                 
                 if not filtered_df.empty:
-                    display_df = filtered_df.copy()
-                    
-                    # Add visual Status column
-                    if 'Status' in display_df.columns:
-                        display_df['Status_Display'] = display_df['Status'].map({
-                            0: '❌ Unfixed',
-                            1: '✅ Fixed'
-                        })
-                        cols = ['Status_Display'] + [col for col in display_df.columns if col not in ['Status_Display', 'Status']]
-                        display_df = display_df[cols]
-                    
-                    display_df_reset = display_df.reset_index(drop=False)
+                    # Visual Status column first (memoized per data version and filter set)
+                    display_df_reset = status_display_table(data_manager, ('main', filters_key(filters)), lambda: filtered_df)
                     
                     # Configure columns
                     column_config = {
@@ -1758,13 +4557,16 @@ def main():
                         hide_index=True,
                         column_config=column_config,
                         on_select="rerun",
-                        selection_mode="single-row",
+                        selection_mode="multi-row" if bulk_mode else "single-row",
                         height=400,  # Fixed height to save space
-                        key="main_data_table"
+                        key="main_data_table_bulk" if bulk_mode else "main_data_table"
                     )
                     
                     # Handle row selection
-                    if event.selection.rows:
+                    if bulk_mode:
+                        # Cache positions of every selected row, handed to the bulk edit panel
+                        bulk_selection = display_df_reset['index'].to_numpy()[event.selection.rows].tolist()
+                    elif event.selection.rows:
                         try:
                             selected_idx = event.selection.rows[0]
                             
@@ -1785,6 +4587,7 @@ def main():
                                 
                                 st.session_state.selected_row = selected_data
                                 st.session_state.show_edit_form = True
+                                st.session_state.jump_index = None
                                 
                                 # Clear form state when switching records
                                 if 'form_state' in st.session_state:
@@ -1799,8 +4602,11 @@ def main():
                             st.error(f"❌ Error selecting row: {str(e)}")
                             st.error(f"Debug info - Selected idx: {selected_idx}, Available rows: {len(display_df_reset)}")
                     else:
-                        # Clear selection when no rows are selected
-                        if st.session_state.get('selected_row') is not None:
+                        # Clear selection when no rows are selected - unless it is the record opened by
+                        # select_next_unfixed, which is not a table selection
+                        jumped = st.session_state.get('jump_index')
+                        current_row = st.session_state.get('selected_row')
+                        if current_row is not None and (jumped is None or current_row.get('_index') != jumped):
                             st.session_state.selected_row = None
                             st.session_state.show_edit_form = False
                             if 'form_state' in st.session_state:
@@ -1810,30 +4616,46 @@ def main():
             
             # Right Column: Edit Form
             with col3:
-                st.subheader("✏️ Edit Record")
-                if st.session_state.show_edit_form and st.session_state.selected_row:
+                if bulk_mode:
+                    st.subheader("✏️ Bulk Edit")
+                    if bulk_selection:
+                        create_bulk_edit_form(bulk_selection, st.session_state.keyword_manager, data_manager)
+                    else:
+                        st.info("Select the records to edit together")
+                elif st.session_state.show_edit_form and st.session_state.selected_row:
+                    st.subheader("✏️ Edit Record")
                     create_edit_form(
                         st.session_state.selected_row,
                         st.session_state.keyword_manager,
-                        st.session_state.data_manager,
+                        data_manager,
                         context="main"
                     )
                 else:
+                    st.subheader("✏️ Edit Record")
                     st.info("Select a record to edit")
         
         else:
             st.error("❌ Could not load data from database")
+            if data_manager.load_error:
+                st.caption(data_manager.load_error)
             st.info("💡 Please check database connection and ensure table exists")
+            if st.button("🔄 Retry loading", key="retry_load_data"):
+                data_manager.start_background_load(retry=True)
+                st.rerun()
     
     with tab2:
         col1, col2 = st.columns([2, 1])
 
-        stats = st.session_state.data_manager.get_tracking_stats()
+        stats = data_manager.get_tracking_stats()
         
-        if stats['fixed'] > 0:
-            df = st.session_state.data_manager.load_data()
+        if QUERY_MODE == "server":
+            show_server_fixed_records(data_manager, st.session_state.keyword_manager, col1, col2)
+        elif not data_manager.is_loaded():
+            st.info("⏳ Records are still loading...")
+        elif stats['fixed'] > 0:
+            df = data_manager.load_data()
             if df is not None:
-                fixed_df = df[df['Status'] == 1].copy()
+                fixed_df = data_manager.records_with_status(1)
                 
                 
                 # Create two-column layout: Data Table | Edit Form
@@ -1842,20 +4664,10 @@ def main():
                 with col1:
                     st.subheader("✅ Fixed Records")   
                     st.subheader(f"Total Fixed Records: {len(fixed_df)}")
+                    bulk_mode = st.toggle("Select several rows", key="fixed_bulk_mode")
                      
-                    # Display interactive dataframe for fixed records
-                    display_fixed_df = fixed_df.copy()
-                    
-                    # Add visual Status column
-                    if 'Status' in display_fixed_df.columns:
-                        display_fixed_df['Status_Display'] = display_fixed_df['Status'].map({
-                            0: '❌ Unfixed',
-                            1: '✅ Fixed'
-                        })
-                        cols = ['Status_Display'] + [col for col in display_fixed_df.columns if col not in ['Status_Display', 'Status']]
-                        display_fixed_df = display_fixed_df[cols]
-                    
-                    display_fixed_df_reset = display_fixed_df.reset_index(drop=False)
+                    # Display interactive dataframe for fixed records (visual Status column first)
+                    display_fixed_df_reset = status_display_table(data_manager, 'fixed', lambda: fixed_df)
                     
                     # Configure columns
                     column_config = {
@@ -1881,13 +4693,17 @@ def main():
                         hide_index=True,
                         column_config=column_config,
                         on_select="rerun",
-                        selection_mode="single-row",  # Change to single-row like Data Management
+                        selection_mode="multi-row" if bulk_mode else "single-row",  # single-row like Data Management
                         height=400,
-                        key="fixed_records_table"
+                        key="fixed_records_table_bulk" if bulk_mode else "fixed_records_table"
                     )
                     
                     # Handle selection for fixed records - similar to Data Management tab
-                    if fixed_event.selection.rows:
+                    if bulk_mode:
+                        st.session_state.fixed_selected_row = None  # Edit form is for single selection only
+                        selected_form_ids = display_fixed_df_reset['Form_ids'].iloc[fixed_event.selection.rows].tolist()
+                        show_bulk_status_actions(data_manager, selected_form_ids, "fixed_records_table")
+                    elif fixed_event.selection.rows:
                         try:
                             selected_idx = fixed_event.selection.rows[0]
                             
@@ -1930,11 +4746,16 @@ def main():
                     if st.session_state.get('fixed_selected_row'):
                         st.markdown("---")
                         if st.button("🔄 Unfix This Record", type="secondary", use_container_width=True, key="fixed_unfix_single_btn"):
-                            success = st.session_state.data_manager.unfix_record(st.session_state.fixed_selected_row['_index'])
+                            success = data_manager.unfix_record(
+                                st.session_state.fixed_selected_row['_index'],
+                                expected_updated_at=st.session_state.fixed_selected_row.get('Updated_at')
+                            )
                             if success:
                                 st.success("✅ Record moved back to unfixed!")
                                 st.session_state.fixed_selected_row = None
                                 st.rerun()
+                            elif st.session_state.get('save_conflict'):
+                                st.rerun()
                             else:
                                 st.error("❌ Failed to unfix record")
                 
@@ -1947,7 +4768,7 @@ def main():
                         create_fixed_edit_form(
                             st.session_state.fixed_selected_row,
                             st.session_state.keyword_manager,
-                            st.session_state.data_manager
+                            data_manager
                         )
                     else:
                         st.info("Click on a row in the table to edit the record")
@@ -1956,12 +4777,18 @@ def main():
     
     with tab3:
         st.subheader("❌ Unfixed Records")
-        stats = st.session_state.data_manager.get_tracking_stats()
+        stats = data_manager.get_tracking_stats()
         
-        if stats['unfixed'] > 0:
-            df = st.session_state.data_manager.load_data()
+        if QUERY_MODE == "server":
+            page_df, total = show_keyset_page(data_manager, {'status': "❌ Unfixed"}, key="unfixed_page")
+            st.subheader(f"Total Unfixed Records: {total}")
+            st.dataframe(page_df, use_container_width=True, key="unfixed_records_table")
+        elif not data_manager.is_loaded():
+            st.info("⏳ Records are still loading...")
+        elif stats['unfixed'] > 0:
+            df = data_manager.load_data()
             if df is not None:
-                unfixed_df = df[df['Status'] == 0].copy()
+                unfixed_df = data_manager.records_with_status(0)
                 
                 st.subheader(f"Total Unfixed Records: {len(unfixed_df)}")
                 
@@ -1983,6 +4810,9 @@ def main():
             st.success("🎉 All records have been fixed!")
     
     with tab4:
+        show_analytics(data_manager)
+    
+    with tab5:
         st.header("📖 User Manual - คู่มือการใช้งาน")
         
         # Overview Section
@@ -0,0 +1,55 @@
+"""
+Benchmark the full-table loaders behind DataManager.load_data()
+Compares the COPY ... TO STDOUT loader, the server-side cursor stream loader and the fetchmany
+chunk loader on the live table.
+
+Usage:
+    python benchmark_load.py                    # 3 runs of each loader against db_config
+    python benchmark_load.py --runs 5
+    python benchmark_load.py --method stream    # one loader only, so the peak RSS is its own
+"""
+
+import argparse
+import time
+
+from app import DataManager, db_config, peak_rss_mb
+
+
+def time_loader(data_manager, engine, method, runs):
+    """Run one loader `runs` times and return (best seconds, rows, frame MB)"""
+    best = None
+    frame = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        frame = data_manager._prepare_data_columns(data_manager._load_table_frame(engine, method=method))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    memory_mb = frame.memory_usage(deep=True).sum() / (1024 * 1024)
+    return best, len(frame), memory_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jjm_customer_loan loaders")
+    parser.add_argument("--runs", type=int, default=3, help="runs per loader (best time is reported)")
+    parser.add_argument("--method", choices=("fetchmany", "stream", "copy"), help="benchmark a single loader")
+    args = parser.parse_args()
+
+    data_manager = DataManager(db_config)
+    engine = data_manager.get_engine()
+
+    results = {}
+    for method in [args.method] if args.method else ["fetchmany", "stream", "copy"]:
+        seconds, rows, memory_mb = time_loader(data_manager, engine, method, args.runs)
+        results[method] = seconds
+        print(f"{method:>10}: {seconds:8.3f}s  {rows:>9} rows  {rows / seconds:>12,.0f} rows/s  {memory_mb:8.1f} MB")
+
+    if "fetchmany" in results and "copy" in results:
+        print(f"   speedup: {results['fetchmany'] / results['copy']:.1f}x (copy vs fetchmany)")
+    peak = peak_rss_mb()
+    if peak:
+        # Process-wide high-water mark, so it only describes one loader when --method is given
+        print(f"  peak RSS: {peak:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
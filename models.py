@@ -2,7 +2,7 @@
 Database models for keyword management system using SQLAlchemy ORM
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, Index
+from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, Index, Date
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from sqlalchemy.pool import QueuePool
@@ -136,4 +136,250 @@ def create_additional_indexes(engine):
             conn.execute("CREATE INDEX IF NOT EXISTS idx_model_materials_material_lower ON model_materials(LOWER(material))")
             conn.commit()
         except Exception as e:
-            print(f"Warning: Could not create additional indexes: {e}")
\ No newline at end of file
+            print(f"Warning: Could not create additional indexes: {e}")
+
+# Channels used by the change-notification triggers (see create_change_notify_triggers)
+RECORDS_CHANNEL = 'jjm_records'
+KEYWORDS_CHANNEL = 'jjm_keywords'
+KEYWORD_TABLES = ['brands', 'models', 'model_sizes', 'model_materials', 'brand_colors', 'brand_hardwares']
+
+def create_change_notify_triggers(engine, records_table='jjm_customer_loan'):
+    """
+    Install triggers that NOTIFY the app about changed rows
+    - records_table rows: channel jjm_records, payload = {"form_id": ..., "updated_at": ...} (no updated_at for deletes)
+    - keyword tables: channel jjm_keywords, payload = {"table": ..., "brand_id": ...}
+    """
+    from sqlalchemy import text
+    with engine.begin() as conn:
+        # DROP/CREATE TRIGGER need an exclusive lock; give up rather than queue behind long readers
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION jjm_notify_record_change() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    PERFORM pg_notify('{RECORDS_CHANNEL}', json_build_object('form_id', OLD.form_id)::text);
+                ELSE
+                    PERFORM pg_notify('{RECORDS_CHANNEL}',
+                                      json_build_object('form_id', NEW.form_id, 'updated_at', NEW.updated_at)::text);
+                END IF;
+                RETURN NULL;
+            END $$ LANGUAGE plpgsql
+        """))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_jjm_notify_record_change ON {records_table}"))
+        conn.execute(text(f"""
+            CREATE TRIGGER trg_jjm_notify_record_change
+            AFTER INSERT OR UPDATE OR DELETE ON {records_table}
+            FOR EACH ROW EXECUTE FUNCTION jjm_notify_record_change()
+        """))
+        
+        # ส่ง brand_id ที่ได้รับผลกระทบ เพื่อให้แอปโหลดเฉพาะแบรนด์นั้นใหม่
+        conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION jjm_notify_keyword_change() RETURNS trigger AS $$
+            DECLARE
+                changed jsonb := to_jsonb(COALESCE(NEW, OLD));
+                changed_brand integer;
+            BEGIN
+                IF TG_TABLE_NAME = 'brands' THEN
+                    changed_brand := (changed ->> 'id')::integer;
+                ELSIF TG_TABLE_NAME IN ('model_sizes', 'model_materials') THEN
+                    SELECT brand_id INTO changed_brand FROM models WHERE id = (changed ->> 'model_id')::integer;
+                ELSE
+                    changed_brand := (changed ->> 'brand_id')::integer;
+                END IF;
+                PERFORM pg_notify('{KEYWORDS_CHANNEL}',
+                                  json_build_object('table', TG_TABLE_NAME, 'brand_id', changed_brand)::text);
+                RETURN NULL;
+            END $$ LANGUAGE plpgsql
+        """))
+        for table in KEYWORD_TABLES:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS trg_jjm_notify_keyword_change ON {table}"))
+            conn.execute(text(f"""
+                CREATE TRIGGER trg_jjm_notify_keyword_change
+                AFTER INSERT OR UPDATE OR DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION jjm_notify_keyword_change()
+            """))
+
+# Daily productivity rollup (see create_progress_rollup)
+DEFAULT_DAILY_TARGET = 50
+NEW_RECORD_STATUS = -1  # from_status of records inserted with a status
+
+class DailyProgress(Base):
+    """Records moved from one status to another per editor and day, maintained by a trigger on the records table"""
+    __tablename__ = 'jjm_daily_progress'
+    
+    editor = Column(Text, primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    from_status = Column(Integer, primary_key=True)
+    to_status = Column(Integer, primary_key=True)
+    records = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<DailyProgress(editor='{self.editor}', day={self.day}, {self.from_status}->{self.to_status}: {self.records})>"
+
+class EditorTarget(Base):
+    """Daily fixed-record target per editor (editors without a row use DEFAULT_DAILY_TARGET)"""
+    __tablename__ = 'jjm_editor_targets'
+    
+    editor = Column(Text, primary_key=True)
+    daily_target = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<EditorTarget(editor='{self.editor}', daily_target={self.daily_target})>"
+
+def create_progress_rollup(engine, records_table='jjm_customer_loan'):
+    """
+    Create the rollup/target tables and the statement-level triggers that keep jjm_daily_progress current
+    - every status change (and every insert) adds to (editor, updated_at day, old status, new status)
+    - bulk UPDATEs are aggregated per statement through transition tables, one upsert per group
+    - an empty rollup is backfilled from the records' current status (as 0 -> status on updated_at day)
+    Everything runs in one transaction, so a failed install leaves nothing behind and is retried in full.
+    """
+    from sqlalchemy import text
+    rollup = DailyProgress.__tablename__
+    
+    upsert = f"""
+        INSERT INTO {rollup} AS p (editor, day, from_status, to_status, records)
+        SELECT COALESCE(n.editor, ''), COALESCE(n.updated_at, now())::date, {{from_status}}, COALESCE(n.status, 0), COUNT(*)
+        FROM {{source}}
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (editor, day, from_status, to_status) DO UPDATE SET records = p.records + EXCLUDED.records
+    """
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        Base.metadata.create_all(conn, tables=[DailyProgress.__table__, EditorTarget.__table__])
+        conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION jjm_rollup_status_update() RETURNS trigger AS $$
+            BEGIN
+                {upsert.format(from_status='COALESCE(o.status, 0)',
+                               source='new_rows n JOIN old_rows o ON o.form_id = n.form_id WHERE o.status IS DISTINCT FROM n.status')};
+                RETURN NULL;
+            END $$ LANGUAGE plpgsql
+        """))
+        conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION jjm_rollup_status_insert() RETURNS trigger AS $$
+            BEGIN
+                {upsert.format(from_status=NEW_RECORD_STATUS, source='new_rows n')};
+                RETURN NULL;
+            END $$ LANGUAGE plpgsql
+        """))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_jjm_rollup_status_update ON {records_table}"))
+        conn.execute(text(f"""
+            CREATE TRIGGER trg_jjm_rollup_status_update
+            AFTER UPDATE ON {records_table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION jjm_rollup_status_update()
+        """))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_jjm_rollup_status_insert ON {records_table}"))
+        conn.execute(text(f"""
+            CREATE TRIGGER trg_jjm_rollup_status_insert
+            AFTER INSERT ON {records_table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION jjm_rollup_status_insert()
+        """))
+        # The triggers above lock the records table until commit, so no status change can slip in between
+        if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {rollup})")).scalar():
+            conn.execute(text(upsert.format(from_status=0, source=f"{records_table} n WHERE n.status IN (1, 2)")))
+
+# Append-only edit event log (see create_edit_event_log)
+EVENT_LOG_TABLE = 'jjm_edit_events'
+EVENT_ACTOR_SETTING = 'jjm.actor'  # set_config(..., true) in a transaction names who made its changes
+
+def create_edit_event_log(engine, records_table='jjm_customer_loan', months_ahead=2):
+    """
+    Create the change-event table (range-partitioned by month on event_time) and the statement-level
+    AFTER UPDATE trigger that appends one event per changed record in the writing transaction:
+    form_id, actor (EVENT_ACTOR_SETTING, else the row's editor), action (save/unfix/delete) and
+    changes = {column: [old, new]} for every column that differs (updated_at excluded)
+    """
+    from sqlalchemy import text
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {EVENT_LOG_TABLE} (
+                event_id bigserial,
+                event_time timestamp NOT NULL DEFAULT now(),
+                form_id bigint NOT NULL,
+                editor text,
+                action text NOT NULL,
+                changes jsonb NOT NULL,
+                PRIMARY KEY (event_id, event_time)
+            ) PARTITION BY RANGE (event_time)
+        """))
+        # Catches events outside the monthly partitions instead of failing the save
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {EVENT_LOG_TABLE}_default PARTITION OF {EVENT_LOG_TABLE} DEFAULT"))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{EVENT_LOG_TABLE}_form_id ON {EVENT_LOG_TABLE} (form_id, event_time)"))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{EVENT_LOG_TABLE}_editor ON {EVENT_LOG_TABLE} (editor, event_time)"))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{EVENT_LOG_TABLE}_time ON {EVENT_LOG_TABLE} (event_time)"))
+        
+        conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION jjm_log_record_events() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO {EVENT_LOG_TABLE} (form_id, editor, action, changes)
+                SELECT n.form_id,
+                       COALESCE(NULLIF(current_setting('{EVENT_ACTOR_SETTING}', true), ''), n.editor),
+                       CASE WHEN n.status = 2 AND o.status IS DISTINCT FROM 2 THEN 'delete'
+                            WHEN n.status = 0 AND o.status = 1 THEN 'unfix'
+                            ELSE 'save' END,
+                       d.changes
+                FROM new_rows n
+                JOIN old_rows o ON o.form_id = n.form_id
+                CROSS JOIN LATERAL (
+                    SELECT jsonb_object_agg(nv.key, jsonb_build_array(ov.value, nv.value)) AS changes
+                    FROM jsonb_each(to_jsonb(n)) nv
+                    JOIN jsonb_each(to_jsonb(o)) ov USING (key)
+                    WHERE nv.value IS DISTINCT FROM ov.value AND nv.key <> 'updated_at'
+                ) d
+                WHERE d.changes IS NOT NULL;
+                RETURN NULL;
+            END $$ LANGUAGE plpgsql
+        """))
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_jjm_log_record_events ON {records_table}"))
+        conn.execute(text(f"""
+            CREATE TRIGGER trg_jjm_log_record_events
+            AFTER UPDATE ON {records_table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION jjm_log_record_events()
+        """))
+    ensure_event_partitions(engine, months_ahead)
+
+def ensure_event_partitions(engine, months_ahead=2):
+    """
+    Create the monthly partitions of the event log from this month to months_ahead months out, plus one for
+    every month that already has events in the DEFAULT partition (idempotent). Events of a new partition's
+    month are moved out of DEFAULT first - PostgreSQL refuses to create a partition whose range DEFAULT holds.
+    Returns the number of events moved.
+    """
+    from datetime import date
+    from sqlalchemy import text
+    today = date.today()
+    moved = 0
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        months = set()
+        for offset in range(months_ahead + 1):
+            year, month = divmod(today.month - 1 + offset, 12)
+            months.add(date(today.year + year, month + 1, 1))
+        months.update(row[0] for row in conn.execute(text(
+            f"SELECT DISTINCT date_trunc('month', event_time)::date FROM {EVENT_LOG_TABLE}_default"
+        )))
+        for start in sorted(months):
+            end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+            partition = f"{EVENT_LOG_TABLE}_{start:%Y_%m}"
+            if conn.execute(text("SELECT to_regclass(:name)"), {'name': partition}).scalar() is not None:
+                continue
+            conn.execute(text(f"CREATE TABLE {partition} (LIKE {EVENT_LOG_TABLE} INCLUDING DEFAULTS)"))
+            moved += conn.execute(text(f"""
+                WITH stray AS (
+                    DELETE FROM {EVENT_LOG_TABLE}_default
+                    WHERE event_time >= :start AND event_time < :end
+                    RETURNING *
+                )
+                INSERT INTO {partition} SELECT * FROM stray
+            """), {'start': start, 'end': end}).rowcount
+            conn.execute(text(f"""
+                ALTER TABLE {EVENT_LOG_TABLE} ATTACH PARTITION {partition}
+                FOR VALUES FROM ('{start}') TO ('{end}')
+            """))
+    if moved:
+        print(f"Edit event log: moved {moved} events from the default partition into monthly partitions")
+    return moved
@@ -0,0 +1,234 @@
+"""EditJournal append/ack/replay ordering and WriteBehindQueue coalescing, against an in-memory stand-in for the database"""
+import contextlib
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import EditJournal, RecordConflictError, WriteBehindQueue, version_param
+
+T0 = pd.Timestamp('2026-10-01 09:00')
+
+class FakeDataManager:
+    """The parts of DataManager the journal and the write-behind queue use, over a dict of rows"""
+    data_cache = None
+
+    def __init__(self, rows):
+        self.rows = {row['form_id']: dict(row) for row in rows}
+        self.writes = []  # (form_id, params) in the order they reached the "database"
+        self.outcomes = []  # (editor, outcome) reported back to editors
+        self.down = False
+
+    def get_engine(self):
+        if self.down:
+            raise OperationalError("connect", {}, Exception("database unreachable"))
+        return self
+
+    def begin(self):
+        return contextlib.nullcontext(self)
+
+    def _write_params(self, conn, params, expected_updated_at=None):
+        current = self.rows.get(params['form_id'])
+        if current is None:
+            return None
+        if expected_updated_at is not None and version_param(current['updated_at']) != version_param(expected_updated_at):
+            raise RecordConflictError(params['form_id'], dict(current))
+        current.update({column: value for column, value in params.items() if column != 'actor'})
+        current['updated_at'] = T0 + pd.Timedelta(minutes=len(self.writes) + 1)
+        self.writes.append((params['form_id'], params))
+        return dict(current)
+
+    def _apply_db_row(self, row):
+        pass
+
+    def add_save_outcome(self, editor, outcome):
+        self.outcomes.append((editor, outcome))
+
+@pytest.fixture
+def data_manager():
+    return FakeDataManager([
+        {'form_id': 1, 'brand': 'Hermes', 'size': '25', 'updated_at': T0},
+        {'form_id': 2, 'brand': 'Chanel', 'size': '30', 'updated_at': T0},
+    ])
+
+@pytest.fixture
+def open_journal(tmp_path):
+    journals = []
+    def open_journal(data_manager):
+        # Long replay interval: the tests drive replay() themselves
+        journal = EditJournal(data_manager, path=str(tmp_path / "journal.jsonl"), replay_seconds=3600)
+        journals.append(journal)
+        return journal
+    yield open_journal
+    for journal in journals:
+        journal.data_manager.down = True
+        journal.close()
+
+def save(form_id, actor='Pin@SCL', **columns):
+    return {'form_id': form_id, **columns, 'actor': actor}
+
+def journal_lines(journal):
+    with open(journal.path) as f:
+        return [json.loads(line) for line in f]
+
+def test_ack_drops_entries_and_truncates_when_empty(data_manager, open_journal):
+    journal = open_journal(data_manager)
+    first = journal.append(save(1, brand='Dior'), T0, T0, in_flight=True)
+    second = journal.append(save(2, brand='Dior'), T0, T0, in_flight=True)
+    assert (first, second) == (1, 2)
+    assert journal.pending_count() == 0  # both still owned by their live saves
+
+    journal.ack(first)
+    assert [line.get('ack') for line in journal_lines(journal)] == [None, None, 1]
+    journal.ack(second)
+    assert journal_lines(journal) == []
+    assert not journal.has_pending()
+
+def test_load_replays_what_the_previous_process_left(data_manager, open_journal):
+    data_manager.down = True
+    journal = open_journal(data_manager)
+    journal.append(save(1, brand='Dior'), T0, T0)
+    journal.append(save(2, brand='Dior'), T0, T0)
+    journal.ack(1)
+    with open(journal.path, 'a') as f:
+        f.write('{"seq": 3, "form_id"')  # torn line from a crash mid-append
+    journal.close()
+
+    reopened = open_journal(data_manager)
+    assert list(reopened.pending) == [2]
+    assert reopened.append(save(1, brand='Celine'), None, T0) == 3  # sequence numbers carry on
+
+def test_replay_writes_in_sequence_order_and_chains_versions(data_manager, open_journal):
+    journal = open_journal(data_manager)
+    journal.append(save(1, brand='Dior'), T0, T0)
+    journal.append(save(2, size='35'), T0, T0)
+    # A second edit of record 1 made on the same base version, before the first reached the database
+    journal.append(save(1, size='30'), T0, T0)
+
+    assert journal.replay()
+    assert [(form_id, params.get('brand'), params.get('size')) for form_id, params in data_manager.writes] == [
+        (1, 'Dior', None), (2, None, '35'), (1, None, '30')
+    ]
+    assert data_manager.rows[1]['brand'] == 'Dior' and data_manager.rows[1]['size'] == '30'
+    assert [outcome['ok'] for _, outcome in data_manager.outcomes] == [True, True, True]
+    assert not journal.has_pending()
+
+def test_replay_stops_at_a_connection_error_and_resumes_in_order(data_manager, open_journal):
+    journal = open_journal(data_manager)
+    data_manager.down = True
+    for form_id in (1, 2, 1):
+        journal.append(save(form_id, brand=f'Brand {form_id}'), None, T0)
+    assert not journal.replay()
+    assert journal.pending_count() == 3
+    assert data_manager.writes == []
+
+    data_manager.down = False
+    assert journal.replay()
+    assert [form_id for form_id, _ in data_manager.writes] == [1, 2, 1]
+    assert not journal.has_pending()
+
+def test_replay_skips_entries_a_live_save_still_owns(data_manager, open_journal):
+    journal = open_journal(data_manager)
+    live = journal.append(save(1, brand='Dior'), T0, T0, in_flight=True)
+    journal.append(save(2, brand='Dior'), T0, T0)
+    journal.replay()
+    assert [form_id for form_id, _ in data_manager.writes] == [2]
+
+    journal.release(live)  # the live save lost the connection
+    journal.replay()
+    assert [form_id for form_id, _ in data_manager.writes] == [2, 1]
+
+def test_replay_of_an_edit_overtaken_by_another_editor_is_dropped(data_manager, open_journal):
+    journal = open_journal(data_manager)
+    journal.append(save(1, brand='Dior'), T0, T0)
+    data_manager.rows[1].update({'brand': 'Celine', 'updated_at': T0 + pd.Timedelta(hours=1)})
+
+    assert journal.replay()
+    assert data_manager.writes == []
+    assert data_manager.rows[1]['brand'] == 'Celine'
+    editor, outcome = data_manager.outcomes[0]
+    assert editor == 'Pin@SCL' and not outcome['ok']
+    assert not journal.has_pending()
+
+def test_replay_of_an_already_committed_edit_is_only_acknowledged(data_manager, open_journal):
+    journal = open_journal(data_manager)
+    journal.append(save(1, brand='Dior'), T0, T0)
+    # Committed before the crash, but never acknowledged in the journal
+    data_manager.rows[1].update({'brand': 'Dior', 'updated_at': T0 + pd.Timedelta(minutes=5)})
+
+    assert journal.replay()
+    assert data_manager.writes == []
+    assert [outcome['ok'] for _, outcome in data_manager.outcomes] == [True]
+    assert not journal.has_pending()
+
+class RecordingQueue(WriteBehindQueue):
+    """Write-behind queue whose batches go to a list instead of an UPDATE ... FROM (VALUES ...)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Stop the writer thread: the tests flush by hand
+        self.close()
+        self.closed = False
+        self.batches = []
+        self.failures = []  # exceptions the next batches raise
+        self.stale = set()  # form_ids whose version check fails
+
+    def _write_batch(self, rows):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.batches.append(rows)
+        updated = {row['form_id']: dict(row) for row in rows if row['form_id'] not in self.stale}
+        conflicts = {row['form_id']: {'form_id': row['form_id']} for row in rows if row['form_id'] in self.stale}
+        return updated, conflicts
+
+@pytest.fixture
+def queue(data_manager):
+    return RecordingQueue(data_manager, flush_ms=1, max_retries=2)
+
+def test_unchecked_saves_of_one_record_coalesce(queue):
+    first = queue.submit(save(1, brand='Dior', size='25'))
+    second = queue.submit(save(1, size='30'))
+    other = queue.submit(save(2, brand='Dior'))
+    queue.flush()
+
+    assert len(queue.batches) == 1
+    rows = {row['form_id']: row for row in queue.batches[0]}
+    assert rows[1]['brand'] == 'Dior' and rows[1]['size'] == '30'
+    assert first.result(0) == second.result(0) == rows[1]
+    assert other.result(0) == rows[2]
+
+def test_version_checked_save_waits_for_the_next_batch(queue):
+    first = queue.submit(save(1, brand='Dior'), T0)
+    second = queue.submit(save(1, brand='Celine'), T0)
+    queue.flush()
+    assert [[row['brand'] for row in batch] for batch in queue.batches] == [['Dior']]
+    assert first.done() and not second.done()
+
+    queue.stale.add(1)  # the first save moved the version on
+    queue.flush()
+    assert [[row['brand'] for row in batch] for batch in queue.batches] == [['Dior'], ['Celine']]
+    with pytest.raises(RecordConflictError):
+        second.result(0)
+
+def test_failed_batch_is_retried_then_failed(queue):
+    error = OperationalError("UPDATE", {}, Exception("database unreachable"))
+    queue.failures = [error] * 3
+    ack = queue.submit(save(1, brand='Dior'))
+    for _ in range(queue.max_retries):
+        queue.flush()
+        assert not ack.done()  # back on the queue for another attempt
+    queue.flush()
+    assert ack.exception(0) is error
+    assert queue.pending == {}
+
+def test_retry_keeps_a_newer_save_column_by_column(queue):
+    queue.failures = [OperationalError("UPDATE", {}, Exception("database unreachable"))]
+    older = queue.submit(save(1, brand='Dior', size='25'))
+    queue.flush()
+    newer = queue.submit(save(1, size='30'))
+    queue.flush()
+
+    row = queue.batches[0][0]
+    assert row['brand'] == 'Dior' and row['size'] == '30'
+    assert older.result(0) == newer.result(0) == row
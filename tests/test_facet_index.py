@@ -0,0 +1,135 @@
+"""FacetIndex bitmaps under update, growth and eviction (pure in-memory, no database)"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import app
+from app import FacetIndex, StatusIndex
+
+def records(rows):
+    """(Status, Types, Brands, Sub-Models, Contract_Numbers) tuples -> frame shaped like the record cache"""
+    return pd.DataFrame(rows, columns=['Status', 'Types', 'Brands', 'Sub-Models', 'Contract_Numbers'])
+
+def build(frame):
+    status = StatusIndex(frame['Status'])
+    facets = FacetIndex()
+    facets.rebuild(frame, status.codes)
+    return status, facets
+
+def rows_of(facets, bitmap):
+    return list(facets.positions(bitmap))
+
+def assert_matches_rebuild(frame, facets):
+    """Every cached bitmap and flag equals what a fresh index computes"""
+    _, fresh = build(frame)
+    for name in ('active', 'fixed', 'unfixed', 'contract'):
+        assert rows_of(facets, facets.flag(name)) == rows_of(fresh, fresh.flag(name))
+    for column, value_id in list(facets.bitmaps):
+        value = facets.values[column][value_id]
+        assert rows_of(facets, facets.bitmaps[(column, value_id)]) == rows_of(fresh, fresh.bitmap(column, value))
+
+FRAME = [
+    (0, 'Bag', 'Hermes', 'Birkin', None),
+    (1, 'Bag', 'Chanel', 'Classic', 'C-1'),
+    (2, 'Watch', 'Rolex', 'Submariner', None),
+    (1, 'Bag', 'Hermes', 'Kelly', 'C-2'),
+]
+
+def test_rebuild_flags_and_value_bitmaps():
+    _, facets = build(records(FRAME))
+    assert rows_of(facets, facets.flag('active')) == [0, 1, 3]
+    assert rows_of(facets, facets.flag('fixed')) == [1, 3]
+    assert rows_of(facets, facets.flag('unfixed')) == [0]
+    assert rows_of(facets, facets.flag('contract')) == [1, 3]
+    assert rows_of(facets, facets.bitmap('Brands', 'Hermes')) == [0, 3]
+    assert rows_of(facets, facets.bitmap('Brands', 'Dior')) == []
+    assert facets.options('Sub-Models', [0, 3]) == ['Birkin', 'Kelly']
+    assert facets.contains(facets.bitmap('Types', 'Watch'), 2)
+    assert not facets.contains(facets.bitmap('Types', 'Watch'), 99)
+
+def test_update_refiles_cached_bitmaps_and_flags():
+    frame = records(FRAME)
+    status, facets = build(frame)
+    facets.bitmap('Brands', 'Hermes')
+    facets.bitmap('Brands', 'Chanel')
+
+    frame.loc[0, ['Status', 'Brands', 'Contract_Numbers']] = [1, 'Chanel', 'C-3']
+    status.set([0], [1])
+    facets.update(frame, [0], status.codes)
+    assert rows_of(facets, facets.bitmap('Brands', 'Hermes')) == [3]
+    assert rows_of(facets, facets.bitmap('Brands', 'Chanel')) == [0, 1]
+    assert rows_of(facets, facets.flag('fixed')) == [0, 1, 3]
+    assert rows_of(facets, facets.flag('contract')) == [0, 1, 3]
+    assert_matches_rebuild(frame, facets)
+
+def test_update_registers_new_values():
+    frame = records(FRAME)
+    status, facets = build(frame)
+    frame.loc[2, 'Brands'] = 'Omega'
+    facets.update(frame, [2], status.codes)
+    assert rows_of(facets, facets.bitmap('Brands', 'Omega')) == [2]
+    assert rows_of(facets, facets.bitmap('Brands', 'Rolex')) == []
+
+def test_update_grows_for_appended_rows():
+    frame = records(FRAME)
+    status, facets = build(frame)
+    facets.bitmap('Types', 'Bag')
+    # Append past a byte boundary so the packed bitmaps need more bytes
+    added = records([(0, 'Bag', 'Dior', 'Saddle', None)] * 6)
+    frame = pd.concat([frame, added], ignore_index=True)
+    positions = np.arange(4, 10)
+    status.set(positions, added['Status'])
+    facets.update(frame, positions, status.codes)
+    assert facets.size == 10
+    assert rows_of(facets, facets.bitmap('Types', 'Bag')) == [0, 1, 3, 4, 5, 6, 7, 8, 9]
+    assert rows_of(facets, facets.flag('unfixed')) == [0, 4, 5, 6, 7, 8, 9]
+    assert_matches_rebuild(frame, facets)
+
+def test_bitmaps_are_evicted_oldest_first_and_rebuilt_current(monkeypatch):
+    monkeypatch.setattr(app, 'FACET_BITMAP_LIMIT', 2)
+    frame = records(FRAME)
+    status, facets = build(frame)
+    facets.bitmap('Brands', 'Hermes')
+    facets.bitmap('Brands', 'Chanel')
+    facets.bitmap('Brands', 'Rolex')
+    assert len(facets.bitmaps) == 2
+    assert ('Brands', facets.value_ids['Brands']['Hermes']) not in facets.bitmaps
+
+    # Changes made while a bitmap is evicted show up when it is built again
+    frame.loc[1, 'Brands'] = 'Hermes'
+    facets.update(frame, [1], status.codes)
+    assert rows_of(facets, facets.bitmap('Brands', 'Hermes')) == [0, 1, 3]
+    assert_matches_rebuild(frame, facets)
+
+def test_concurrent_bitmap_builds_and_updates(monkeypatch):
+    monkeypatch.setattr(app, 'FACET_BITMAP_LIMIT', 3)
+    brands = ['Hermes', 'Chanel', 'Rolex', 'Dior', 'Omega']
+    frame = records([(0, 'Bag', brands[i % 5], 'X', None) for i in range(64)])
+    status, facets = build(frame)
+    errors = []
+
+    def read():
+        try:
+            for i in range(300):
+                facets.bitmap('Brands', brands[i % 5])
+        except Exception as e:
+            errors.append(e)
+
+    def write():
+        try:
+            rng = np.random.default_rng(1)
+            for _ in range(300):
+                position = int(rng.integers(len(frame)))
+                frame.loc[position, 'Brands'] = brands[rng.integers(5)]
+                facets.update(frame, [position], status.codes)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(3)] + [threading.Thread(target=write)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert_matches_rebuild(frame, facets)
@@ -0,0 +1,53 @@
+"""DataManager.memoized: per-data-version caching and per-view LRU eviction (no database)"""
+import app
+from app import DataManager
+
+def counting(value):
+    """compute() that records how often it ran"""
+    calls = []
+    def compute():
+        calls.append(value)
+        return value
+    return compute, calls
+
+def test_value_is_reused_until_the_version_bumps():
+    data_manager = DataManager()
+    compute, calls = counting('stats')
+    assert data_manager.memoized('tracking_stats', compute) == 'stats'
+    assert data_manager.memoized('tracking_stats', compute) == 'stats'
+    assert len(calls) == 1
+
+    data_manager._bump_version()
+    data_manager.memoized('tracking_stats', compute)
+    assert len(calls) == 2
+
+def test_value_computed_during_a_save_is_recomputed():
+    data_manager = DataManager()
+    def compute():
+        # A save lands while the view is being computed
+        data_manager.data_version += 1
+        return 'stale'
+    data_manager.memoized('active', compute)
+    recompute, calls = counting('fresh')
+    assert data_manager.memoized('active', recompute) == 'fresh'
+    assert calls == ['fresh']
+
+def test_each_view_keeps_its_own_most_recently_used_variants(monkeypatch):
+    monkeypatch.setattr(app, 'MEMO_LIMIT', 2)
+    data_manager = DataManager()
+    calls = []
+    def view(key):
+        return data_manager.memoized(key, lambda: calls.append(key) or key)
+
+    view(('filtered', 'a'))
+    view(('filtered', 'b'))
+    view(('filtered', 'a'))  # 'a' is now the most recently used
+    view(('filtered', 'c'))  # evicts 'b', not 'a'
+    view(('status', 1))  # other views do not count against 'filtered'
+    calls.clear()
+
+    view(('filtered', 'a'))
+    view(('filtered', 'c'))
+    assert calls == []
+    view(('filtered', 'b'))
+    assert calls == [('filtered', 'b')]
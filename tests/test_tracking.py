@@ -0,0 +1,138 @@
+"""StatusIndex and DailyProgressCounter bookkeeping (pure in-memory, no database)"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from app import DailyProgressCounter, StatusIndex
+
+def assert_counts_match(index):
+    """The maintained counters equal a fresh count of the codes"""
+    assert list(index.counts) == list(np.bincount(index.codes, minlength=StatusIndex.OTHER + 1))
+
+def test_rebuild_maps_unknown_statuses_to_other():
+    index = StatusIndex([0, 1, 2, 1, None, 7])
+    assert list(index.codes) == [0, 1, 2, 1, StatusIndex.OTHER, StatusIndex.OTHER]
+    assert (index.count(0), index.count(1), index.count(2), index.count(StatusIndex.OTHER)) == (1, 2, 1, 2)
+    assert len(index) == 6
+
+def test_set_moves_counts_between_statuses():
+    index = StatusIndex([0, 0, 0, 1])
+    index.set([0, 3], [1, 2])
+    assert list(index.codes) == [1, 0, 0, 2]
+    assert (index.count(0), index.count(1), index.count(2)) == (2, 1, 1)
+    assert_counts_match(index)
+
+def test_set_duplicate_positions_last_wins_and_counts_once():
+    index = StatusIndex([0, 0])
+    index.set([1, 1, 1], [1, 2, 1])
+    assert list(index.codes) == [0, 1]
+    assert (index.count(0), index.count(1), index.count(2)) == (1, 1, 0)
+    assert_counts_match(index)
+
+def test_set_past_the_end_grows_with_other():
+    index = StatusIndex([1])
+    index.set([4], [0])
+    assert len(index) == 5
+    assert list(index.codes) == [1, StatusIndex.OTHER, StatusIndex.OTHER, StatusIndex.OTHER, 0]
+    assert_counts_match(index)
+    # Filling the gap later moves the rows out of OTHER
+    index.set([1, 2, 3], [0, 1, 2])
+    assert index.count(StatusIndex.OTHER) == 0
+    assert_counts_match(index)
+
+def test_set_without_positions_is_a_no_op():
+    index = StatusIndex([0, 1])
+    index.set([], [])
+    assert list(index.codes) == [0, 1]
+    assert_counts_match(index)
+
+def test_next_position_scans_across_blocks():
+    statuses = [1] * 50
+    statuses[3] = statuses[17] = statuses[49] = 0
+    index = StatusIndex(statuses)
+    index.SCAN_BLOCK = 8
+    assert index.next_position(0) == 3
+    assert index.next_position(0, after=3) == 17
+    assert index.next_position(0, after=17) == 49
+    assert index.next_position(0, after=49) is None
+    assert index.next_position(2) is None
+    assert list(index.positions(0)) == [3, 17, 49]
+
+def test_next_position_sees_set_and_grown_rows():
+    index = StatusIndex([1, 1, 1])
+    assert index.next_position(0) is None
+    index.set([5], [0])
+    assert index.next_position(0) == 5
+    index.set([1], [0])
+    assert index.next_position(0) == 1
+    assert index.next_position(0, after=1) == 5
+
+DAY = datetime.date(2026, 10, 1)
+NEXT_DAY = datetime.date(2026, 10, 2)
+
+def records(rows):
+    """(Status, Editor, Updated_at) tuples -> frame shaped like the record cache"""
+    return pd.DataFrame(rows, columns=['Status', 'Editor', 'Updated_at'])
+
+def test_counter_rebuild_counts_fixed_rows_with_editor_and_time():
+    frame = records([
+        (1, 'Pin@SCL', pd.Timestamp('2026-10-01 09:00')),
+        (1, 'Pin@SCL', pd.Timestamp('2026-10-01 17:00')),
+        (1, 'Gun@SCL', pd.Timestamp('2026-10-02 08:00')),
+        (0, 'Gun@SCL', pd.Timestamp('2026-10-01 10:00')),  # unfixed
+        (1, None, pd.Timestamp('2026-10-01 10:00')),  # no editor
+        (1, 'Gun@SCL', pd.NaT),  # no time
+    ])
+    counter = DailyProgressCounter()
+    counter.rebuild(frame)
+    assert counter.counts_for_day(DAY) == {'Pin@SCL': 2}
+    assert counter.counts_for_day(NEXT_DAY) == {'Gun@SCL': 1}
+    assert list(counter.slots >= 0) == [True, True, True, False, False, False]
+
+def test_counter_update_refiles_only_the_given_positions():
+    frame = records([
+        (1, 'Pin@SCL', pd.Timestamp('2026-10-01 09:00')),
+        (0, 'Gun@SCL', pd.Timestamp('2026-10-01 09:00')),
+    ])
+    counter = DailyProgressCounter()
+    counter.rebuild(frame)
+
+    # Gun fixes row 1 today, Pin's row 0 is unfixed
+    frame.loc[1, 'Status'] = 1
+    frame.loc[0, 'Status'] = 0
+    counter.update(frame, [0, 1])
+    assert counter.counts_for_day(DAY) == {'Gun@SCL': 1}
+
+    # Re-saved the next day by someone else: moves to the new (editor, day)
+    frame.loc[1, ['Editor', 'Updated_at']] = ['Pin@SCL', pd.Timestamp('2026-10-02 08:00')]
+    counter.update(frame, [1, 1])
+    assert counter.counts_for_day(DAY) == {}
+    assert counter.counts_for_day(NEXT_DAY) == {'Pin@SCL': 1}
+
+def test_counter_update_grows_for_appended_rows():
+    frame = records([(1, 'Pin@SCL', pd.Timestamp('2026-10-01 09:00'))])
+    counter = DailyProgressCounter()
+    counter.rebuild(frame)
+    frame = pd.concat([frame, records([(1, 'Gun@SCL', pd.Timestamp('2026-10-01 11:00'))])], ignore_index=True)
+    counter.update(frame, [1])
+    assert len(counter.slots) == 2
+    assert counter.counts_for_day(DAY) == {'Pin@SCL': 1, 'Gun@SCL': 1}
+
+def test_counter_matches_a_rebuild_after_random_updates():
+    rng = np.random.default_rng(7)
+    days = pd.to_datetime(['2026-10-01 09:00', '2026-10-02 09:00', '2026-10-03 09:00'])
+    editors = ['Pin@SCL', 'Gun@SCL', None]
+    frame = records([(int(rng.integers(3)), editors[rng.integers(3)], days[rng.integers(3)]) for _ in range(40)])
+    counter = DailyProgressCounter()
+    counter.rebuild(frame)
+    for _ in range(25):
+        positions = rng.integers(len(frame), size=3)
+        for position in positions:
+            frame.loc[position] = [int(rng.integers(3)), editors[rng.integers(3)], days[rng.integers(3)]]
+        counter.update(frame, positions)
+
+    fresh = DailyProgressCounter()
+    fresh.rebuild(frame)
+    for day in days.date:
+        assert counter.counts_for_day(day) == fresh.counts_for_day(day)